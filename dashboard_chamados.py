@@ -1,14 +1,31 @@
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import streamlit as st
 from streamlit_plotly_events import plotly_events
 from datetime import datetime, date, timedelta
 import os
 import numpy as np
+import pyarrow as pa
 import io
+import sys
+import json
+import argparse
+import platform
+import shutil
+import statistics
+import tempfile
 import calendar
+import hashlib
+import time
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from pandas.api.types import union_categoricals
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 # Carregar variáveis de ambiente do arquivo .env (se disponível)
 try:
@@ -17,21 +34,8 @@ try:
 except Exception:
     pass
 
-# Configuração do dashboard
-
-st.set_page_config(
-    page_title="Dashboard de Chamados Técnicos - HMSI", 
-    layout="wide",
-    initial_sidebar_state="expanded",
-    menu_items={
-        'Get Help': None,
-        'Report a bug': None,
-        'About': None
-    }
-)
-
 # CSS para esconder elementos de carregamento e menu
-st.markdown("""
+CSS_PAGINA = """
 <style>
     /* Esconder spinner de carregamento */
     .stSpinner > div {
@@ -65,7 +69,8 @@ st.markdown("""
     /* Header visível para permitir o toggle da sidebar em telas pequenas */
     /* header { visibility: hidden !important; } */
 </style>
-""", unsafe_allow_html=True)
+"""
+
 
 # Sistema de Login
 def check_login():
@@ -100,6 +105,7 @@ def check_login():
 
                     if username == expected_username and password == expected_password:
                         st.session_state.logged_in = True
+                        st.session_state.usuario = username
                         st.success("✅ Login realizado com sucesso!")
                         st.rerun()
                     else:
@@ -141,1557 +147,4555 @@ def check_login():
     
     return True
 
-# Verificar login antes de continuar
-if not check_login():
-    st.stop()
+# Cache colunar em disco (Parquet) com o DataFrame já processado.
+# A chave é o hash do conteúdo bruto do CSV, então reabrir uma exportação já vista
+# custa apenas uma leitura colunar, em qualquer worker e mesmo após reiniciar o app.
+CACHE_DIR = os.getenv("GLPI_CACHE_DIR", ".cache_glpi")
+CACHE_MAX_MB = float(os.getenv("GLPI_CACHE_MAX_MB", "512"))
+CACHE_MAX_DIAS = float(os.getenv("GLPI_CACHE_MAX_DIAS", "30"))
+# Incrementar sempre que mudar a forma de derivar as colunas (invalida entradas antigas)
+CACHE_VERSAO = 8
 
+# Instrumentação do caminho crítico: cada execução do script mede suas etapas (ingestão,
+# filtros, agregados, cálculo e renderização da seção) com linhas de entrada/saída,
+# variação de memória do processo e acertos/falhas de cache. Usuários listados em
+# GLPI_ADMINS veem o painel na sidebar. Com GLPI_LOG_DESEMPENHO definido (ex.:
+# .cache_glpi/desempenho.jsonl), cada execução vira uma linha JSON nesse arquivo; ao passar
+# de GLPI_LOG_DESEMPENHO_MAX_MB ele é renomeado para <arquivo>.1 (substituindo o anterior).
+ADMINS = {nome.strip() for nome in os.getenv("GLPI_ADMINS", "").split(",") if nome.strip()}
+LOG_DESEMPENHO = os.getenv("GLPI_LOG_DESEMPENHO", "")
+LOG_DESEMPENHO_MAX_MB = float(os.getenv("GLPI_LOG_DESEMPENHO_MAX_MB", "16"))
 
-# Informações sobre fonte de dados
-# st.sidebar.markdown("---")
-# st.sidebar.header("📁 Fonte de Dados")
-# st.sidebar.info("**Arquivo:** glpi.csv  \n**Localização:** Raiz do projeto")
+_lock_log = threading.Lock()
 
-# Mostrar botão de logout na sidebar
-st.sidebar.markdown("---")
-if st.sidebar.button("🚪 Logout"):
-    st.session_state.logged_in = False
-    st.rerun()
 
-# Carregar dados
-@st.cache_data
+@st.cache_resource
+def _medicao():
+    """
+    Medidor ativo em cada thread de execução. Fica no cache de recursos para ser o mesmo
+    objeto entre re-execuções do script: os caches criados em execuções anteriores
+    continuam registrando acertos e falhas no medidor da execução atual
+    """
+    return threading.local()
 
-def load_data(uploaded_bytes=None):
+
+def _memoria_mb():
+    """
+    Memória residente do processo em MB (None onde /proc não existe)
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Medidor:
     """
-    Carrega dados do GLPI a partir de upload do usuário ou do arquivo local glpi.csv
+    Etapas medidas numa execução do script, na ordem em que terminam.
+    Etapas podem ser aninhadas; acertos/falhas de cache vão para a etapa aberta mais interna
     """
-    # 1) Se o usuário enviou um arquivo, usar o upload
-    if uploaded_bytes is not None:
+
+    def __init__(self):
+        self.etapas = []
+        self.contexto = {}
+        self.total = None
+        self._inicio = time.perf_counter()
+        self._abertas = []
+
+    def __enter__(self):
+        _medicao().medidor = self
+        return self
+
+    def __exit__(self, *exc):
+        _medicao().medidor = None
+        self.total = time.perf_counter() - self._inicio
+        return False
+
+    @contextmanager
+    def etapa(self, nome, linhas_entrada=None):
+        """
+        Mede o bloco como a etapa `nome`. O dicionário devolvido aceita campos extras
+        (ex.: registro['linhas_saida'])
+        """
+        registro = {'etapa': nome, 'linhas_entrada': linhas_entrada, 'linhas_saida': None, 'cache': {}}
+        self._abertas.append(registro)
+        memoria = _memoria_mb()
+        inicio = time.perf_counter()
         try:
-            df = pd.read_csv(io.StringIO(uploaded_bytes.decode('utf-8-sig')), sep=';')
-            
-            # Converter colunas de data aceitando '/' ou '-' e dia primeiro
-            if 'Data Abertura' in df.columns:
-                df['Data Abertura Datetime'] = pd.to_datetime(df['Data Abertura'], dayfirst=True, errors='coerce')
-            
-            if 'Data Atualização' in df.columns:
-                df['Data Atualização Datetime'] = pd.to_datetime(df['Data Atualização'], dayfirst=True, errors='coerce')
-            
-            if 'Data SLA' in df.columns:
-                df['Data SLA Datetime'] = pd.to_datetime(df['Data SLA'], dayfirst=True, errors='coerce')
-            
-            # Calcular tempo de resolução em horas
-            if 'Data Abertura Datetime' in df.columns and 'Data Atualização Datetime' in df.columns:
-                df['Tempo Resolução (h)'] = (df['Data Atualização Datetime'] - df['Data Abertura Datetime']).dt.total_seconds() / 3600
-            
-            # Limpar e padronizar categorias
-            if 'Categoria' in df.columns:
-                df['Categoria Limpa'] = df['Categoria'].str.replace('SETOR DE INFORMATICA > ', '', regex=False).str.replace('SETOR DE INFORMATICA', 'OUTROS')
-            
-            return df
-        except Exception as e:
-            st.error(f"❌ Erro ao ler arquivo enviado: {e}")
-            return pd.DataFrame()
+            yield registro
+        finally:
+            registro['segundos'] = time.perf_counter() - inicio
+            memoria_final = _memoria_mb()
+            registro['memoria_mb'] = memoria_final - memoria if memoria is not None and memoria_final is not None else None
+            self._abertas.remove(registro)
+            self.etapas.append(registro)
 
-    # 2) Caso não haja upload, tentar arquivo local
-    file_path = "glpi.csv"
+    def contar_cache(self, cache, acerto):
+        if self._abertas:
+            contagem = self._abertas[-1]['cache'].setdefault(cache, {'acertos': 0, 'falhas': 0})
+            contagem['acertos' if acerto else 'falhas'] += 1
 
-    if not os.path.exists(file_path):
-        st.error("❌ Nenhum arquivo encontrado. Faça upload do glpi.csv na barra lateral.")
-        return pd.DataFrame()
 
+def _etapa(nome, linhas_entrada=None):
+    """
+    Etapa no medidor da execução atual; fora de uma execução medida (ex.: pré-cálculo em
+    segundo plano, linha de comando) o bloco roda sem medição
+    """
+    medidor = getattr(_medicao(), 'medidor', None)
+    if medidor is None:
+        return nullcontext({})
+    return medidor.etapa(nome, linhas_entrada)
+
+
+def _contar_cache(cache, acerto):
+    medidor = getattr(_medicao(), 'medidor', None)
+    if medidor is not None:
+        medidor.contar_cache(cache, acerto)
+
+
+def _gravar_log_desempenho(medidor):
+    """
+    Acrescenta a execução medida como uma linha JSON no log. Falhas são ignoradas: o log é opcional
+    """
+    if not LOG_DESEMPENHO:
+        return
+    registro = {
+        'momento': datetime.now().isoformat(timespec='milliseconds'),
+        'usuario': st.session_state.get('usuario'),
+        **medidor.contexto,
+        'total_segundos': round(medidor.total, 4),
+        'memoria_mb': _memoria_mb(),
+        'etapas': [
+            {**etapa, 'segundos': round(etapa['segundos'], 4)}
+            for etapa in medidor.etapas
+        ],
+    }
+    linha = json.dumps(registro, ensure_ascii=False, default=str)
     try:
-        # Ler arquivo CSV
-        df = pd.read_csv(file_path, sep=';', encoding='utf-8-sig')
-        
-        # Converter colunas de data aceitando '/' ou '-' e dia primeiro
-        if 'Data Abertura' in df.columns:
-            df['Data Abertura Datetime'] = pd.to_datetime(df['Data Abertura'], dayfirst=True, errors='coerce')
-        
-        if 'Data Atualização' in df.columns:
-            df['Data Atualização Datetime'] = pd.to_datetime(df['Data Atualização'], dayfirst=True, errors='coerce')
-        
-        if 'Data SLA' in df.columns:
-            df['Data SLA Datetime'] = pd.to_datetime(df['Data SLA'], dayfirst=True, errors='coerce')
-        
-        # Calcular tempo de resolução em horas
-        if 'Data Abertura Datetime' in df.columns and 'Data Atualização Datetime' in df.columns:
-            df['Tempo Resolução (h)'] = (df['Data Atualização Datetime'] - df['Data Abertura Datetime']).dt.total_seconds() / 3600
-        
-        # Limpar e padronizar categorias
-        if 'Categoria' in df.columns:
-            df['Categoria Limpa'] = df['Categoria'].str.replace('SETOR DE INFORMATICA > ', '', regex=False).str.replace('SETOR DE INFORMATICA', 'OUTROS')
-        
-        return df
+        os.makedirs(os.path.dirname(LOG_DESEMPENHO) or '.', exist_ok=True)
+        with _lock_log:
+            if os.path.exists(LOG_DESEMPENHO) and os.path.getsize(LOG_DESEMPENHO) > LOG_DESEMPENHO_MAX_MB * 1024 * 1024:
+                os.replace(LOG_DESEMPENHO, LOG_DESEMPENHO + '.1')
+            with open(LOG_DESEMPENHO, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(linha + '\n')
+    except OSError:
+        pass
 
-    except Exception as e:
-        st.error(f"❌ Erro ao carregar dados: {e}")
-        return pd.DataFrame()
 
-# Upload de dados
-st.sidebar.markdown("### 📤 Upload de Dados")
-uploaded_file = st.sidebar.file_uploader(
-    "Carregue o arquivo glpi.csv",
-    type=["csv"],
-    help="Selecione o CSV exportado do GLPI (separador ';' e codificação UTF-8)."
-)
-
-# Carregar dados a partir do upload (ou do arquivo local se nenhum upload for feito)
-df = load_data(uploaded_file.getvalue() if uploaded_file is not None else None)
-
-# Inicializar variáveis de sessão para filtros interativos
-if 'filtro_status' not in st.session_state:
-    st.session_state.filtro_status = None
-if 'filtro_categoria' not in st.session_state:
-    st.session_state.filtro_categoria = None
-if 'filtro_tecnico' not in st.session_state:
-    st.session_state.filtro_tecnico = None
-if 'filtro_prioridade' not in st.session_state:
-    st.session_state.filtro_prioridade = None
-
-# Sidebar - Filtros
-st.sidebar.header("🔍 Filtros de Análise")
-if not df.empty:
-    # Filtro por período
-
-    date_range = []
-    if 'Data Abertura Datetime' in df.columns:
-        datas_validas = df['Data Abertura Datetime'].dropna()
-        if not datas_validas.empty:
-            min_date = datas_validas.min().date()
-            max_date = datas_validas.max().date()
-            
-            # Definir período padrão baseado nos dados disponíveis
-            hoje = date.today()
-            primeiro_dia_mes = date(hoje.year, hoje.month, 1)
-            ultimo_dia_mes = date(hoje.year, hoje.month, calendar.monthrange(hoje.year, hoje.month)[1])
-            
-            # Verificar se o mês atual está dentro do range dos dados
-            if primeiro_dia_mes >= min_date and ultimo_dia_mes <= max_date:
-                # Usar mês atual como padrão
-                periodo_padrao = [primeiro_dia_mes, ultimo_dia_mes]
-            else:
-                # Usar último mês disponível como padrão
-                if max_date.month == 1:
-                    ultimo_mes = date(max_date.year - 1, 12, 1)
-                else:
-                    ultimo_mes = date(max_date.year, max_date.month - 1, 1)
-                
-                ultimo_dia_ultimo_mes = date(
-                    ultimo_mes.year,
-                    ultimo_mes.month,
-                    calendar.monthrange(ultimo_mes.year, ultimo_mes.month)[1]
-                )
-                
-                periodo_padrao = [ultimo_mes, ultimo_dia_ultimo_mes]
-            
-            # Usar período padrão, mas permitir alteração
-            date_range = st.sidebar.date_input(
-                "📅 Período de análise",
-                periodo_padrao,
-                min_value=min_date,
-                max_value=max_date,
-                help="Período padrão baseado nos dados disponíveis. Clique para alterar se necessário."
-            )
-        else:
-            st.sidebar.info("📅 Datas de abertura inválidas ou ausentes. Filtro de período desativado.")
-            date_range = []
-    else:
-        st.sidebar.info("📅 Coluna de data não encontrada. Filtro de período desativado.")
-    
-    # Filtro por técnico
-    tecnicos = ['Todos'] + sorted(df['Atribuído - Técnico'].dropna().unique().tolist())
-    tecnico_selecionado = st.sidebar.selectbox("👨‍💻 Técnico", tecnicos)
-    
-    # Filtro por status
-    status_options = ['Todos'] + sorted(df['Status'].dropna().unique().tolist())
-    status_selecionado = st.sidebar.selectbox("📊 Status", status_options)
-    
-    # Filtro por prioridade
-    prioridade_options = ['Todas'] + sorted(df['Prioridade'].dropna().unique().tolist())
-    prioridade_selecionada = st.sidebar.selectbox("⚡ Prioridade", prioridade_options)
-    
-    # Filtro por categoria
-    if 'Categoria Limpa' in df.columns:
-        categorias = ['Todas'] + sorted(df['Categoria Limpa'].dropna().unique().tolist())
-        categoria_selecionada = st.sidebar.selectbox("🏷️ Categoria", categorias)
-    
-    # Botão para limpar filtros interativos
-    if st.sidebar.button("🔄 Limpar Filtros Interativos"):
-        st.session_state.filtro_status = None
-        st.session_state.filtro_categoria = None
-        st.session_state.filtro_tecnico = None
-        st.session_state.filtro_prioridade = None
-        st.rerun()
-    
-    # Aplicar filtros
-    if len(date_range) == 2:
+def _hash_bytes(conteudo):
+    """
+    Calcula o hash do conteúdo bruto enviado pelo usuário
+    """
+    return hashlib.blake2b(conteudo, digest_size=16).hexdigest()
+
+
+def _hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """
+    Calcula o hash de um arquivo local lendo em blocos (sem carregá-lo inteiro na memória)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _caminho_cache(chave):
+    return os.path.join(CACHE_DIR, f"{chave}.parquet")
+
+
+def _ler_cache_colunar(chave):
+    """
+    Lê o DataFrame processado do cache em disco, ou None se não houver entrada válida
+    """
+    caminho = _caminho_cache(chave)
+    if not os.path.exists(caminho):
+        return None
+    try:
+        # Colunas TEXTO voltam como strings do Arrow (o padrão do pandas seria um objeto por célula)
+        with pd.option_context('mode.string_storage', 'pyarrow'):
+            df = pd.read_parquet(caminho)
+    except Exception:
+        # Entrada corrompida ou gravada por outra versão do pyarrow: descartar e reprocessar
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+        return None
+
+    # Atualizar o mtime marca a entrada como usada recentemente para a evicção
+    try:
+        os.utime(caminho)
+    except OSError:
+        pass
+    return df
+
+
+def _gravar_cache_colunar(chave, df):
+    """
+    Grava o DataFrame processado no cache em disco. Falhas são ignoradas: o cache é opcional
+    """
+    caminho = _caminho_cache(chave)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_parquet(temporario, index=False)
+        # Gravação atômica: outro worker nunca enxerga um arquivo pela metade
+        os.replace(temporario, caminho)
+    except Exception:
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        return
+
+    _limpar_cache_colunar()
+
+
+def _limpar_cache_colunar():
+    """
+    Remove entradas mais antigas que CACHE_MAX_DIAS e, se o total passar de CACHE_MAX_MB,
+    as menos usadas recentemente (a entrada mais recente é sempre mantida)
+    """
+    try:
+        entradas = []
+        for nome in os.listdir(CACHE_DIR):
+            if not nome.endswith('.parquet'):
+                continue
+            caminho = os.path.join(CACHE_DIR, nome)
+            info = os.stat(caminho)
+            entradas.append((info.st_mtime, info.st_size, caminho))
+    except OSError:
+        return
+
+    agora = time.time()
+    limite_bytes = CACHE_MAX_MB * 1024 * 1024
+    total = 0
+    for i, (mtime, tamanho, caminho) in enumerate(sorted(entradas, reverse=True)):
+        expirada = (agora - mtime) > CACHE_MAX_DIAS * 86400
+        total += tamanho
+        if i > 0 and (expirada or total > limite_bytes):
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
 
-        mask = (df['Data Abertura Datetime'].dt.date >= date_range[0]) & (df['Data Abertura Datetime'].dt.date <= date_range[1])
-        df_filtered = df[mask]
-    else:
-        df_filtered = df.copy()
-    
-    if tecnico_selecionado != 'Todos':
-        df_filtered = df_filtered[df_filtered['Atribuído - Técnico'] == tecnico_selecionado]
-    
-    if status_selecionado != 'Todos':
-        df_filtered = df_filtered[df_filtered['Status'] == status_selecionado]
-    
-    if prioridade_selecionada != 'Todas':
-        df_filtered = df_filtered[df_filtered['Prioridade'] == prioridade_selecionada]
-    
-    if 'Categoria Limpa' in df.columns and categoria_selecionada != 'Todas':
-        df_filtered = df_filtered[df_filtered['Categoria Limpa'] == categoria_selecionada]
-    
-    # Aplicar filtros interativos
-    if st.session_state.filtro_status is not None:
-        df_filtered = df_filtered[df_filtered['Status'] == st.session_state.filtro_status]
-    
-    if st.session_state.filtro_categoria is not None:
-        df_filtered = df_filtered[df_filtered['Categoria Limpa'] == st.session_state.filtro_categoria]
-    
-    if st.session_state.filtro_tecnico is not None:
-        df_filtered = df_filtered[df_filtered['Atribuído - Técnico'] == st.session_state.filtro_tecnico]
-    
-    if st.session_state.filtro_prioridade is not None:
-        df_filtered = df_filtered[df_filtered['Prioridade'] == st.session_state.filtro_prioridade]
 
-# Página principal
-st.title("📊 Dashboard de Análise de Chamados Técnicos - HMSI")
+# Formatos de data das exportações do GLPI (dia primeiro, com '/' ou '-').
+# O formato é detectado uma vez por coluna e a conversão usa formato explícito,
+# evitando a inferência elemento a elemento do pd.to_datetime.
+FORMATOS_DATA = [
+    '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y',
+    '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M', '%d-%m-%Y',
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+]
+COLUNAS_DATA = {
+    'Data Abertura': 'Data Abertura Datetime',
+    'Data Atualização': 'Data Atualização Datetime',
+    'Data SLA': 'Data SLA Datetime',
+}
 
 
-# Verificar se os dados foram carregados
-if df.empty:
+def _detectar_formatos_data(serie, tamanho_amostra=1000):
+    """
+    Detecta, a partir de uma amostra, os formatos de data presentes na coluna,
+    do mais para o menos frequente (colunas com '/' e '-' misturados retornam os dois)
+    """
+    amostra = serie.dropna()
+    if len(amostra) > tamanho_amostra:
+        passo = len(amostra) // tamanho_amostra
+        amostra = amostra.iloc[::passo]
+    amostra = amostra.astype(str)
+
+    formatos = []
+    while len(amostra) > 0:
+        melhor_formato, melhor_ok = None, None
+        for formato in FORMATOS_DATA:
+            if formato in formatos:
+                continue
+            ok = pd.to_datetime(amostra, format=formato, errors='coerce').notna()
+            if melhor_ok is None or ok.sum() > melhor_ok.sum():
+                melhor_formato, melhor_ok = formato, ok
+        if melhor_ok is None or not melhor_ok.any():
+            break
+        formatos.append(melhor_formato)
+        amostra = amostra[~melhor_ok]
+    return formatos
 
-    st.error("⚠️ Nenhum dado encontrado! Verifique se o arquivo glpi.csv está na raiz do projeto.")
-    st.stop()
 
-# Mostrar informações dos dados
-periodo_txt = ""
-if 'Data Abertura Datetime' in df.columns:
-    datas_validas_info = df['Data Abertura Datetime'].dropna()
-    if not datas_validas_info.empty:
-        min_date = datas_validas_info.min().date()
-        max_date = datas_validas_info.max().date()
-        periodo_txt = f" | **📅 Período:** {min_date.strftime('%d/%m/%Y')} a {max_date.strftime('%d/%m/%Y')}"
+def _converter_datas(serie, formatos):
+    """
+    Converte a coluna usando os formatos detectados; cada formato seguinte só é
+    aplicado às linhas que ainda não foram reconhecidas.
+    Retorna as datas convertidas e quantos valores preenchidos viraram NaT
+    """
+    if not formatos:
+        datas = pd.to_datetime(serie, dayfirst=True, errors='coerce')
     else:
-        periodo_txt = " | **📅 Período:** Dados de data ausentes/invalidos"
+        datas = pd.to_datetime(serie, format=formatos[0], errors='coerce')
+        for formato in formatos[1:]:
+            faltando = datas.isna() & serie.notna()
+            if not faltando.any():
+                break
+            datas[faltando] = pd.to_datetime(serie[faltando], format=formato, errors='coerce')
 
-st.markdown(f"**📊 Total de registros:** {len(df):,} chamados{periodo_txt}")
+    invalidas = int((datas.isna() & serie.notna()).sum())
+    return datas, invalidas
 
-st.link_button("📄 Baixar base de dados e importar no projeto", "https://drive.google.com/file/d/1iVUn2XvAvNz27TBHmDmE9ivZgUpnmALX/view?usp=sharing")
 
-# Iniciar visualizações
-if True:
-    # Métricas principais resumidas
-    st.markdown("---")
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        total_chamados = len(df_filtered)
-        st.metric("📞 Total de Chamados", f"{total_chamados:,}")
-    with col2:
-        tempo_medio = df_filtered['Tempo Resolução (h)'].mean()
-        st.metric("⏱️ Tempo Médio (h)", f"{tempo_medio:.1f}" if not pd.isna(tempo_medio) else "N/A")
-    with col3:
-        dentro_sla = len(df_filtered[df_filtered['Tempo Resolução (h)'] <= 8]) / len(df_filtered) * 100 if len(df_filtered) > 0 else 0
-        st.metric("✅ Dentro do SLA (8h)", f"{dentro_sla:.1f}%" if not pd.isna(dentro_sla) else "N/A")
-    with col4:
-        chamados_por_tecnico = len(df_filtered) / df_filtered['Atribuído - Técnico'].nunique() if df_filtered['Atribuído - Técnico'].nunique() > 0 else 0
-        st.metric("👥 Chamados/Técnico", f"{chamados_por_tecnico:.1f}")
+# Esquema das colunas da exportação do GLPI usadas pelo dashboard: (obrigatória, dtype na leitura).
+# Só essas colunas são lidas do CSV, então memória e tempo de parse acompanham o que o
+# dashboard usa e não a largura da exportação. dtype None mantém a inferência do pandas.
+# Textos livres ficam em buffers do Arrow (TEXTO) em vez de um objeto Python por célula.
+TEXTO = 'string[pyarrow]'
+ESQUEMA_GLPI = {
+    'ID': (True, None),
+    'Título': (True, TEXTO),
+    'Status': (True, 'category'),
+    'Prioridade': (True, 'category'),
+    'Categoria': (True, 'category'),
+    'Atribuído - Técnico': (True, 'category'),
+    'Requerente - Requerente': (True, 'category'),
+    'Localização': (True, 'category'),
+    'Data Abertura': (True, TEXTO),
+    'Hora Abertura': (False, 'category'),
+    'Data Atualização': (True, TEXTO),
+    'Data SLA': (False, TEXTO),
+}
 
 
-    st.markdown("---")
-    
-    # ABAS PRINCIPAIS DE ANÁLISE
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11 = st.tabs([
-        "📊 1. KPIs", 
-        "⏰ 2. Temporal", 
-        "🏷️ 3. Categoria",
-        "👨‍💻 4. Técnicos",
-        "👥 5. Requerentes",
-        "🏥 6. Localização",
-        "⚡ 7. Prioridade",
-        "📈 8. Status",
-        "🔮 9. Preditiva",
-        "✅ 10. Qualidade",
-        "🖨️ 11. Específicas"
-    ])
-    
-    # ====================================================================
-    # ABA 1: INDICADORES DE PERFORMANCE (KPIs)
-    # ====================================================================
-    with tab1:
-        st.header("📊 Indicadores de Performance (KPIs)")
-        
-        # KPIs principais
-        col_kpi1, col_kpi2, col_kpi3 = st.columns(3)
-        
-        with col_kpi1:
-            st.subheader("✅ Taxa de Resolução")
-            status_counts = df_filtered['Status'].value_counts()
-            total = len(df_filtered)
-            
-            # Calcular percentuais
-            fechados = status_counts.get('Fechado', 0) / total * 100 if total > 0 else 0
-            solucionados = status_counts.get('Solucionado', 0) / total * 100 if total > 0 else 0
-            pendentes = status_counts.get('Pendente', 0) / total * 100 if total > 0 else 0
-            
-            # Gráfico de pizza - Status
-            fig_status = px.pie(
-                values=[status_counts.get('Fechado', 0), status_counts.get('Solucionado', 0), status_counts.get('Pendente', 0)],
-                names=['Fechado', 'Solucionado', 'Pendente'],
-                         title="Distribuição por Status",
-                color_discrete_sequence=['#28a745', '#17a2b8', '#ffc107'],
-                hole=0.4
-            )
-            fig_status.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_status, use_container_width=True)
-            
-            c1, c2, c3 = st.columns(3)
-            with c1:
-                st.metric("Fechados", f"{fechados:.1f}%", delta=f"{status_counts.get('Fechado', 0)} chamados")
-            with c2:
-                st.metric("Solucionados", f"{solucionados:.1f}%", delta=f"{status_counts.get('Solucionado', 0)} chamados")
-            with c3:
-                st.metric("Pendentes", f"{pendentes:.1f}%", delta=f"{status_counts.get('Pendente', 0)} chamados")
-        
-        with col_kpi2:
-            st.subheader("⏱️ Tempo Médio de Resolução")
-            tempo_stats = df_filtered['Tempo Resolução (h)'].describe()
-            
-            fig_tempo = go.Figure(go.Indicator(
-                mode = "gauge+number+delta",
-                value = tempo_stats['mean'] if not pd.isna(tempo_stats['mean']) else 0,
-                domain = {'x': [0, 1], 'y': [0, 1]},
-                title = {'text': "Tempo Médio (horas)"},
-                delta = {'reference': 24},
-                gauge = {
-                    'axis': {'range': [None, 72]},
-                    'bar': {'color': "#007bff"},
-                    'steps' : [
-                        {'range': [0, 8], 'color': "#d4edda"},
-                        {'range': [8, 24], 'color': "#fff3cd"},
-                        {'range': [24, 72], 'color': "#f8d7da"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 24
-                    }
-                }
-            ))
-            st.plotly_chart(fig_tempo, use_container_width=True)
-            
-            c1, c2, c3 = st.columns(3)
-            with c1:
-                st.metric("Média", f"{tempo_stats['mean']:.1f}h" if not pd.isna(tempo_stats['mean']) else "N/A")
-            with c2:
-                st.metric("Mediana", f"{tempo_stats['50%']:.1f}h" if not pd.isna(tempo_stats['50%']) else "N/A")
-            with c3:
-                st.metric("Máximo", f"{tempo_stats['max']:.1f}h" if not pd.isna(tempo_stats['max']) else "N/A")
-        
-        with col_kpi3:
-            st.subheader("📈 SLA Compliance")
-            
-            # Calcular SLA (8h)
-            total_resolvidos = len(df_filtered[df_filtered['Status'].isin(['Fechado', 'Solucionado'])])
-            dentro_sla_count = len(df_filtered[(df_filtered['Tempo Resolução (h)'] <= 8) & (df_filtered['Status'].isin(['Fechado', 'Solucionado']))])
-            fora_sla_count = total_resolvidos - dentro_sla_count
-            
-            sla_percent = (dentro_sla_count / total_resolvidos * 100) if total_resolvidos > 0 else 0
-            
-            # Gráfico de SLA
-            fig_sla = go.Figure(data=[
-                go.Bar(name='Dentro do SLA (≤8h)', x=['SLA'], y=[dentro_sla_count], marker_color='#28a745'),
-                go.Bar(name='Fora do SLA (>8h)', x=['SLA'], y=[fora_sla_count], marker_color='#dc3545')
-            ])
-            fig_sla.update_layout(
-                title="Cumprimento do SLA (8 horas)",
-                barmode='stack',
-                showlegend=True
-            )
-            st.plotly_chart(fig_sla, use_container_width=True)
-            
-            c1, c2 = st.columns(2)
-            with c1:
-                st.metric("✅ Dentro do SLA", f"{sla_percent:.1f}%", delta=f"{dentro_sla_count} chamados")
-            with c2:
-                st.metric("❌ Fora do SLA", f"{100-sla_percent:.1f}%", delta=f"{fora_sla_count} chamados", delta_color="inverse")
-        
-        st.markdown("---")
-        
-        # Produtividade por técnico
-        st.subheader("🚀 Produtividade por Técnico")
-        col_prod1, col_prod2 = st.columns(2)
-        
-        with col_prod1:
-            # Chamados por técnico
-            df_tecnicos = df_filtered.groupby('Atribuído - Técnico').agg({
-                'ID': 'count',
-                'Tempo Resolução (h)': 'mean'
-            }).reset_index()
-            df_tecnicos.columns = ['Técnico', 'Total Chamados', 'Tempo Médio (h)']
-            df_tecnicos = df_tecnicos.sort_values('Total Chamados', ascending=False).head(10)
-            
-            fig_tec = px.bar(
-                df_tecnicos, 
-                x='Total Chamados', 
-                y='Técnico',
-                title="Top 10 Técnicos - Volume de Chamados",
-                orientation='h',
-                color='Total Chamados',
-                color_continuous_scale='Blues',
-                text='Total Chamados'
-            )
-            fig_tec.update_traces(textposition='outside')
-            st.plotly_chart(fig_tec, use_container_width=True)
-        
-        with col_prod2:
-            # Eficiência (Chamados/hora)
-            df_tecnicos['Eficiência'] = df_tecnicos['Total Chamados'] / df_tecnicos['Tempo Médio (h)']
-            df_tecnicos_ef = df_tecnicos.sort_values('Eficiência', ascending=False).head(10)
-            
-            fig_ef = px.bar(
-                df_tecnicos_ef,
-                x='Eficiência',
-                y='Técnico',
-                title="Top 10 Técnicos - Eficiência (Chamados/Hora)",
-                orientation='h',
-                         color='Eficiência',
-                color_continuous_scale='Greens',
-                text='Eficiência'
-            )
-            fig_ef.update_traces(textposition='outside', texttemplate='%{text:.2f}')
-            st.plotly_chart(fig_ef, use_container_width=True)
-
-    # ====================================================================
-    # ABA 2: ANÁLISE TEMPORAL
-    # ====================================================================
-    with tab2:
-        st.header("⏰ Análise Temporal dos Chamados")
-        
-        # Volume por período
-        st.subheader("📅 Volume por Período")
-        col_temp1, col_temp2 = st.columns(2)
-        
-        with col_temp1:
-            # Chamados por mês
-            df_mensal = df_filtered.groupby(df_filtered['Data Abertura Datetime'].dt.to_period('M'))['ID'].count().reset_index()
-            df_mensal['Mês'] = df_mensal['Data Abertura Datetime'].astype(str)
-            
-            fig_mes = px.bar(
-                df_mensal, 
-                x='Mês', 
-                y='ID',
-                title="📊 Volume de Chamados por Mês",
-                labels={'ID': 'Número de Chamados', 'Mês': 'Período'},
-                         color='ID',
+def _colunas_do_esquema(fonte):
+    """
+    Lê apenas o cabeçalho do CSV, valida as colunas obrigatórias e devolve
+    as colunas a carregar com seus dtypes
+    """
+    cabecalho = pd.read_csv(fonte, sep=';', encoding='utf-8-sig', nrows=0).columns
+    if hasattr(fonte, 'seek'):
+        fonte.seek(0)
 
-                color_continuous_scale='Blues',
-                text='ID'
-            )
-            fig_mes.update_traces(textposition='outside')
-            fig_mes.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_mes, use_container_width=True)
-        
-        with col_temp2:
-            # Tendência mensal
-            df_mensal['Crescimento'] = df_mensal['ID'].pct_change() * 100
-            
-            fig_trend = px.line(
-                df_mensal,
-                x='Mês',
-                y='ID',
-                title="📈 Tendência de Chamados (Crescimento/Queda)",
-                labels={'ID': 'Total de Chamados'},
-                markers=True
-            )
-            fig_trend.update_traces(line_color='#17a2b8', line_width=3)
-            fig_trend.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_trend, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Horário de pico
-        st.subheader("⏰ Horário de Pico")
-        col_temp3, col_temp4 = st.columns(2)
-        
-        with col_temp3:
-            # Chamados por hora do dia
-            if 'Hora Abertura' in df_filtered.columns:
-                df_filtered['Hora'] = df_filtered['Hora Abertura'].str[:2]  # Pega apenas a hora (primeiros 2 caracteres)
-                df_hora = df_filtered.groupby('Hora')['ID'].count().reset_index().sort_values('Hora')
-                
-                fig_hora = px.bar(
-                    df_hora,
-                    x='Hora',
-                    y='ID',
-                    title="📊 Distribuição de Chamados por Hora do Dia",
-                    labels={'ID': 'Número de Chamados', 'Hora': 'Hora do Dia'},
-                    color='ID',
-                    color_continuous_scale='Oranges',
-                    text='ID'
-                )
-                fig_hora.update_traces(textposition='outside')
-                st.plotly_chart(fig_hora, use_container_width=True)
-        
-        with col_temp4:
-            # Chamados por dia da semana
-            df_filtered['Dia Semana'] = df_filtered['Data Abertura Datetime'].dt.day_name()
-            dias_pt = {'Monday': 'Segunda', 'Tuesday': 'Terça', 'Wednesday': 'Quarta', 
-                      'Thursday': 'Quinta', 'Friday': 'Sexta', 'Saturday': 'Sábado', 'Sunday': 'Domingo'}
-            df_filtered['Dia Semana PT'] = df_filtered['Dia Semana'].map(dias_pt)
-            
-            df_dia_semana = df_filtered.groupby('Dia Semana PT')['ID'].count().reset_index()
-            ordem_dias = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
-            df_dia_semana['Dia Semana PT'] = pd.Categorical(df_dia_semana['Dia Semana PT'], categories=ordem_dias, ordered=True)
-            df_dia_semana = df_dia_semana.sort_values('Dia Semana PT')
-            
-            fig_dia = px.bar(
-                df_dia_semana,
-                x='Dia Semana PT',
-                y='ID',
-                title="📊 Distribuição por Dia da Semana",
-                labels={'ID': 'Número de Chamados', 'Dia Semana PT': 'Dia'},
-                color='ID',
-                color_continuous_scale='Reds',
-                text='ID'
-            )
-            fig_dia.update_traces(textposition='outside')
-            st.plotly_chart(fig_dia, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Velocidade de atendimento
-        st.subheader("⚡ Velocidade de Atendimento")
-        col_temp5, col_temp6 = st.columns(2)
-        
-        with col_temp5:
-            # Distribuição do tempo de resolução
-            fig_dist = px.histogram(
-                df_filtered[df_filtered['Tempo Resolução (h)'] < 100],  # Filtrar outliers
-                x='Tempo Resolução (h)',
-                nbins=30,
-                title="📊 Distribuição do Tempo de Resolução",
-                labels={'Tempo Resolução (h)': 'Tempo (horas)'},
-                color_discrete_sequence=['#6610f2']
-            )
-            fig_dist.add_vline(x=8, line_dash="dash", line_color="red", annotation_text="SLA (8h)")
-            st.plotly_chart(fig_dist, use_container_width=True)
-        
-        with col_temp6:
-            # Box plot por status
-            fig_box = px.box(
-                df_filtered[df_filtered['Tempo Resolução (h)'] < 100],
-                x='Status',
-                y='Tempo Resolução (h)',
-                title="📦 Tempo de Resolução por Status",
-                color='Status',
-                color_discrete_sequence=['#28a745', '#17a2b8', '#ffc107']
-            )
-            st.plotly_chart(fig_box, use_container_width=True)
-    
-    # ====================================================================
-    # ABA 3: ANÁLISE POR CATEGORIA
-    # ====================================================================
-    with tab3:
-        st.header("🏷️ Análise por Categoria")
-        
-        # Top problemas
-        st.subheader("🏆 Top Problemas Mais Frequentes")
-        col_cat1, col_cat2 = st.columns(2)
-        
-        with col_cat1:
-            # Top 10 categorias
-                top_categorias = df_filtered['Categoria Limpa'].value_counts().head(10).reset_index()
-                top_categorias.columns = ['Categoria', 'Quantidade']
-                
+    faltando = [coluna for coluna, (obrigatoria, _) in ESQUEMA_GLPI.items() if obrigatoria and coluna not in cabecalho]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes no CSV: {', '.join(faltando)}")
 
-        fig_top_cat = px.bar(
-            top_categorias,
-            x='Quantidade',
-            y='Categoria',
-            title="📊 Top 10 Categorias Mais Frequentes",
-                             orientation='h',
-                             color='Quantidade',
+    colunas = [coluna for coluna in ESQUEMA_GLPI if coluna in cabecalho]
+    dtypes = {coluna: ESQUEMA_GLPI[coluna][1] for coluna in colunas if ESQUEMA_GLPI[coluna][1] is not None}
+    return colunas, dtypes
 
-            color_continuous_scale='Greens',
-            text='Quantidade'
-        )
-        fig_top_cat.update_traces(textposition='outside')
-        st.plotly_chart(fig_top_cat, use_container_width=True)
-        
-        with col_cat2:
-            # Gráfico de pizza
-                cat_counts = df_filtered['Categoria Limpa'].value_counts()
-
-        if len(cat_counts) > 7:
-                    top_cats = cat_counts.head(7)
-                    outros = cat_counts.iloc[7:].sum()
-                    cat_counts = pd.concat([top_cats, pd.Series([outros], index=['Outros'])])
-                
 
-        cat_df = cat_counts.reset_index()
-        cat_df.columns = ['Categoria', 'Quantidade']
-        
-        fig_cat_pie = px.pie(
-            cat_df,
-            values='Quantidade',
-            names='Categoria',
-            title="🥧 Distribuição Percentual por Categoria",
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_cat_pie.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_cat_pie, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Categorias críticas (maior tempo de resolução)
-        st.subheader("📉 Categorias Críticas (Maior Tempo de Resolução)")
-        col_cat3, col_cat4 = st.columns(2)
-        
-        with col_cat3:
-            # Categorias com maior tempo médio
-            df_cat_tempo = df_filtered.groupby('Categoria Limpa')['Tempo Resolução (h)'].mean().reset_index()
-            df_cat_tempo = df_cat_tempo.sort_values('Tempo Resolução (h)', ascending=False).head(10)
-            df_cat_tempo.columns = ['Categoria', 'Tempo Médio (h)']
-            
-            fig_cat_tempo = px.bar(
-                df_cat_tempo,
-                x='Tempo Médio (h)',
-                y='Categoria',
-                title="⏱️ Categorias com Maior Tempo Médio de Resolução",
-                orientation='h',
-                color='Tempo Médio (h)',
-                color_continuous_scale='Reds',
-                text='Tempo Médio (h)'
-            )
-            fig_cat_tempo.update_traces(textposition='outside', texttemplate='%{text:.1f}h')
-            st.plotly_chart(fig_cat_tempo, use_container_width=True)
-        
-        with col_cat4:
-            # Recorrência - problemas repetitivos
-            df_cat_count = df_filtered.groupby('Categoria Limpa').agg({
-                'ID': 'count',
+# Colunas de baixa cardinalidade guardadas como categóricas: cada valor vira um código
+# inteiro apontando para um dicionário compartilhado, então filtros por igualdade e
+# groupbys trabalham sobre inteiros e o DataFrame ocupa uma fração da memória
+COLUNAS_CATEGORICAS = [
+    'Status', 'Prioridade', 'Categoria', 'Categoria Limpa',
+    'Atribuído - Técnico', 'Localização', 'Requerente - Requerente', 'Hora Abertura',
+]
 
-                'Requerente - Requerente': 'nunique'
-            }).reset_index()
 
-            df_cat_count.columns = ['Categoria', 'Total Chamados', 'Usuários Únicos']
-            df_cat_count['Recorrência'] = df_cat_count['Total Chamados'] / df_cat_count['Usuários Únicos']
-            df_cat_count = df_cat_count.sort_values('Recorrência', ascending=False).head(10)
-            
-            fig_recor = px.scatter(
-                df_cat_count,
-                x='Usuários Únicos',
-                y='Total Chamados',
-                size='Recorrência',
-                color='Recorrência',
-                hover_data=['Categoria'],
-                title="🔄 Recorrência de Problemas (Tamanho = Recorrência)",
-                labels={'Usuários Únicos': 'Usuários Diferentes', 'Total Chamados': 'Total de Chamados'},
-                color_continuous_scale='Viridis',
-                text='Categoria'
-            )
-            st.plotly_chart(fig_recor, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Padrões sazonais
-        st.subheader("💡 Padrões Sazonais - Categoria x Período")
-        
-        # Heatmap: Categoria x Mês
-        df_heatmap = df_filtered.copy()
-        df_heatmap['Mês'] = df_heatmap['Data Abertura Datetime'].dt.to_period('M').astype(str)
-        
-        # Selecionar top 10 categorias para o heatmap
-        top_10_cat = df_filtered['Categoria Limpa'].value_counts().head(10).index.tolist()
-        df_heatmap_filtered = df_heatmap[df_heatmap['Categoria Limpa'].isin(top_10_cat)]
-        
-        heatmap_data = df_heatmap_filtered.pivot_table(
-            index='Categoria Limpa',
-            columns='Mês',
-            values='ID',
-            aggfunc='count',
-            fill_value=0
-        )
-        
-        fig_heatmap = px.imshow(
-            heatmap_data,
-            title="🗓️ Mapa de Calor: Categorias x Meses",
-            labels=dict(x="Mês", y="Categoria", color="Chamados"),
-            color_continuous_scale='YlOrRd',
-            aspect="auto"
-        )
-        st.plotly_chart(fig_heatmap, use_container_width=True)
-        
-        # Tabela de detalhes por categoria
-        st.subheader("📋 Detalhes por Categoria")
-        df_categoria_detalhe = df_filtered.groupby('Categoria Limpa').agg({
-            'ID': 'count',
-            'Tempo Resolução (h)': 'mean',
-            'Requerente - Requerente': 'nunique',
-            'Localização': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'N/A'
-        }).reset_index()
-        df_categoria_detalhe.columns = ['Categoria', 'Total', 'Tempo Médio (h)', 'Usuários Únicos', 'Localização Mais Comum']
-        df_categoria_detalhe = df_categoria_detalhe.sort_values('Total', ascending=False)
-        
-        st.dataframe(df_categoria_detalhe, height=400, use_container_width=True)
-    
-    # ====================================================================
-    # ABA 4: ANÁLISE DE TÉCNICOS
-    # ====================================================================
-    with tab4:
-        st.header("👨‍💻 Análise Completa de Técnicos")
-        
-        # Produtividade individual
-        st.subheader("📊 Produtividade Individual")
-        
-        df_tec_prod = df_filtered.groupby('Atribuído - Técnico').agg({
-            'ID': 'count',
-            'Tempo Resolução (h)': ['mean', 'median'],
-        }).reset_index()
-        df_tec_prod.columns = ['Técnico', 'Total Chamados', 'Tempo Médio (h)', 'Tempo Mediano (h)']
-        df_tec_prod = df_tec_prod.sort_values('Total Chamados', ascending=False)
-        
-        col_tec1, col_tec2 = st.columns(2)
-        
-        with col_tec1:
-            # Chamados por técnico
-            fig_tec_prod = px.bar(
-                df_tec_prod.head(15),
-                x='Total Chamados',
-                y='Técnico',
-                title="📊 Chamados por Técnico (Top 15)",
-                orientation='h',
-                color='Total Chamados',
-                color_continuous_scale='Blues',
-                text='Total Chamados'
-            )
-            fig_tec_prod.update_traces(textposition='outside')
-            st.plotly_chart(fig_tec_prod, use_container_width=True)
-        
-        with col_tec2:
-            # Distribuição de carga (balanceamento)
-            media_chamados = df_tec_prod['Total Chamados'].mean()
-            df_tec_prod['Desvio da Média'] = df_tec_prod['Total Chamados'] - media_chamados
-            
-            fig_balance = px.bar(
-                df_tec_prod.head(15),
-                x='Desvio da Média',
-                y='Técnico',
-                title="⚖️ Balanceamento de Carga (Desvio da Média)",
-                orientation='h',
-                color='Desvio da Média',
-                color_continuous_scale='RdYlGn_r',
-                text='Desvio da Média'
-            )
-            fig_balance.update_traces(textposition='outside', texttemplate='%{text:.0f}')
-            fig_balance.add_vline(x=0, line_dash="dash", line_color="black", annotation_text="Média")
-            st.plotly_chart(fig_balance, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Especialização e Eficiência
-        col_tec3, col_tec4 = st.columns(2)
-        
-        with col_tec3:
-            st.subheader("🎯 Especialização por Técnico")
-            # Categoria dominante por técnico
-            df_espec = df_filtered.groupby(['Atribuído - Técnico', 'Categoria Limpa'])['ID'].count().reset_index()
-            df_espec = df_espec.sort_values('ID', ascending=False).groupby('Atribuído - Técnico').first().reset_index()
-            df_espec.columns = ['Técnico', 'Especialização', 'Chamados']
-            df_espec = df_espec.sort_values('Chamados', ascending=False).head(10)
-            
-            fig_espec = px.sunburst(
-                df_espec,
-                path=['Técnico', 'Especialização'],
-                values='Chamados',
-                title="🎯 Especialização: Técnico x Categoria Dominante",
-                color='Chamados',
-                color_continuous_scale='Viridis'
-            )
-            st.plotly_chart(fig_espec, use_container_width=True)
-        
-        with col_tec4:
-            st.subheader("⏱️ Eficiência (Chamados/Hora)")
-            df_tec_prod['Eficiência'] = df_tec_prod['Total Chamados'] / df_tec_prod['Tempo Médio (h)']
-            df_ef_top = df_tec_prod.sort_values('Eficiência', ascending=False).head(10)
-            
-            fig_ef_tec = px.bar(
-                df_ef_top,
-                x='Eficiência',
-                y='Técnico',
-                title="🚀 Top 10 Técnicos Mais Eficientes",
-                orientation='h',
-                         color='Eficiência',
+def _mapear_categorias(serie, funcao):
+    """
+    Aplica uma transformação de texto apenas aos valores distintos de uma coluna
+    e devolve o resultado já como categórica (sem percorrer linha a linha)
+    """
+    serie = serie.astype('category')
+    novos_valores = funcao(pd.Series(serie.cat.categories))
+    categorias = pd.Index(novos_valores.dropna().unique()).sort_values()
+    mapa_codigos = np.append(categorias.get_indexer(novos_valores), -1)
+    # Código -1 (valor ausente) aponta para a última posição, que mantém -1
+    codigos = mapa_codigos[serie.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codigos, categories=categorias), index=serie.index, name=serie.name)
 
-                color_continuous_scale='Greens',
-                text='Eficiência'
-            )
-            fig_ef_tec.update_traces(textposition='outside', texttemplate='%{text:.2f}')
-            st.plotly_chart(fig_ef_tec, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Ranking com melhor SLA
-        st.subheader("🏆 Ranking de Técnicos - Melhor SLA")
-        
-        df_tec_sla = df_filtered[df_filtered['Status'].isin(['Fechado', 'Solucionado'])].copy()
-        df_tec_sla['Dentro SLA'] = df_tec_sla['Tempo Resolução (h)'] <= 8
-        
-        df_sla_rank = df_tec_sla.groupby('Atribuído - Técnico').agg({
-            'ID': 'count',
-            'Dentro SLA': 'sum'
+
+# Classificador de tipos de chamado pela Categoria Limpa: cada tipo é um bit da coluna
+# 'Tipos', calculada na ingestão uma vez por categoria distinta. Filtrar por tipo
+# vira uma máscara de bits em vez de uma regex sobre a coluna inteira. Um chamado pode
+# ter vários tipos. A tabela entra na versão do cache em disco (VERSAO_DATASET); o inteiro
+# da coluna é o menor sem sinal com um bit por tipo (uint8 até 8 tipos, no máximo 64).
+TIPOS_CHAMADO = {
+    'Impressora': 'IMPRESSORA',
+    'Computador': 'COMPUTADOR',
+    'Hardware': 'TECLADO|MOUSE|MONITOR',
+    'SPDATA': 'SPDATA',
+    'Senha': 'RESET|SENHA',
+    'Tonner': 'TONNER|TONER',
+    'Rede': 'REDE|INTERNET',
+}
+if len(TIPOS_CHAMADO) > 64:
+    raise ValueError(f"TIPOS_CHAMADO tem {len(TIPOS_CHAMADO)} tipos; a coluna 'Tipos' comporta no máximo 64")
+DTYPE_TIPOS = next(tipo for tipo in (np.uint8, np.uint16, np.uint32, np.uint64) if np.iinfo(tipo).bits >= len(TIPOS_CHAMADO))
+BIT_TIPO = {tipo: 1 << posicao for posicao, tipo in enumerate(TIPOS_CHAMADO)}
+
+
+def _classificar_tipos(categorias):
+    """
+    Bits de TIPOS_CHAMADO de cada linha, avaliando as expressões (sem diferenciar
+    maiúsculas) só sobre os valores distintos da coluna
+    """
+    categorias = categorias.astype('category')
+    valores = pd.Series(categorias.cat.categories, dtype=object)
+    # Última posição: código -1 (categoria ausente), sem nenhum tipo
+    bits = np.zeros(len(valores) + 1, dtype=DTYPE_TIPOS)
+    for tipo, padrao in TIPOS_CHAMADO.items():
+        bits[:-1][valores.str.contains(padrao, case=False, regex=True, na=False).to_numpy()] |= BIT_TIPO[tipo]
+    return pd.Series(bits[categorias.cat.codes.to_numpy()], index=categorias.index, name='Tipos')
+
+
+def _filtrar_tipos(dados, *tipos):
+    """
+    Linhas (ou células do cubo) com pelo menos um dos tipos informados
+    """
+    mascara = DTYPE_TIPOS(sum(BIT_TIPO[tipo] for tipo in tipos))
+    return dados[(dados['Tipos'].to_numpy() & mascara) != 0]
+
+
+def _compactar_frame(df):
+    """
+    Converte colunas de baixa cardinalidade para categóricas e reduz o tipo das numéricas
+    """
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns and not isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            df[coluna] = df[coluna].astype('category')
+
+    for coluna in df.select_dtypes(include='integer').columns:
+        df[coluna] = pd.to_numeric(df[coluna], downcast='integer')
+    for coluna in df.select_dtypes(include='float').columns:
+        df[coluna] = pd.to_numeric(df[coluna], downcast='float')
+    return df
+
+
+def _contar_valores(serie):
+    """
+    value_counts que ignora categorias sem ocorrência no recorte atual
+    (em colunas categóricas o pandas lista todas as categorias, inclusive com zero)
+    """
+    contagem = serie.value_counts()
+    return contagem[contagem > 0]
+
+
+def _ordenar_por_abertura(df):
+    """
+    Mantém o dataset em ordem de abertura (datas inválidas no final), de modo que
+    qualquer período vira uma fatia contígua de linhas
+    """
+    if 'Data Abertura Datetime' not in df.columns:
+        return df
+    return df.sort_values('Data Abertura Datetime', kind='stable', na_position='last', ignore_index=True)
+
+
+# SLA em horas úteis: o prazo de cada chamado vem da coluna 'Data SLA' do GLPI
+# (sem ela, SLA_HORAS úteis a partir da abertura) e o tempo só corre dentro do
+# expediente, em dias úteis (máscara seg..dom do np.busday) que não sejam feriados.
+# Violação e folga são calculadas na ingestão e guardadas como colunas do dataset
+SLA_HORAS = 8
+EXPEDIENTE_SLA = os.getenv("GLPI_EXPEDIENTE", "08:00-18:00")
+DIAS_UTEIS_SLA = os.getenv("GLPI_DIAS_UTEIS", "1111100")
+FERIADOS_SLA = [dia.strip() for dia in os.getenv("GLPI_FERIADOS", "").split(",") if dia.strip()]
+
+
+class CalendarioSLA:
+    """
+    Expediente diário e dias úteis para contar horas úteis entre datas,
+    vetorizado com a aritmética de dias úteis do NumPy (np.busday_count)
+    """
+
+    def __init__(self, expediente, dias_uteis, feriados):
+        inicio, fim = (self._minuto_do_dia(hora) for hora in expediente.split('-'))
+        if not 0 <= inicio < fim <= 1440:
+            raise ValueError(f"Expediente inválido: {expediente!r} (use HH:MM-HH:MM no mesmo dia)")
+        self.inicio_turno, self.fim_turno = inicio, fim
+        self.calendario = np.busdaycalendar(weekmask=dias_uteis, holidays=feriados)
+        self.assinatura = f"{expediente}|{dias_uteis}|{','.join(sorted(feriados))}"
+
+    @staticmethod
+    def _minuto_do_dia(hora):
+        horas, minutos = hora.strip().split(':')
+        return int(horas) * 60 + int(minutos)
+
+    def horas_uteis(self, inicio, fim):
+        """
+        Horas úteis de `inicio` até `fim` (Series datetime alinhadas), negativas quando
+        `fim` é anterior a `inicio` e NaN quando falta uma das datas
+        """
+        a = inicio.to_numpy(dtype='datetime64[m]')
+        b = fim.to_numpy(dtype='datetime64[m]')
+        validos = ~(np.isnat(a) | np.isnat(b))
+        sinal = np.where(b < a, -1.0, 1.0)
+        # np.busday_* não aceitam NaT: as linhas inválidas usam uma data qualquer e viram NaN no fim
+        zero = np.datetime64(0, 'm')
+        a, b = np.where(validos, np.minimum(a, b), zero), np.where(validos, np.maximum(a, b), zero)
+        dia_a, dia_b = a.astype('datetime64[D]'), b.astype('datetime64[D]')
+        minuto_a = np.clip((a - dia_a).astype(np.int64), self.inicio_turno, self.fim_turno)
+        minuto_b = np.clip((b - dia_b).astype(np.int64), self.inicio_turno, self.fim_turno)
+        util_a = np.is_busday(dia_a, busdaycal=self.calendario)
+        util_b = np.is_busday(dia_b, busdaycal=self.calendario)
+
+        mesmo_dia = np.where(util_a, minuto_b - minuto_a, 0)
+        dias_inteiros = np.busday_count(dia_a + 1, np.maximum(dia_b, dia_a + 1), busdaycal=self.calendario)
+        dias_distintos = (
+            np.where(util_a, self.fim_turno - minuto_a, 0)
+            + np.where(util_b, minuto_b - self.inicio_turno, 0)
+            + dias_inteiros * (self.fim_turno - self.inicio_turno)
+        )
+        minutos = np.where(dia_a == dia_b, mesmo_dia, dias_distintos)
+        return pd.Series(np.where(validos, sinal * minutos / 60, np.nan), index=inicio.index)
+
+
+CALENDARIO_SLA = CalendarioSLA(EXPEDIENTE_SLA, DIAS_UTEIS_SLA, FERIADOS_SLA)
+# As colunas de SLA e os bits de 'Tipos' vão para o cache em disco: a versão das entradas
+# inclui o calendário e a tabela de tipos (nomes, ordem dos bits e expressões)
+ASSINATURA_TIPOS = json.dumps(list(TIPOS_CHAMADO.items()), ensure_ascii=False)
+VERSAO_DATASET = f"{CACHE_VERSAO}.{_hash_bytes(f'{CALENDARIO_SLA.assinatura}|{ASSINATURA_TIPOS}'.encode())[:8]}"
+
+
+def _sla_na_referencia(abertura, prazo, referencia, calendario=CALENDARIO_SLA):
+    """
+    Tempo útil desde a abertura, folga até o prazo (horas úteis; negativa = além do prazo)
+    e violação, medidos no instante `referencia` (Series alinhadas). Sem `prazo`
+    (None ou NaT), vale o SLA padrão de SLA_HORAS úteis desde a abertura
+    """
+    tempo_util = calendario.horas_uteis(abertura, referencia)
+    folga = SLA_HORAS - tempo_util
+    violado = tempo_util > SLA_HORAS
+    if prazo is not None:
+        com_prazo = prazo.notna() & referencia.notna()
+        folga = folga.where(~com_prazo, calendario.horas_uteis(referencia, prazo))
+        # Prazo e referência fora do expediente podem ter folga 0 e ainda assim estourar
+        violado = violado.where(~com_prazo, referencia > prazo)
+    return tempo_util, folga, violado.astype(bool)
+
+
+def _derivar_sla(lote, calendario=CALENDARIO_SLA):
+    """
+    Colunas de SLA de cada chamado, medidas no instante de referência 'Data Atualização'
+    (a solução, para os resolvidos; a última atualização, para os demais):
+    Tempo Útil (h) desde a abertura, SLA Violado e Folga SLA (h), as horas úteis que
+    restavam até o prazo (negativa = horas úteis além do prazo).
+    Para chamados em aberto o valor é provisório (vai para o cache em disco): eles são
+    avaliados contra o instante atual na exibição (ver _sla_em_aberto)
+    """
+    lote['Tempo Útil (h)'], lote['Folga SLA (h)'], lote['SLA Violado'] = _sla_na_referencia(
+        lote['Data Abertura Datetime'],
+        lote['Data SLA Datetime'] if 'Data SLA Datetime' in lote.columns else None,
+        lote['Data Atualização Datetime'],
+        calendario
+    )
+
+
+def _sla_em_aberto(linhas, agora, calendario=CALENDARIO_SLA):
+    """
+    Chamados em aberto de `linhas` (Status fora de STATUS_RESOLVIDOS) com a folga até o
+    prazo e a violação medidas em `agora`, em vez da última atualização
+    """
+    abertos = linhas[~linhas['Status'].isin(STATUS_RESOLVIDOS)].copy()
+    _, abertos['Folga SLA (h)'], abertos['SLA Violado'] = _sla_na_referencia(
+        abertos['Data Abertura Datetime'],
+        abertos['Data SLA Datetime'] if 'Data SLA Datetime' in abertos.columns else None,
+        pd.Series(pd.Timestamp(agora), index=abertos.index),
+        calendario
+    )
+    return abertos
+
+
+# Linhas por lote na leitura do CSV: o pico de memória da ingestão acompanha o lote,
+# já que cada lote é convertido para a forma compacta antes do próximo ser lido
+TAMANHO_LOTE = int(os.getenv("GLPI_TAMANHO_LOTE", "200000"))
+
+
+def _derivar_lote(lote, formatos_data, datas_invalidas):
+    """
+    Deriva as colunas do dashboard sobre um lote do CSV e o compacta.
+    Os formatos de data são detectados no primeiro lote e reaproveitados nos seguintes;
+    um lote com valores fora desses formatos detecta os novos só sobre esses valores
+    """
+    for coluna, destino in COLUNAS_DATA.items():
+        if coluna not in lote.columns:
+            continue
+        if not formatos_data.get(coluna):
+            formatos_data[coluna] = _detectar_formatos_data(lote[coluna])
+        formatos = formatos_data[coluna]
+        datas, invalidas = _converter_datas(lote[coluna], formatos)
+        if invalidas and formatos:
+            nao_reconhecidas = lote[coluna][datas.isna() & lote[coluna].notna()]
+            novos = [f for f in _detectar_formatos_data(nao_reconhecidas) if f not in formatos]
+            if novos:
+                formatos.extend(novos)
+                datas, invalidas = _converter_datas(lote[coluna], formatos)
+        lote[destino] = datas
+        if invalidas:
+            datas_invalidas[coluna] = datas_invalidas.get(coluna, 0) + invalidas
+
+    # Calcular tempo de resolução em horas
+    if 'Data Abertura Datetime' in lote.columns and 'Data Atualização Datetime' in lote.columns:
+        lote['Tempo Resolução (h)'] = (lote['Data Atualização Datetime'] - lote['Data Abertura Datetime']).dt.total_seconds() / 3600
+        _derivar_sla(lote)
+
+    # Limpar e padronizar categorias (aplicado só aos valores distintos)
+    if 'Categoria' in lote.columns:
+        lote['Categoria Limpa'] = _mapear_categorias(
+            lote['Categoria'],
+            lambda c: c.str.replace('SETOR DE INFORMATICA > ', '', regex=False).str.replace('SETOR DE INFORMATICA', 'OUTROS')
+        )
+
+    lote = _compactar_frame(lote)
+    # Depois da compactação, que reduziria os bits para int8
+    if 'Categoria Limpa' in lote.columns:
+        lote['Tipos'] = _classificar_tipos(lote['Categoria Limpa'])
+    return lote
+
+
+def _juntar_lotes(lotes):
+    """
+    Concatena os lotes compactados coluna a coluna, já em ordem de abertura, liberando
+    cada coluna dos lotes assim que é copiada (o pico é o dataset mais uma coluna).
+    Categóricas com dicionários diferentes entre lotes são unidas com union_categoricals
+    (pd.concat as converteria de volta para texto)
+    """
+    ordem = None
+    if 'Data Abertura Datetime' in lotes[0].columns:
+        datas = pd.concat([lote['Data Abertura Datetime'] for lote in lotes], ignore_index=True)
+        # Mesmo critério de _ordenar_por_abertura: estável, datas inválidas no final
+        ordem = datas.sort_values(kind='stable', na_position='last').index.to_numpy()
+        del datas
+
+    colunas = {}
+    for coluna in list(lotes[0].columns):
+        partes = [lote.pop(coluna) for lote in lotes]
+        if all(isinstance(parte.dtype, pd.CategoricalDtype) for parte in partes):
+            serie = pd.Series(union_categoricals(partes, sort_categories=True), name=coluna)
+        else:
+            serie = pd.concat(partes, ignore_index=True)
+        del partes
+        if ordem is not None:
+            serie = serie.take(ordem).reset_index(drop=True)
+        colunas[coluna] = serie
+    return pd.DataFrame(colunas, copy=False)
+
+
+def _processar_glpi(fonte, progresso=None):
+    """
+    Pipeline único de ingestão: lê o CSV do GLPI (caminho ou buffer binário) em lotes
+    de TAMANHO_LOTE linhas e deriva as colunas usadas pelo dashboard.
+    progresso(fração lida, linhas lidas), se informado, é chamado a cada lote
+    """
+    if isinstance(fonte, str):
+        with open(fonte, 'rb') as arquivo:
+            return _processar_glpi(arquivo, progresso)
+
+    colunas, dtypes = _colunas_do_esquema(fonte)
+    total_bytes = fonte.seek(0, os.SEEK_END)
+    fonte.seek(0)
+
+    formatos_data = {}
+    datas_invalidas = {}
+    lotes = []
+    linhas = 0
+    leitor = pd.read_csv(fonte, sep=';', encoding='utf-8-sig', usecols=colunas, dtype=dtypes, chunksize=TAMANHO_LOTE)
+    with leitor:
+        for lote in leitor:
+            lotes.append(_derivar_lote(lote, formatos_data, datas_invalidas))
+            linhas += len(lote)
+            if progresso is not None:
+                progresso(min(fonte.tell() / total_bytes, 1.0) if total_bytes else 1.0, linhas)
+
+    if not lotes:
+        # CSV só com o cabeçalho
+        fonte.seek(0)
+        vazio = pd.read_csv(fonte, sep=';', encoding='utf-8-sig', usecols=colunas, dtype=dtypes, nrows=0)
+        lotes = [_derivar_lote(vazio, formatos_data, datas_invalidas)]
+
+    df = _juntar_lotes(lotes)
+
+    df.attrs['formatos_data'] = formatos_data
+    df.attrs['datas_invalidas'] = datas_invalidas
+    return df
+
+
+def _processar_com_progresso(fonte):
+    """
+    _processar_glpi com barra de progresso na sidebar (removida ao terminar)
+    """
+    barra = st.sidebar.progress(0.0, text="📥 Lendo CSV...")
+    try:
+        return _processar_glpi(
+            fonte,
+            progresso=lambda fracao, linhas: barra.progress(fracao, text=f"📥 Lendo CSV: {linhas:,} linhas")
+        )
+    finally:
+        barra.empty()
+
+
+def _carregar_dataset(fonte, conteudo_hash, processar=_processar_glpi):
+    """
+    Lê o dataset do cache em disco pelo hash do conteúdo bruto ou o processa com
+    `processar` (gravando o resultado no cache)
+    """
+    chave = f"v{VERSAO_DATASET}-{conteudo_hash}"
+    df = _ler_cache_colunar(chave)
+    _contar_cache('disco', df is not None)
+    if df is None:
+        with _etapa('processar_csv') as registro:
+            df = processar(fonte)
+            registro['linhas_saida'] = len(df)
+        _gravar_cache_colunar(chave, df)
+
+    # Identificador do dataset usado pelos caches e índices em memória
+    df.attrs['hash'] = chave
+    return df
+
+
+def _mesclar_delta(df, delta):
+    """
+    Upsert por ID: linhas do delta substituem as de mesmo ID no dataset e IDs novos são
+    acrescentados. O delta chega já processado (colunas derivadas calculadas só para ele);
+    o dataset só é recortado e intercalado com o delta em ordem de abertura
+    """
+    delta = delta.drop_duplicates('ID', keep='last')
+    base = df[~df['ID'].isin(delta['ID'])]
+
+    # Colunas opcionais presentes só de um lado ficam vazias do outro, com o mesmo dtype
+    delta = delta.assign(**{
+        coluna: pd.Series(index=delta.index, dtype=df[coluna].dtype) for coluna in df.columns.difference(delta.columns)
+    })
+    base = base.assign(**{
+        coluna: pd.Series(index=base.index, dtype=delta[coluna].dtype) for coluna in delta.columns.difference(df.columns)
+    })
+    colunas = list(df.columns) + [coluna for coluna in delta.columns if coluna not in df.columns]
+
+    # Os dois lados já estão em ordem de abertura: a ordenação estável só intercala as duas sequências
+    mesclado = _juntar_lotes([base[colunas].copy(deep=False), delta[colunas].copy(deep=False)])
+
+    # Datas inválidas recontadas sobre o resultado (linhas substituídas saem da conta)
+    datas_invalidas = {}
+    for coluna, destino in COLUNAS_DATA.items():
+        if coluna in mesclado.columns:
+            invalidas = int((mesclado[coluna].notna() & mesclado[destino].isna()).sum())
+            if invalidas:
+                datas_invalidas[coluna] = invalidas
+
+    formatos_data = {coluna: list(formatos) for coluna, formatos in df.attrs.get('formatos_data', {}).items()}
+    for coluna, formatos in delta.attrs.get('formatos_data', {}).items():
+        formatos_data.setdefault(coluna, [])
+        formatos_data[coluna] += [f for f in formatos if f not in formatos_data[coluna]]
+
+    mesclado.attrs['formatos_data'] = formatos_data
+    mesclado.attrs['datas_invalidas'] = datas_invalidas
+    return mesclado
+
+
+@st.cache_data
+def _hash_upload(file_id, _arquivo):
+    """
+    Hash do conteúdo enviado, calculado uma vez por upload (o file_id muda a cada envio)
+    direto sobre o buffer do upload, sem copiar os bytes
+    """
+    return _hash_bytes(_arquivo.getbuffer())
+
+
+# Carregar dados
+@st.cache_data
+
+def load_data(hash_upload=None, _upload=None):
+    """
+    Carrega dados do GLPI a partir de upload do usuário ou do arquivo local glpi.csv.
+    O upload é identificado pelo hash do conteúdo; o arquivo em si não entra na chave do cache
+    """
+    _contar_cache('load_data', False)
+    # 1) Se o usuário enviou um arquivo, ler direto do buffer do upload (sem copiar nem decodificar)
+    if _upload is not None:
+        fonte = _upload
+        fonte.seek(0)
+        mensagem_erro = "❌ Erro ao ler arquivo enviado"
+    else:
+        # 2) Caso não haja upload, tentar arquivo local
+        fonte = "glpi.csv"
+        mensagem_erro = "❌ Erro ao carregar dados"
+
+        if not os.path.exists(fonte):
+            st.error("❌ Nenhum arquivo encontrado. Faça upload do glpi.csv na barra lateral.")
+            return pd.DataFrame()
+
+    try:
+        conteudo_hash = hash_upload if _upload is not None else _hash_arquivo(fonte)
+        return _carregar_dataset(fonte, conteudo_hash, _processar_com_progresso)
+
+    except Exception as e:
+        st.error(f"{mensagem_erro}: {e}")
+        return pd.DataFrame()
+
+@st.cache_data
+
+def aplicar_atualizacoes(chave_base, hashes_delta, _df_base, _uploads):
+    """
+    Aplica, em ordem, exportações parciais do GLPI sobre o dataset carregado.
+    Só o delta é lido e derivado; cada passo é guardado no cache em disco com uma chave
+    encadeada (dataset anterior + delta), então reaplicar os deltas de dias anteriores é só leitura
+    """
+    df = _df_base
+    chave = chave_base
+    for hash_delta, upload in zip(hashes_delta, _uploads):
+        proxima = f"v{VERSAO_DATASET}-{_hash_bytes(f'{chave}+{hash_delta}'.encode())}"
+        mesclado = _ler_cache_colunar(proxima)
+        if mesclado is None:
+            try:
+                upload.seek(0)
+                delta = _processar_com_progresso(upload)
+            except Exception as e:
+                # Atualização inválida é ignorada; as demais seguem sobre o dataset atual
+                st.error(f"❌ Erro ao ler atualização {upload.name}: {e}")
+                continue
+            mesclado = _mesclar_delta(df, delta)
+            _gravar_cache_colunar(proxima, mesclado)
+        chave = proxima
+        mesclado.attrs['hash'] = chave
+        df = mesclado
+    return df
+
+
+# Dimensões filtráveis pela sidebar e pelos filtros interativos
+DIMENSOES_FILTRO = ['Atribuído - Técnico', 'Status', 'Prioridade', 'Categoria Limpa']
+
+
+def _intersectar(a, b):
+    """
+    Interseção de dois vetores de posições ordenados e sem repetição,
+    buscando os elementos do menor no maior (O(m log n))
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return a
+    idx = np.searchsorted(b, a).clip(max=len(b) - 1)
+    return a[b[idx] == a]
+
+
+class MotorFiltros:
+    """
+    Índices invertidos do dataset, construídos uma vez por arquivo carregado.
+
+    O dataset fica em ordem de abertura, então o período vira uma fatia contígua
+    [lo, hi) encontrada por busca binária. Para cada dimensão filtrável guarda as
+    posições das linhas de cada valor (agrupadas pelo código da categórica); como
+    essas posições são crescentes, o recorte pelo período também é uma busca binária.
+    Os filtros viram interseções de vetores de posições e o recorte final é
+    materializado uma única vez.
+    """
+
+    def __init__(self, df):
+        self.datas = None
+        if 'Data Abertura Datetime' in df.columns:
+            datas = df['Data Abertura Datetime'].to_numpy()
+            self.total_datas = int((~np.isnat(datas)).sum())
+            validas = datas[:self.total_datas]
+            if np.isnat(validas).any() or (validas[1:] < validas[:-1]).any():
+                df = _ordenar_por_abertura(df)
+                datas = df['Data Abertura Datetime'].to_numpy()
+            self.datas = datas[:self.total_datas]
+
+        self.df = df
+        self.indices = {}
+        for coluna in DIMENSOES_FILTRO:
+            if coluna in df.columns and isinstance(df[coluna].dtype, pd.CategoricalDtype):
+                self.indices[coluna] = self._indexar(df[coluna])
+        self._ordens = {}
+        self._lock_ordens = threading.Lock()
+
+    @staticmethod
+    def _indexar(serie):
+        categorias = serie.cat.categories
+        codigos = serie.cat.codes.to_numpy()
+        # Ordenação estável: dentro de cada código as posições continuam crescentes
+        ordem = np.argsort(codigos, kind='stable')
+        limites = np.searchsorted(codigos[ordem], np.arange(len(categorias) + 1))
+        return categorias, ordem, limites
+
+    def posicoes_valor(self, coluna, valor):
+        categorias, ordem, limites = self.indices[coluna]
+        codigo = categorias.get_indexer([valor])[0]
+        if codigo < 0:
+            return np.empty(0, dtype=np.intp)
+        return ordem[limites[codigo]:limites[codigo + 1]]
+
+    def ordem(self, coluna):
+        """
+        Posições do dataset ordenadas por `coluna` (estável, vazios no final) e quantas
+        delas têm valor. Calculada na primeira vez que a coluna é pedida
+        """
+        with self._lock_ordens:
+            if coluna not in self._ordens:
+                codigos, valores = pd.factorize(self.df[coluna], sort=True)
+                codigos = np.where(codigos < 0, len(valores), codigos)
+                self._ordens[coluna] = (np.argsort(codigos, kind='stable'), int((codigos < len(valores)).sum()))
+            return self._ordens[coluna]
+
+    def limites_datas(self):
+        """
+        Primeira e última data de abertura válidas, ou None se não houver datas
+        """
+        if self.datas is None or self.total_datas == 0:
+            return None
+        return pd.Timestamp(self.datas[0]).date(), pd.Timestamp(self.datas[-1]).date()
+
+    def faixa_periodo(self, inicio, fim):
+        """
+        Fatia [lo, hi) dos chamados abertos entre as datas inicio e fim, inclusive
+        """
+        limite_inferior = np.datetime64(pd.Timestamp(inicio), 'ns')
+        limite_superior = np.datetime64(pd.Timestamp(fim) + pd.Timedelta(days=1), 'ns')
+        lo = int(np.searchsorted(self.datas, limite_inferior, side='left'))
+        hi = int(np.searchsorted(self.datas, limite_superior, side='left'))
+        return lo, hi
+
+    def filtrar(self, periodo=None, filtros=None):
+        """
+        Resolve os filtros em posições de linha.
+        periodo: (data_inicio, data_fim) ou None
+        filtros: dict coluna -> lista de valores exigidos (todos precisam coincidir)
+        Retorna None quando nenhum filtro está ativo (todas as linhas), uma slice
+        quando só o período está ativo, ou um vetor de posições crescentes
+        """
+        faixa = None
+        if periodo is not None and self.datas is not None:
+            faixa = self.faixa_periodo(*periodo)
+
+        conjuntos = []
+        for coluna, valores in (filtros or {}).items():
+            for valor in set(valores):
+                posicoes = self.posicoes_valor(coluna, valor)
+                if faixa is not None:
+                    posicoes = posicoes[np.searchsorted(posicoes, faixa[0]):np.searchsorted(posicoes, faixa[1])]
+                conjuntos.append(posicoes)
+
+        if not conjuntos:
+            return slice(*faixa) if faixa is not None else None
+
+        # Começar pelo menor conjunto reduz o custo de cada interseção
+        conjuntos.sort(key=len)
+        posicoes = conjuntos[0]
+        for conjunto in conjuntos[1:]:
+            if len(posicoes) == 0:
+                break
+            posicoes = _intersectar(posicoes, conjunto)
+        return posicoes
+
+    def materializar(self, posicoes, colunas=None):
+        """
+        Cria o DataFrame filtrado a partir das posições (única cópia dos dados),
+        com todas as colunas ou só as pedidas
+        """
+        df = self.df if colunas is None else pd.DataFrame({coluna: self.df[coluna] for coluna in colunas}, copy=False)
+        if posicoes is None:
+            # Cópia rasa: colunas novas criadas nas abas não alteram o dataset em cache
+            return df.copy(deep=False)
+        if isinstance(posicoes, slice):
+            return df.iloc[posicoes].copy(deep=False)
+        return df.take(posicoes)
+
+
+@st.cache_resource(max_entries=4)
+def _motor_filtros(hash_dataset, _df):
+    """
+    Mantém um motor de filtros por dataset (chave = hash do conteúdo)
+    """
+    return MotorFiltros(_df)
+
+
+# Status considerados resolvidos
+STATUS_RESOLVIDOS = ['Fechado', 'Solucionado']
+
+# Cubo OLAP: medidas aditivas por dia de abertura e pelas dimensões de análise,
+# montado uma vez por dataset. Contagens e tempos médios de qualquer recorte saem da
+# soma das células que casam com os filtros, sem varrer as linhas dos chamados.
+# 'Tipos' depende só da categoria: entra nas células sem multiplicá-las
+DIMENSOES_CUBO = ['Categoria Limpa', 'Atribuído - Técnico', 'Status', 'Prioridade', 'Localização', 'Tipos']
+MEDIDAS_CUBO = ['Chamados', 'Horas Válidas', 'Soma Horas', 'Até SLA', 'Fora SLA']
+
+
+class CuboOLAP:
+    """
+    Células (Dia, dimensões) com as medidas somadas dos chamados de cada célula:
+    Chamados, Horas Válidas (tempo de resolução preenchido), Soma Horas,
+    Até SLA e Fora SLA (prazo cumprido ou violado, ver _derivar_sla; só chamados
+    resolvidos, cuja situação de SLA é definitiva, e cujo prazo pôde ser avaliado).
+    Medidas restritas a resolvidos saem filtrando as células por Status
+    """
+
+    def __init__(self, df):
+        dimensoes = [coluna for coluna in DIMENSOES_CUBO if coluna in df.columns]
+        horas = df['Tempo Resolução (h)'].astype('float64')
+        # Chamados em aberto são avaliados contra o instante atual, fora do cubo (_sla_em_aberto)
+        resolvidos = df['Status'].isin(STATUS_RESOLVIDOS).to_numpy()
+        base = pd.DataFrame({
+            'Dia': df['Data Abertura Datetime'].dt.normalize(),
+            **{coluna: df[coluna] for coluna in dimensoes},
+            'Chamados': np.ones(len(df), dtype=np.int64),
+            'Horas Válidas': horas.notna(),
+            'Soma Horas': horas.fillna(0),
+            'Até SLA': resolvidos & df['Folga SLA (h)'].notna() & ~df['SLA Violado'],
+            'Fora SLA': resolvidos & df['SLA Violado'],
+        })
+        self.celulas = base.groupby(['Dia'] + dimensoes, observed=True, dropna=False, sort=False).sum().reset_index()
+
+    def filtrar(self, periodo=None, filtros=None):
+        """
+        Células do recorte, com o mesmo critério do MotorFiltros
+        (período inclusivo pela data de abertura; todos os valores exigidos precisam coincidir)
+        """
+        mascara = np.ones(len(self.celulas), dtype=bool)
+        if periodo is not None:
+            dias = self.celulas['Dia']
+            inicio = pd.Timestamp(periodo[0])
+            fim = pd.Timestamp(periodo[1]) + pd.Timedelta(days=1)
+            mascara &= ((dias >= inicio) & (dias < fim)).to_numpy()
+        for coluna, valores in (filtros or {}).items():
+            for valor in set(valores):
+                mascara &= (self.celulas[coluna] == valor).to_numpy()
+        return self.celulas[mascara].reset_index(drop=True)
+
+
+@st.cache_resource(max_entries=4)
+def _cubo_olap(hash_dataset, _df):
+    """
+    Mantém um cubo por dataset (chave = hash do conteúdo)
+    """
+    return CuboOLAP(_df)
+
+
+def _rollup(cubo, por):
+    """
+    Soma as medidas das células agrupando só por `por` (colunas do cubo ou séries derivadas, como o mês)
+    """
+    return cubo.groupby(por, observed=True)[MEDIDAS_CUBO].sum()
+
+
+def _contar_cubo(cubo, coluna):
+    """
+    Mesmo resultado de _contar_valores(df[coluna]), somando os Chamados das células
+    """
+    contagem = cubo.groupby(coluna, observed=False)['Chamados'].sum()
+    contagem = contagem.sort_values(ascending=False)
+    return contagem[contagem > 0]
+
+
+def _tempo_medio(soma_horas, horas_validas):
+    """
+    Tempo médio de resolução a partir das medidas somadas (NaN quando não há tempos preenchidos)
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return soma_horas / horas_validas
+
+
+def _mes_cubo(cubo):
+    return cubo['Dia'].dt.to_period('M')
+
+
+# Backlog em qualquer dia: cada chamado gera um evento de abertura (dia da abertura) e,
+# se resolvido, um de fechamento (dia da última atualização). Os eventos ficam somados
+# por (Dia, dimensões) como no cubo OLAP, e o backlog no fim de cada dia é a soma
+# acumulada de aberturas - fechamentos, sem voltar às linhas dos chamados
+MEDIDAS_BACKLOG = ['Aberturas', 'Fechamentos']
+
+
+class CuboBacklog(CuboOLAP):
+    """
+    Células (Dia do evento, dimensões) com Aberturas e Fechamentos.
+    Filtra pelas dimensões com o mesmo critério do CuboOLAP
+    """
+
+    def __init__(self, df):
+        dimensoes = [coluna for coluna in DIMENSOES_CUBO if coluna in df.columns]
+        abertura = df['Data Abertura Datetime'].dt.normalize()
+        fechamento = pd.Series(pd.NaT, index=df.index, dtype=abertura.dtype)
+        if 'Data Atualização Datetime' in df.columns:
+            fechamento = df['Data Atualização Datetime'].dt.normalize().where(df['Status'].isin(STATUS_RESOLVIDOS))
+            # Atualização anterior à abertura (dado inconsistente) fecha no próprio dia
+            fechamento = fechamento.where(fechamento.isna() | (fechamento >= abertura), abertura)
+
+        validos = abertura.notna()
+        fechados = validos & fechamento.notna()
+        eventos = pd.concat([
+            pd.DataFrame({
+                'Dia': abertura[validos],
+                **{coluna: df[coluna][validos] for coluna in dimensoes},
+                'Aberturas': np.int64(1), 'Fechamentos': np.int64(0),
+            }),
+            pd.DataFrame({
+                'Dia': fechamento[fechados],
+                **{coluna: df[coluna][fechados] for coluna in dimensoes},
+                'Aberturas': np.int64(0), 'Fechamentos': np.int64(1),
+            }),
+        ], ignore_index=True)
+        self.celulas = eventos.groupby(['Dia'] + dimensoes, observed=True, dropna=False, sort=False).sum().reset_index()
+        self.dias = (
+            pd.date_range(self.celulas['Dia'].min(), self.celulas['Dia'].max(), freq='D', name='Dia')
+            if len(self.celulas) > 0 else pd.DatetimeIndex([], name='Dia')
+        )
+
+    def serie(self, filtros=None, periodo=None, por=None):
+        """
+        Backlog no fim de cada dia do `periodo` (todos os dias do dataset se None).
+        Sem `por`: DataFrame com Aberturas, Fechamentos e Backlog por dia.
+        Com `por` (uma dimensão): uma coluna de backlog por valor da dimensão
+        """
+        celulas = self.filtrar(None, filtros)
+        if por is None:
+            saldo = celulas.groupby('Dia')[MEDIDAS_BACKLOG].sum().reindex(self.dias, fill_value=0)
+            saldo['Backlog'] = (saldo['Aberturas'] - saldo['Fechamentos']).cumsum()
+        else:
+            liquido = celulas['Aberturas'] - celulas['Fechamentos']
+            saldo = (
+                liquido.groupby([celulas['Dia'], celulas[por]], observed=True).sum()
+                .unstack(fill_value=0).reindex(self.dias, fill_value=0).cumsum()
+            )
+        # O acumulado percorre o histórico inteiro; o período só recorta o resultado
+        if periodo is not None:
+            saldo = saldo.loc[pd.Timestamp(periodo[0]):pd.Timestamp(periodo[1])]
+        return saldo
+
+
+@st.cache_resource(max_entries=4)
+def _cubo_backlog(hash_dataset, _df):
+    """
+    Mantém um cubo de eventos de backlog por dataset (chave = hash do conteúdo)
+    """
+    return CuboBacklog(_df)
+
+
+# Chamados quase duplicados: títulos normalizados (sem acentos, caixa e pontuação) são
+# comparados por MinHash sobre trigramas de caracteres, com LSH em faixas para achar os
+# pares candidatos em tempo ~linear (sem comparar todos contra todos). Os grupos de
+# títulos semelhantes são calculados uma vez por dataset; no recorte, chamados do mesmo
+# grupo e local abertos a até JANELA_DUPLICADOS_DIAS um do outro formam um agrupamento.
+JANELA_DUPLICADOS_DIAS = float(os.getenv("GLPI_JANELA_DUPLICADOS_DIAS", "7"))
+LIMIAR_DUPLICADOS = float(os.getenv("GLPI_LIMIAR_DUPLICADOS", "0.7"))
+PERMUTACOES_MINHASH = 32
+FAIXAS_LSH = 8
+
+
+def _normalizar_titulos(titulos):
+    """
+    Títulos em minúsculas, sem acentos e com pontuação trocada por espaço
+    ("Impressora não imprime!" -> "impressora nao imprime")
+    """
+    titulos = pd.Series(titulos, dtype=object)
+    return (
+        titulos.str.normalize('NFKD')
+        .str.replace(r'[\u0300-\u036f]', '', regex=True)
+        .str.lower()
+        .str.replace(r'[\W_]+', ' ', regex=True)
+        .str.strip()
+    )
+
+
+def _trigramas(textos):
+    """
+    Conjunto de trigramas de caracteres de cada texto, no formato CSR: o código denso de
+    cada trigrama (0..distintos-1, ordenados e sem repetição por texto), o início de cada
+    texto nesse vetor e o número de trigramas distintos. Extraídos de forma vetorizada a
+    partir dos códigos dos caracteres dos textos concatenados
+    """
+    # Espaços nas pontas: palavras de borda geram trigramas próprios e todo texto tem ao menos um
+    textos = [f" {texto} " for texto in textos]
+    comprimentos = np.fromiter((len(texto) for texto in textos), dtype=np.int64, count=len(textos))
+    codigos = np.frombuffer(''.join(textos).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    fins = np.cumsum(comprimentos)
+
+    trigramas = (codigos[:-2] << np.uint64(42)) | (codigos[1:-1] << np.uint64(21)) | codigos[2:]
+    dono = np.repeat(np.arange(len(textos)), comprimentos)[:-2]
+    validos = np.arange(len(trigramas)) + 3 <= fins[dono]
+    # 3 códigos (< 2^21) num inteiro de 63 bits, trocado por um código denso: (texto, trigrama)
+    # cabe numa única chave inteira, e ordenar/deduplicar é um sort de uma coluna
+    distintos, trigramas = np.unique(trigramas[validos], return_inverse=True)
+    chaves = np.unique(dono[validos] * len(distintos) + trigramas)
+    dono, trigramas = np.divmod(chaves, len(distintos))
+    return trigramas, np.searchsorted(dono, np.arange(len(textos) + 1)), len(distintos)
+
+
+def _assinaturas_minhash(trigramas, inicios, tamanho_bloco=200_000):
+    """
+    Assinatura MinHash (PERMUTACOES_MINHASH valores uint32) de cada texto, sobre os
+    trigramas em CSR de _trigramas, processando `tamanho_bloco` textos por vez
+    """
+    gerador = np.random.default_rng(0)
+    multiplicadores = gerador.integers(1, 2**63, size=PERMUTACOES_MINHASH, dtype=np.uint64) | np.uint64(1)
+    somas = gerador.integers(0, 2**63, size=PERMUTACOES_MINHASH, dtype=np.uint64)
+    quantidade = len(inicios) - 1
+    assinaturas = np.empty((quantidade, PERMUTACOES_MINHASH), dtype=np.uint32)
+
+    for inicio in range(0, quantidade, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, quantidade)
+        # Espalha o trigrama para 32 bits por multiplicação
+        valores_bloco = (trigramas[inicios[inicio]:inicios[fim]].astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)
+        # Os trigramas de cada texto são contíguos: o mínimo por texto é um reduceat
+        segmentos = inicios[inicio:fim] - inicios[inicio]
+        for permutacao in range(PERMUTACOES_MINHASH):
+            valores = (valores_bloco * multiplicadores[permutacao] + somas[permutacao]) >> np.uint64(32)
+            assinaturas[inicio:fim, permutacao] = np.minimum.reduceat(valores, segmentos)
+    return assinaturas
+
+
+def _jaccard(trigramas, inicios, distintos, a, b):
+    """
+    Jaccard exato entre os conjuntos de trigramas dos textos a[k] e b[k], para todos os
+    pares de uma vez: os trigramas dos dois lados viram chaves (par, trigrama) ordenadas e a
+    interseção de cada par é a quantidade de chaves vizinhas iguais
+    """
+    tamanhos = np.diff(inicios)
+
+    def juntar(textos):
+        quantidades = tamanhos[textos]
+        deslocamento = np.cumsum(quantidades) - quantidades
+        posicoes = np.repeat(inicios[textos] - deslocamento, quantidades) + np.arange(quantidades.sum())
+        return np.repeat(np.arange(len(textos), dtype=np.int64), quantidades) * distintos + trigramas[posicoes]
+
+    chaves = np.sort(np.concatenate([juntar(a), juntar(b)]))
+    iguais = chaves[1:][chaves[1:] == chaves[:-1]]
+    intersecao = np.bincount(iguais // distintos, minlength=len(a))
+    return intersecao / (tamanhos[a] + tamanhos[b] - intersecao)
+
+
+def _agrupar_por_lider(assinaturas, trigramas, inicios, distintos, origens, destinos):
+    """
+    Agrupamento em estrela sobre os pares candidatos (origem, destino), com destino < origem:
+    cada texto entra no grupo de menor líder cujo Jaccard exato com ele (com o líder, não com
+    o candidato) atinge LIMIAR_DUPLICADOS; sem nenhum, vira líder do próprio grupo. Assim a
+    similaridade não é tratada como transitiva: todo membro é parecido com o líder.
+    A estimativa MinHash descarta os líderes claramente distantes antes do Jaccard exato.
+    Um texto é decidido quando todos os seus candidatos (índices menores) já foram, em
+    rodadas vetorizadas; o menor índice pendente sempre é decidido, então termina
+    """
+    quantidade = len(assinaturas)
+    lider = np.full(quantidade, -1)
+    origens, destinos = np.divmod(np.unique(origens.astype(np.int64) * quantidade + destinos), quantidade)
+    sem_escolha = quantidade
+
+    while True:
+        pendentes = lider < 0
+        if not pendentes.any():
+            return lider
+        bloqueados = np.zeros(quantidade, dtype=bool)
+        bloqueados[origens[lider[destinos] < 0]] = True
+        prontos = pendentes & ~bloqueados
+
+        usar = prontos[origens]
+        origem, candidato = origens[usar], lider[destinos[usar]]
+        estimada = (assinaturas[origem] == assinaturas[candidato]).mean(axis=1)
+        origem, candidato = origem[estimada >= LIMIAR_DUPLICADOS], candidato[estimada >= LIMIAR_DUPLICADOS]
+        aceitos = _jaccard(trigramas, inicios, distintos, origem, candidato) >= LIMIAR_DUPLICADOS
+        escolha = np.full(quantidade, sem_escolha)
+        np.minimum.at(escolha, origem[aceitos], candidato[aceitos])
+
+        decididos = np.flatnonzero(prontos)
+        lider[decididos] = np.where(escolha[decididos] < sem_escolha, escolha[decididos], decididos)
+        restantes = ~prontos[origens]
+        origens, destinos = origens[restantes], destinos[restantes]
+
+
+def _agrupar_semelhantes(textos):
+    """
+    Agrupa os textos com Jaccard de trigramas >= LIMIAR_DUPLICADOS em relação ao líder do
+    grupo. Em cada faixa do LSH, textos com a faixa idêntica caem no mesmo balde e só o
+    primeiro do balde vira candidato dos demais, então o número de pares é linear no
+    número de textos
+    """
+    quantidade = len(textos)
+    trigramas, inicios, distintos = _trigramas(textos)
+    assinaturas = _assinaturas_minhash(trigramas, inicios)
+    linhas_faixa = PERMUTACOES_MINHASH // FAIXAS_LSH
+    pesos = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5], dtype=np.uint64)
+    origens, destinos = [], []
+    for faixa in range(FAIXAS_LSH):
+        valores = assinaturas[:, faixa * linhas_faixa:(faixa + 1) * linhas_faixa].astype(np.uint64)
+        chaves = (valores * pesos[np.arange(linhas_faixa) % len(pesos)]).sum(axis=1)
+        _, primeiro, balde = np.unique(chaves, return_index=True, return_inverse=True)
+        representante = primeiro[balde]
+        candidatos = np.flatnonzero(representante != np.arange(quantidade))
+        origens.append(candidatos)
+        destinos.append(representante[candidatos])
+
+    return _agrupar_por_lider(assinaturas, trigramas, inicios, distintos, np.concatenate(origens), np.concatenate(destinos))
+
+
+class DetectorDuplicados:
+    """
+    Grupo de títulos semelhantes de cada linha do dataset (-1 para título vazio).
+    Títulos iguais após a normalização já caem no mesmo grupo; o MinHash roda só
+    sobre os títulos normalizados distintos
+    """
+
+    def __init__(self, titulos):
+        codigos_titulo, titulos_distintos = pd.factorize(titulos)
+        normalizados = _normalizar_titulos(titulos_distintos)
+        codigos_normalizado, normalizados_distintos = pd.factorize(normalizados.where(normalizados != ''))
+
+        grupos_normalizado = _agrupar_semelhantes(list(normalizados_distintos))
+        # Códigos -1 (título ou normalização vazia) apontam para a última posição, que mantém -1
+        grupos_titulo = np.append(grupos_normalizado, -1)[codigos_normalizado]
+        self.grupos = np.append(grupos_titulo, -1)[codigos_titulo].astype(np.int32)
+
+    def agrupamentos(self, linhas, janela_dias=JANELA_DUPLICADOS_DIAS):
+        """
+        Agrupamento de quase duplicados de cada linha do recorte (índice = posição no dataset):
+        mesmo grupo de título, mesmo local e aberturas encadeadas a até `janela_dias` dias.
+        Linhas sem par recebem -1
+        """
+        grupos = self.grupos[linhas.index.to_numpy()]
+        locais = linhas['Localização'].cat.codes.to_numpy()
+        datas = linhas['Data Abertura Datetime'].to_numpy().astype('datetime64[m]').astype(np.int64)
+        ordem = np.lexsort((datas, locais, grupos))
+        grupos, locais, datas = grupos[ordem], locais[ordem], datas[ordem]
+
+        janela = int(janela_dias * 1440)
+        novo = np.ones(len(ordem), dtype=bool)
+        novo[1:] = (grupos[1:] != grupos[:-1]) | (locais[1:] != locais[:-1]) | (datas[1:] - datas[:-1] > janela)
+        # Sem título, sem local ou sem data de abertura não agrupa
+        sem_chave = (grupos < 0) | (locais < 0) | (datas == np.iinfo(np.int64).min)
+        novo |= sem_chave
+        agrupamento = np.cumsum(novo) - 1
+        tamanhos = np.bincount(agrupamento)
+        agrupamento[(tamanhos[agrupamento] < 2) | sem_chave] = -1
+
+        resultado = np.empty(len(ordem), dtype=np.int64)
+        resultado[ordem] = agrupamento
+        return pd.Series(resultado, index=linhas.index, name='Agrupamento')
+
+
+@st.cache_resource(max_entries=4)
+def _detector_duplicados(hash_dataset, _titulos):
+    """
+    Mantém um detector de quase duplicados por dataset (chave = hash do conteúdo)
+    """
+    return DetectorDuplicados(_titulos)
+
+
+# Retrabalho: chamado aberto pelo mesmo requerente, na mesma categoria, até
+# JANELA_RETRABALHO_DIAS depois do chamado anterior desse par
+JANELA_RETRABALHO_DIAS = float(os.getenv("GLPI_JANELA_RETRABALHO_DIAS", "7"))
+
+
+def _marcar_retrabalho(df, janela_dias=JANELA_RETRABALHO_DIAS):
+    """
+    Máscara booleana (alinhada às linhas de `df`) dos chamados que reabrem um par
+    (requerente, categoria) a até `janela_dias` dias do chamado anterior. Uma ordenação
+    por (requerente, categoria, abertura) e a diferença entre vizinhos: O(n log n)
+    """
+    requerentes = df['Requerente - Requerente'].cat.codes.to_numpy()
+    categorias = df['Categoria Limpa'].cat.codes.to_numpy()
+    datas = df['Data Abertura Datetime'].to_numpy().astype('datetime64[m]').astype(np.int64)
+    ordem = np.lexsort((datas, categorias, requerentes))
+    requerentes, categorias, datas = requerentes[ordem], categorias[ordem], datas[ordem]
+
+    # Sem requerente, categoria ou data de abertura não há como ligar os chamados
+    valido = (requerentes >= 0) & (categorias >= 0) & (datas != np.iinfo(np.int64).min)
+    reabertura = np.zeros(len(ordem), dtype=bool)
+    reabertura[1:] = (
+        (requerentes[1:] == requerentes[:-1]) & (categorias[1:] == categorias[:-1])
+        & valido[1:] & valido[:-1] & (datas[1:] - datas[:-1] <= int(janela_dias * 1440))
+    )
+
+    marcas = np.empty(len(ordem), dtype=bool)
+    marcas[ordem] = reabertura
+    return marcas
+
+
+@st.cache_resource(max_entries=4)
+def _retrabalho_dataset(hash_dataset, _df):
+    """
+    Marcas de retrabalho do dataset inteiro (uma reabertura conta mesmo quando o chamado
+    anterior está fora do recorte filtrado), calculadas uma vez por dataset
+    """
+    return _marcar_retrabalho(_df)
+
+
+# Cache LRU dos recortes filtrados, compartilhado entre sessões do mesmo processo.
+# A chave é o conjunto completo de filtros; cada entrada guarda o cubo filtrado, as
+# colunas do recorte já materializadas e os agregados calculados sobre eles, então
+# alternar entre combinações recentes não recalcula nada.
+LRU_MAX_MB = float(os.getenv("GLPI_LRU_MAX_MB", "256"))
+
+
+def _bytes_agregado(valor):
+    """
+    Bytes de um agregado guardado na visão, para o limite do LRU de recortes:
+    DataFrames/Series (sem deep, como as colunas), arrays NumPy e, recursivamente,
+    os valores de dicts, listas e tuplas (agregados compostos, como as previsões)
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return int(np.sum(valor.memory_usage(deep=False)))
+    if isinstance(valor, np.ndarray):
+        return int(valor.nbytes)
+    if isinstance(valor, dict):
+        return sum(_bytes_agregado(item) for item in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sum(_bytes_agregado(item) for item in valor)
+    return 0
+
+
+class RecorteDescartado(RuntimeError):
+    """
+    O motor de filtros (e o dataset) do recorte já foi descartado
+    """
+
+
+class VisaoFiltrada:
+    """
+    Recorte filtrado do dataset: as células do cubo que casam com os filtros, as linhas
+    do recorte (materializadas sob demanda, só as colunas pedidas) e os agregados.
+    `dataset` é o DataFrame completo e `periodo`/`filtros` definem o recorte, para
+    estruturas calculadas uma vez por dataset e consultadas por recorte.
+    O motor de filtros (e com ele o dataset) é referenciado fracamente: quem o mantém
+    vivo é o cache por dataset, e um recorte de um upload antigo não segura o dataset
+    inteiro enquanto é cobrado só pelo que guarda. `ao_crescer` é chamado quando o
+    recorte aumenta depois de criado (colunas e agregados), para o cache reavaliar o limite
+    """
+
+    def __init__(self, chave, cubo, motor, periodo=None, filtros=None, posicoes=None):
+        self.chave = chave
+        self.cubo = cubo
+        self.periodo = periodo
+        self.filtros = filtros or {}
+        # Linhas do recorte no dataset, como devolvidas por MotorFiltros.filtrar
+        self.posicoes = posicoes
+        self.agregados = {}
+        self._motor = weakref.ref(motor)
+        self.colunas_dataset = list(motor.df.columns)
+        self._colunas = {}
+        self.tamanho = int(cubo.memory_usage(index=True, deep=False).sum()) + _bytes_agregado(posicoes)
+        self.ao_crescer = None
+        self._lock = threading.Lock()
+        self._lock_colunas = threading.Lock()
+        self._travas = {}
+
+    def _motor_vivo(self):
+        motor = self._motor()
+        if motor is None:
+            raise RecorteDescartado(f"dataset do recorte {self.chave[0]} não está mais carregado")
+        return motor
+
+    def valida(self):
+        return self._motor() is not None
+
+    @property
+    def dataset(self):
+        return self._motor_vivo().df
+
+    def _crescer(self, tamanho):
+        # Chamado fora das travas de colunas/agregados: o aviso ao cache não pode esperar por elas
+        with self._lock:
+            self.tamanho += tamanho
+        if self.ao_crescer is not None and tamanho:
+            self.ao_crescer()
+
+    def colunas(self, nomes):
+        """
+        Linhas do recorte com as colunas pedidas. Cada coluna é materializada uma vez;
+        o DataFrame devolvido é novo, então colunas auxiliares não afetam o cache
+        """
+        acrescimo = 0
+        with self._lock_colunas:
+            faltando = [nome for nome in nomes if nome not in self._colunas]
+            _contar_cache('colunas', not faltando)
+            if faltando:
+                novas = self._motor_vivo().materializar(self.posicoes, faltando)
+                for nome in faltando:
+                    self._colunas[nome] = novas[nome]
+                    # Colunas de texto apontam para os mesmos buffers/objetos do dataset,
+                    # então o custo real de memória é o dos ponteiros (deep=False)
+                    acrescimo += int(novas[nome].memory_usage(index=False, deep=False))
+            resultado = pd.DataFrame({nome: self._colunas[nome] for nome in nomes}, copy=False)
+        self._crescer(acrescimo)
+        return resultado
+
+    @property
+    def df(self):
+        """
+        Recorte completo (todas as colunas do dataset)
+        """
+        return self.colunas(self.colunas_dataset)
+
+    def agregado(self, nome, funcao):
+        """
+        Devolve o agregado `nome`, calculando-o com funcao(visao) na primeira vez.
+        Se outra thread já está calculando o mesmo agregado, espera por ele
+        """
+        with self._lock:
+            if nome in self.agregados:
+                _contar_cache('agregados', True)
+                return self.agregados[nome]
+            trava = self._travas.setdefault(nome, threading.Lock())
+
+        with trava:
+            with self._lock:
+                if nome in self.agregados:
+                    _contar_cache('agregados', True)
+                    return self.agregados[nome]
+            _contar_cache('agregados', False)
+            valor = funcao(self)
+            with self._lock:
+                self.agregados[nome] = valor
+            self._crescer(_bytes_agregado(valor))
+            return valor
+
+
+class CacheLRU:
+    """
+    Cache LRU limitado pelo total de bytes das entradas (atributo `tamanho`),
+    com contadores de acerto/falha. Chamadas simultâneas para a mesma chave
+    esperam a primeira criação em vez de repetir o cálculo.
+    Entradas que crescem depois de inseridas (com atributo `ao_crescer`) avisam o
+    cache, que volta a aplicar o limite; entradas com `valida()` falso são recriadas
+    """
+
+    def __init__(self, max_bytes, nome='lru'):
+        self.max_bytes = max_bytes
+        self.nome = nome
+        self.itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+        self._travas = {}
+
+    def _buscar(self, chave):
+        if chave in self.itens:
+            valida = getattr(self.itens[chave], 'valida', None)
+            if valida is not None and not valida():
+                del self.itens[chave]
+                return False, None
+            self.itens.move_to_end(chave)
+            self.acertos += 1
+            return True, self.itens[chave]
+        return False, None
+
+    def obter(self, chave, criar):
+        with self._lock:
+            encontrado, valor = self._buscar(chave)
+            if encontrado:
+                _contar_cache(self.nome, True)
+                return valor
+            trava = self._travas.setdefault(chave, threading.Lock())
+
+        with trava:
+            with self._lock:
+                encontrado, valor = self._buscar(chave)
+                if encontrado:
+                    _contar_cache(self.nome, True)
+                    return valor
+
+            _contar_cache(self.nome, False)
+            valor = criar()
+            with self._lock:
+                self.falhas += 1
+                self.itens[chave] = valor
+                self.itens.move_to_end(chave)
+                if hasattr(valor, 'ao_crescer'):
+                    valor.ao_crescer = lambda: self.reduzir(chave)
+                self._reduzir(chave)
+                self._travas.pop(chave, None)
+            return valor
+
+    def _reduzir(self, manter):
+        # Descarta as menos usadas até caber no limite; `manter` (a entrada recém-criada
+        # ou que acabou de crescer) fica, mesmo que sozinha passe do limite
+        usados = self.bytes_usados()
+        for chave in list(self.itens):
+            if usados <= self.max_bytes:
+                break
+            if chave != manter:
+                usados -= self.itens.pop(chave).tamanho
+
+    def reduzir(self, manter):
+        with self._lock:
+            self._reduzir(manter)
+
+    def contem(self, chave):
+        with self._lock:
+            return chave in self.itens
+
+    def bytes_usados(self):
+        return sum(item.tamanho for item in self.itens.values())
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                'entradas': len(self.itens),
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'mb': self.bytes_usados() / (1024 * 1024),
+            }
+
+
+@st.cache_resource
+def _cache_visoes():
+    return CacheLRU(LRU_MAX_MB * 1024 * 1024, 'recortes')
+
+
+def _chave_filtros(hash_dataset, periodo, filtros):
+    """
+    Chave canônica do recorte: dataset + período + valores exigidos por dimensão
+    """
+    return (
+        hash_dataset,
+        periodo,
+        tuple(sorted((coluna, tuple(sorted(set(valores)))) for coluna, valores in filtros.items())),
+    )
+
+
+def _criar_visao(chave, motor, cubo, periodo, filtros):
+    """
+    Recorte de (período, filtros): células do cubo já filtradas e, para as linhas,
+    as posições do motor de filtros (materializadas só quando uma seção pedir colunas)
+    """
+    return VisaoFiltrada(
+        chave,
+        cubo.filtrar(periodo, filtros),
+        motor,
+        periodo,
+        filtros,
+        motor.filtrar(periodo, filtros)
+    )
+
+
+# Tabela detalhada paginada no servidor: a ordenação usa a ordem pré-calculada da coluna
+# no dataset inteiro (MotorFiltros.ordem) restrita às linhas do recorte, e só as linhas
+# da página são copiadas. Colunas de data em texto ordenam pela versão datetime
+TAMANHOS_PAGINA = [25, 50, 100, 200, 500]
+CHAVES_ORDENACAO = {
+    'Data Abertura': 'Data Abertura Datetime',
+    'Data Atualização': 'Data Atualização Datetime',
+    'Data SLA': 'Data SLA Datetime',
+}
+
+
+def _posicoes_ordenadas(visao, motor, coluna, crescente):
+    """
+    Posições do recorte ordenadas por `coluna`, guardadas como agregado do recorte
+    (trocar de página não refaz a ordenação)
+    """
+    def ordenar(visao):
+        ordem, com_valor = motor.ordem(coluna)
+        if not crescente:
+            ordem = np.concatenate([ordem[:com_valor][::-1], ordem[com_valor:]])
+        if visao.posicoes is None:
+            return ordem
+        pertence = np.zeros(len(motor.df), dtype=bool)
+        pertence[visao.posicoes] = True
+        return ordem[pertence[ordem]]
+
+    return visao.agregado(f"tabela:{coluna}:{'asc' if crescente else 'desc'}", ordenar)
+
+
+def _buscar_chamados(motor, posicoes, busca):
+    """
+    Mantém das `posicoes` (na ordem em que estão) os chamados cujo título contém `busca`
+    (sem diferenciar maiúsculas) ou cujo ID é igual a ela
+    """
+    busca = busca.strip()
+    if not busca:
+        return posicoes
+    encontrados = np.zeros(len(posicoes), dtype=bool)
+    if 'Título' in motor.df.columns:
+        encontrados |= motor.df['Título'].take(posicoes).str.contains(busca, case=False, regex=False, na=False).to_numpy()
+    if busca.isdigit() and 'ID' in motor.df.columns:
+        encontrados |= motor.df['ID'].to_numpy()[posicoes] == int(busca)
+    return posicoes[encontrados]
+
+
+def _resumo_cabecalho(visao):
+    """
+    Métricas principais exibidas no topo da página, somadas a partir do cubo
+    """
+    medidas = visao.cubo[MEDIDAS_CUBO].sum()
+    total = int(medidas['Chamados'])
+    # SLA dos resolvidos, como na aba de KPIs: o dos abertos muda com o relógio
+    total_resolvidos = visao.cubo.loc[visao.cubo['Status'].isin(STATUS_RESOLVIDOS), 'Chamados'].sum()
+    return {
+        'total': total,
+        'tempo_medio': _tempo_medio(medidas['Soma Horas'], medidas['Horas Válidas']),
+        'dentro_sla': medidas['Até SLA'] / total_resolvidos * 100 if total_resolvidos > 0 else 0,
+    }
+
+
+def _moda_por_grupo(df, grupo, valor, pesos=None):
+    """
+    Valor mais frequente de `valor` em cada grupo, sem chamar Python por grupo:
+    conta os pares (grupo, valor) e fica com o par de maior contagem de cada grupo.
+    Com `pesos`, a contagem é a soma dessa coluna (linhas já agregadas, como as células do cubo).
+    Empates ficam com o menor valor, o mesmo critério de Series.mode()[0].
+    Retorna um DataFrame indexado pelo grupo com as colunas 'moda' e 'frequencia'
+    """
+    if pesos is None:
+        pares = df.groupby([grupo, valor], observed=True).size()
+    else:
+        pares = df.groupby([grupo, valor], observed=True)[pesos].sum()
+    if len(pares) == 0:
+        return pd.DataFrame({'moda': [], 'frequencia': []})
+
+    grupos = pares.index.get_level_values(0)
+    codigos_grupo = pd.factorize(grupos)[0]
+    contagens = pares.to_numpy()
+
+    # Ordenar por grupo, contagem decrescente e, no empate, pela ordem (crescente) dos valores
+    ordem = np.lexsort((np.arange(len(pares)), -contagens, codigos_grupo))
+    codigos_ordenados = codigos_grupo[ordem]
+    primeiros = ordem[np.r_[True, codigos_ordenados[1:] != codigos_ordenados[:-1]]]
+
+    return pd.DataFrame(
+        {'moda': pares.index.get_level_values(1)[primeiros], 'frequencia': contagens[primeiros]},
+        index=grupos[primeiros],
+    )
+
+
+def _agregado_tecnicos(visao):
+    """
+    Estatísticas por técnico a partir do cubo, compartilhadas pelo cabeçalho e pelas
+    abas de KPIs e Técnicos: volume, tempo médio, resolvidos dentro do SLA,
+    categoria dominante e eficiência
+    """
+    cubo = visao.cubo
+    por_tecnico = _rollup(cubo, 'Atribuído - Técnico')
+    resolvidos = _rollup(cubo[cubo['Status'].isin(STATUS_RESOLVIDOS)], 'Atribuído - Técnico')
+
+    tecnicos = pd.DataFrame({
+        'Total Chamados': por_tecnico['Chamados'],
+        'Tempo Médio (h)': _tempo_medio(por_tecnico['Soma Horas'], por_tecnico['Horas Válidas']),
+        'Resolvidos': resolvidos['Chamados'].reindex(por_tecnico.index, fill_value=0),
+        'Dentro SLA': resolvidos['Até SLA'].reindex(por_tecnico.index, fill_value=0),
+    })
+    tecnicos.index.name = 'Técnico'
+    tecnicos['SLA (%)'] = tecnicos['Dentro SLA'] / tecnicos['Resolvidos'] * 100
+    tecnicos['Eficiência'] = tecnicos['Total Chamados'] / tecnicos['Tempo Médio (h)']
+
+    # Categoria dominante de cada técnico
+    dominante = _moda_por_grupo(cubo, 'Atribuído - Técnico', 'Categoria Limpa', pesos='Chamados')
+    tecnicos['Especialização'] = dominante['moda']
+    tecnicos['Chamados Especialização'] = dominante['frequencia']
+
+    return tecnicos.reset_index()
+
+
+# Previsão de demanda mensal: Holt-Winters aditivo (sazonalidade de 12 meses quando há
+# ao menos dois anos de histórico; senão, Holt com tendência) ajustado a todas as séries
+# de uma vez, sobre uma matriz série x mês. Cada série escolhe, numa grade de parâmetros
+# avaliada em lote, a combinação de menor erro um passo à frente; o intervalo de 95% vem
+# da variância desse erro propagada pelo horizonte
+HORIZONTE_PREVISAO = int(os.getenv("GLPI_HORIZONTE_PREVISAO", "3"))
+PERIODO_SAZONAL = 12
+GRADE_HOLT_WINTERS = np.array([
+    (alfa, beta, gama)
+    for alfa in (0.1, 0.3, 0.5, 0.8)
+    for beta in (0.0, 0.1, 0.3)
+    for gama in (0.1, 0.3)
+])
+DIMENSOES_PREVISAO = ['Categoria Limpa', 'Atribuído - Técnico', 'Localização']
+
+
+def _holt_winters_lote(serie, alfa, beta, gama, horizonte, periodo_sazonal):
+    """
+    Holt-Winters aditivo em lote: `serie` (linhas x meses) e um (alfa, beta, gama) por linha.
+    Retorna a previsão (linhas x horizonte) e os erros um passo à frente (linhas x meses,
+    NaN nos meses usados na inicialização)
+    """
+    linhas, meses = serie.shape
+    sazonal = meses >= 2 * periodo_sazonal
+    if sazonal:
+        nivel = serie[:, :periodo_sazonal].mean(axis=1)
+        tendencia = (serie[:, periodo_sazonal:2 * periodo_sazonal].mean(axis=1) - nivel) / periodo_sazonal
+        estacao = serie[:, :periodo_sazonal] - nivel[:, None]
+        aquecimento = periodo_sazonal
+    else:
+        nivel = serie[:, 0].copy()
+        tendencia = serie[:, 1] - serie[:, 0]
+        estacao = np.zeros((linhas, periodo_sazonal))
+        gama = np.zeros(linhas)
+        aquecimento = 2
+
+    erros = np.full((linhas, meses), np.nan)
+    for mes in range(meses):
+        fase = mes % periodo_sazonal
+        fator = estacao[:, fase]
+        if mes >= aquecimento:
+            erros[:, mes] = serie[:, mes] - (nivel + tendencia + fator)
+        novo_nivel = alfa * (serie[:, mes] - fator) + (1 - alfa) * (nivel + tendencia)
+        tendencia = beta * (novo_nivel - nivel) + (1 - beta) * tendencia
+        estacao[:, fase] = gama * (serie[:, mes] - novo_nivel) + (1 - gama) * fator
+        nivel = novo_nivel
+
+    passos = np.arange(1, horizonte + 1)
+    previsao = nivel[:, None] + passos * tendencia[:, None] + estacao[:, (meses + passos - 1) % periodo_sazonal]
+    return previsao, erros, sazonal
+
+
+def prever_series(historico, horizonte=HORIZONTE_PREVISAO, periodo_sazonal=PERIODO_SAZONAL):
+    """
+    Previsão de todas as séries de `historico` (DataFrame série x mês, colunas PeriodIndex
+    mensal). Retorna um dict com 'previsto', 'minimo' e 'maximo' (série x meses futuros)
+    e 'modelo' (nome do modelo de cada série), ou None com menos de 3 meses de histórico
+    """
+    serie = historico.to_numpy(dtype=np.float64)
+    quantidade, meses = serie.shape
+    if meses < 3 or quantidade == 0:
+        return None
+
+    # Todas as combinações da grade para todas as séries numa única passada
+    combinacoes = len(GRADE_HOLT_WINTERS)
+    parametros = np.repeat(GRADE_HOLT_WINTERS, quantidade, axis=0)
+    previsao, erros, sazonal = _holt_winters_lote(
+        np.tile(serie, (combinacoes, 1)), parametros[:, 0], parametros[:, 1], parametros[:, 2].copy(),
+        horizonte, periodo_sazonal
+    )
+    erro_quadratico = np.nanmean(erros ** 2, axis=1).reshape(combinacoes, quantidade)
+    melhor = np.argmin(erro_quadratico, axis=0)
+    escolhidas = melhor * quantidade + np.arange(quantidade)
+    previsao = previsao[escolhidas]
+    alfa, beta, gama = parametros[escolhidas].T
+    if not sazonal:
+        gama = np.zeros(quantidade)
+
+    # Variância do erro h passos à frente: sigma² * (1 + soma_j (alfa*(1 + j*beta) + gama*[j múltiplo do período])²)
+    passos = np.arange(1, horizonte)
+    contribuicoes = alfa[:, None] * (1 + passos * beta[:, None]) + gama[:, None] * (passos % periodo_sazonal == 0)
+    fator = np.sqrt(1 + np.concatenate([np.zeros((quantidade, 1)), np.cumsum(contribuicoes ** 2, axis=1)], axis=1))
+    margem = 1.96 * np.sqrt(erro_quadratico[melhor, np.arange(quantidade)])[:, None] * fator
+
+    futuros = pd.period_range(historico.columns[-1] + 1, periods=horizonte, freq=historico.columns.freq)
+
+    def quadro(valores):
+        return pd.DataFrame(np.clip(valores, 0, None), index=historico.index, columns=futuros)
+
+    return {
+        'previsto': quadro(previsao),
+        'minimo': quadro(previsao - margem),
+        'maximo': quadro(previsao + margem),
+        'modelo': pd.Series('Holt-Winters' if sazonal else 'Holt', index=historico.index),
+    }
+
+
+def _prever_cubo(cubo):
+    """
+    Histórico mensal e previsões do total e de cada categoria, técnico e local das células
+    do cubo, calculados juntos (uma matriz com todas as séries)
+    """
+    if len(cubo) == 0:
+        return None
+    mes = _mes_cubo(cubo).rename('Mês')
+    meses = pd.period_range(mes.min(), mes.max(), freq='M')
+
+    series = [_rollup(cubo, mes)['Chamados'].reindex(meses, fill_value=0).to_frame('Total').T]
+    series[0].index = pd.MultiIndex.from_tuples([('Total', 'Total')], names=['Dimensão', 'Série'])
+    for dimensao in DIMENSOES_PREVISAO:
+        if dimensao not in cubo.columns:
+            continue
+        matriz = _rollup(cubo, [cubo[dimensao], mes])['Chamados'].unstack('Mês', fill_value=0)
+        matriz = matriz.reindex(columns=meses, fill_value=0)
+        matriz.index = pd.MultiIndex.from_arrays(
+            [[dimensao] * len(matriz), matriz.index.astype(str)], names=['Dimensão', 'Série']
+        )
+        series.append(matriz)
+    historico = pd.concat(series)
+    historico.columns = meses
+
+    previsoes = prever_series(historico)
+    if previsoes is None:
+        return None
+    previsoes['historico'] = historico
+    return previsoes
+
+
+@st.cache_resource(max_entries=16)
+def _previsoes_dataset(hash_dataset, chave_filtros, _df):
+    """
+    Mantém as previsões por dataset e filtros de dimensão (chave = hash do conteúdo +
+    filtros canônicos de _chave_filtros). O período não entra: como o acumulado do
+    CuboBacklog, as séries cobrem o histórico inteiro e o período só recorta a exibição
+    """
+    filtros = {coluna: list(valores) for coluna, valores in chave_filtros}
+    return _prever_cubo(_cubo_olap(hash_dataset, _df).filtrar(None, filtros))
+
+
+def _agregado_previsoes(visao):
+    """
+    Previsões do dataset com os filtros de dimensão do recorte (ver _previsoes_dataset)
+    """
+    return _previsoes_dataset(visao.dataset.attrs.get('hash'), visao.chave[2], visao.dataset)
+
+
+# Dimensionamento da equipe por fila M/M/N (Erlang C) em cada faixa dia da semana x hora:
+# a taxa de chegada de cada faixa é a média observada no recorte e o tempo de atendimento
+# (trabalho do técnico por chamado) vem de GLPI_TEMPO_ATENDIMENTO_HORAS. O GLPI não exporta
+# esse tempo: sem a configuração, usa-se a mediana do tempo útil de resolução, que inclui
+# fila e pendências, e o resultado vale só como limite superior de técnicos. Para cada
+# número de técnicos N, todas as faixas são avaliadas juntas numa matriz N x faixa
+META_ESPERA_HORAS = float(os.getenv("GLPI_META_ESPERA_HORAS", "1"))
+META_ATENDIMENTO = float(os.getenv("GLPI_META_ATENDIMENTO", "0.8"))
+
+
+def _horas_positivas(variavel):
+    """
+    Valor em horas da variável de ambiente (None se vazia). Erro explícito na carga do
+    módulo para valores não numéricos ou não positivos, em vez de falhar dentro da aba
+    """
+    texto = os.getenv(variavel, "").strip()
+    if not texto:
+        return None
+    try:
+        horas = float(texto)
+    except ValueError:
+        raise ValueError(f"{variavel} inválido: {texto!r} (use horas com ponto decimal, ex.: 1.5)") from None
+    if not (horas > 0 and np.isfinite(horas)):
+        raise ValueError(f"{variavel} inválido: {texto!r} (precisa ser maior que zero)")
+    return horas
+
+
+TEMPO_ATENDIMENTO_HORAS = _horas_positivas("GLPI_TEMPO_ATENDIMENTO_HORAS")
+DIAS_SEMANA = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
+
+
+def _erlang_c(carga, maximo):
+    """
+    Probabilidade de espera (Erlang C) para 1..`maximo` técnicos (linhas) e cada carga
+    oferecida em erlangs (colunas), pela recursão de Erlang B, estável para N grande.
+    Onde N <= carga a fila não se estabiliza e a probabilidade é 1
+    """
+    bloqueio = np.ones_like(carga, dtype=np.float64)
+    espera = np.empty((maximo, len(carga)))
+    for tecnicos in range(1, maximo + 1):
+        bloqueio = carga * bloqueio / (tecnicos + carga * bloqueio)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            espera[tecnicos - 1] = np.where(
+                tecnicos > carga, tecnicos * bloqueio / (tecnicos - carga * (1 - bloqueio)), 1.0
+            )
+    return espera
+
+
+def simular_dimensionamento(chegadas, tempo_atendimento, maximo, meta_espera=META_ESPERA_HORAS):
+    """
+    Fila M/M/N para cada faixa horária (`chegadas` em chamados/hora) e N = 1..`maximo`.
+    Retorna um dict com 'curva' (por N: espera média, % atendido dentro de `meta_espera`
+    e utilização, ponderados pelas chegadas) e 'necessarios' (menor N por faixa que
+    atinge META_ATENDIMENTO)
+    """
+    chegadas = np.asarray(chegadas, dtype=np.float64)
+    carga = chegadas * tempo_atendimento
+    tecnicos = np.arange(1, maximo + 1)[:, None]
+    prob_espera = _erlang_c(carga, maximo)
+
+    # Espera ~ 0 com prob. 1 - C e ~ Exp(N/S - λ) com prob. C
+    folga = tecnicos / tempo_atendimento - chegadas
+    estavel = folga > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        espera_media = np.where(estavel, prob_espera / folga, np.inf)
+        na_meta = np.where(estavel, 1 - prob_espera * np.exp(-folga * meta_espera), 0.0)
+    utilizacao = np.minimum(carga / tecnicos, 1.0)
+
+    pesos = chegadas / chegadas.sum() if chegadas.sum() > 0 else np.full(len(chegadas), 1 / len(chegadas))
+    com_chegadas = pesos > 0
+    curva = pd.DataFrame({
+        'Espera Média (h)': np.where(
+            (~estavel[:, com_chegadas]).any(axis=1), np.inf,
+            (np.where(estavel, espera_media, 0) * pesos).sum(axis=1)
+        ),
+        'Atendidos na Meta (%)': (na_meta * pesos).sum(axis=1) * 100,
+        'Utilização (%)': (utilizacao * pesos).sum(axis=1) * 100,
+    }, index=pd.Index(tecnicos[:, 0], name='Técnicos'))
+
+    atinge = na_meta >= META_ATENDIMENTO
+    necessarios = np.where(atinge.any(axis=0), atinge.argmax(axis=0) + 1, np.nan)
+    return {'curva': curva, 'necessarios': necessarios}
+
+
+def _agregado_dimensionamento(visao):
+    """
+    Chegadas por faixa dia da semana x hora do recorte e a simulação de dimensionamento.
+    'tempo_configurado' indica se o tempo de atendimento veio de GLPI_TEMPO_ATENDIMENTO_HORAS
+    (senão é a mediana do tempo de resolução, um limite superior).
+    None sem datas de abertura ou sem tempo de atendimento conhecido
+    """
+    if 'Tempo Útil (h)' not in visao.colunas_dataset:
+        return None
+    linhas = visao.colunas(['Data Abertura Datetime', 'Status', 'Tempo Útil (h)'])
+    abertura = linhas['Data Abertura Datetime'].dropna()
+    if abertura.empty:
+        return None
+
+    if TEMPO_ATENDIMENTO_HORAS is not None:
+        tempo_atendimento = TEMPO_ATENDIMENTO_HORAS
+    else:
+        tempos = linhas.loc[linhas['Status'].isin(STATUS_RESOLVIDOS), 'Tempo Útil (h)']
+        tempo_atendimento = float(tempos[tempos > 0].median())
+    if not tempo_atendimento > 0:
+        return None
+
+    # Chamados por hora em cada faixa: total da faixa / quantas vezes o dia da semana ocorre no período
+    faixa = (abertura.dt.dayofweek * 24 + abertura.dt.hour).to_numpy()
+    dias = pd.date_range(abertura.min().normalize(), abertura.max().normalize(), freq='D')
+    ocorrencias = np.maximum(np.bincount(dias.dayofweek, minlength=7), 1)
+    chegadas = np.bincount(faixa, minlength=7 * 24) / np.repeat(ocorrencias, 24)
+
+    maximo = int(np.ceil(chegadas.max() * tempo_atendimento)) + 20
+    resultado = simular_dimensionamento(chegadas, tempo_atendimento, maximo)
+    resultado['tempo_atendimento'] = tempo_atendimento
+    resultado['tempo_configurado'] = TEMPO_ATENDIMENTO_HORAS is not None
+    resultado['necessarios'] = pd.DataFrame(
+        resultado['necessarios'].reshape(7, 24), index=DIAS_SEMANA, columns=range(24)
+    )
+    return resultado
+
+
+# ====================================================================
+# SEÇÕES DE ANÁLISE
+# Cada aba é uma unidade registrada em SECOES e só a selecionada é calculada.
+# As seções escrevem num gravador em vez de direto no `st`: o resultado
+# (lista de chamadas de UI, com as figuras já serializadas) fica no cache de
+# figuras, chaveado por (seção, filtros, dataset), e é reproduzido nas próximas
+# execuções sem refazer agregações nem figuras. Pode ser pré-calculado em segundo plano.
+# ====================================================================
+PRE_CALCULAR_SECOES = os.getenv("GLPI_PRE_CALCULAR_SECOES", "0") == "1"
+THREADS_PRE_CALCULO = int(os.getenv("GLPI_THREADS_PRE_CALCULO", "2"))
+FIGURAS_MAX_MB = float(os.getenv("GLPI_FIGURAS_MAX_MB", "64"))
+
+
+class FiguraGravada:
+    """
+    Figura guardada como o JSON do Plotly. Na reprodução vira um go.Figure de
+    verdade (pio.from_json); no relatório o spec é gravado direto, sem reconstruir
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+
+    def dicionario(self):
+        return json.loads(self.spec)
+
+    def figura(self):
+        # skip_invalid: o spec já veio de uma figura válida na gravação
+        return pio.from_json(self.spec, skip_invalid=True)
+
+
+class SecaoGravada:
+    """
+    Chamadas de UI de uma seção já calculada e o tamanho aproximado em bytes
+    """
+
+    def __init__(self, operacoes, tamanho):
+        self.operacoes = operacoes
+        self.tamanho = tamanho
+
+
+class _Gravador:
+    """
+    Substituto do `st` usado pelas seções: registra cada chamada de UI
+    (com os blocos de st.columns aninhados) para reprodução posterior.
+    Figuras são serializadas na gravação, e tabelas entram na conta de tamanho
+    """
+
+    def __init__(self):
+        self.operacoes = []
+        self.tamanho = 0
+        self.figuras = 0
+        self.segundos_serializacao = 0.0
+        self._pilha = [self.operacoes]
+
+    def _registrar(self, nome, args, kwargs, filhos=None):
+        self._pilha[-1].append((nome, args, kwargs, filhos))
+
+    def plotly_chart(self, figura, **kwargs):
+        inicio = time.perf_counter()
+        spec = pio.to_json(figura, validate=False)
+        self.segundos_serializacao += time.perf_counter() - inicio
+        self.figuras += 1
+        self.tamanho += len(spec)
+        self._registrar('plotly_chart', (FiguraGravada(spec),), kwargs)
+
+    def dataframe(self, dados, **kwargs):
+        if isinstance(dados, (pd.DataFrame, pd.Series)):
+            self.tamanho += int(dados.memory_usage(deep=True).sum())
+        self._registrar('dataframe', (dados,), kwargs)
+
+    def columns(self, spec, **kwargs):
+        quantidade = spec if isinstance(spec, int) else len(spec)
+        filhos = [[] for _ in range(quantidade)]
+        self._registrar('columns', (spec,), kwargs, filhos)
+        return [_BlocoGravado(self, operacoes) for operacoes in filhos]
+
+    def __getattr__(self, nome):
+        def registrar(*args, **kwargs):
+            self._registrar(nome, args, kwargs)
+        return registrar
+
+
+class _BlocoGravado:
+    """
+    Coluna do gravador: dentro do `with`, as chamadas vão para esta coluna
+    """
+
+    def __init__(self, gravador, operacoes):
+        self.gravador = gravador
+        self.operacoes = operacoes
+
+    def __enter__(self):
+        self.gravador._pilha.append(self.operacoes)
+        return self
+
+    def __exit__(self, *exc):
+        self.gravador._pilha.pop()
+        return False
+
+
+def _reproduzir(operacoes):
+    """
+    Renderiza no Streamlit as chamadas registradas por uma seção
+    """
+    for nome, args, kwargs, filhos in operacoes:
+        if nome == 'columns':
+            colunas = st.columns(*args, **kwargs)
+            for coluna, operacoes_coluna in zip(colunas, filhos):
+                with coluna:
+                    _reproduzir(operacoes_coluna)
+        elif nome == 'plotly_chart':
+            st.plotly_chart(args[0].figura(), **kwargs)
+        else:
+            getattr(st, nome)(*args, **kwargs)
+
+
+# ====================================================================
+# ABA 1: INDICADORES DE PERFORMANCE (KPIs)
+# ====================================================================
+def _secao_kpis(visao, ui):
+    cubo = visao.cubo
+    tecnicos = visao.agregado('tecnicos', _agregado_tecnicos)
+
+    ui.header("📊 Indicadores de Performance (KPIs)")
+    
+    # KPIs principais
+    col_kpi1, col_kpi2, col_kpi3 = ui.columns(3)
+    
+    with col_kpi1:
+        ui.subheader("✅ Taxa de Resolução")
+        status_counts = _contar_cubo(cubo, 'Status')
+        total = cubo['Chamados'].sum()
+        
+        # Calcular percentuais
+        fechados = status_counts.get('Fechado', 0) / total * 100 if total > 0 else 0
+        solucionados = status_counts.get('Solucionado', 0) / total * 100 if total > 0 else 0
+        pendentes = status_counts.get('Pendente', 0) / total * 100 if total > 0 else 0
+        
+        # Gráfico de pizza - Status
+        fig_status = px.pie(
+            values=[status_counts.get('Fechado', 0), status_counts.get('Solucionado', 0), status_counts.get('Pendente', 0)],
+            names=['Fechado', 'Solucionado', 'Pendente'],
+                     title="Distribuição por Status",
+            color_discrete_sequence=['#28a745', '#17a2b8', '#ffc107'],
+            hole=0.4
+        )
+        fig_status.update_traces(textposition='inside', textinfo='percent+label')
+        ui.plotly_chart(fig_status, use_container_width=True)
+        
+        c1, c2, c3 = ui.columns(3)
+        with c1:
+            ui.metric("Fechados", f"{fechados:.1f}%", delta=f"{status_counts.get('Fechado', 0)} chamados")
+        with c2:
+            ui.metric("Solucionados", f"{solucionados:.1f}%", delta=f"{status_counts.get('Solucionado', 0)} chamados")
+        with c3:
+            ui.metric("Pendentes", f"{pendentes:.1f}%", delta=f"{status_counts.get('Pendente', 0)} chamados")
+    
+    with col_kpi2:
+        ui.subheader("⏱️ Tempo Médio de Resolução")
+        # Mediana e máximo não são aditivos: só esta coluna do recorte é materializada
+        tempo_stats = visao.colunas(['Tempo Resolução (h)'])['Tempo Resolução (h)'].describe()
+        
+        fig_tempo = go.Figure(go.Indicator(
+            mode = "gauge+number+delta",
+            value = tempo_stats['mean'] if not pd.isna(tempo_stats['mean']) else 0,
+            domain = {'x': [0, 1], 'y': [0, 1]},
+            title = {'text': "Tempo Médio (horas)"},
+            delta = {'reference': 24},
+            gauge = {
+                'axis': {'range': [None, 72]},
+                'bar': {'color': "#007bff"},
+                'steps' : [
+                    {'range': [0, 8], 'color': "#d4edda"},
+                    {'range': [8, 24], 'color': "#fff3cd"},
+                    {'range': [24, 72], 'color': "#f8d7da"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': 24
+                }
+            }
+        ))
+        ui.plotly_chart(fig_tempo, use_container_width=True)
+        
+        c1, c2, c3 = ui.columns(3)
+        with c1:
+            ui.metric("Média", f"{tempo_stats['mean']:.1f}h" if not pd.isna(tempo_stats['mean']) else "N/A")
+        with c2:
+            ui.metric("Mediana", f"{tempo_stats['50%']:.1f}h" if not pd.isna(tempo_stats['50%']) else "N/A")
+        with c3:
+            ui.metric("Máximo", f"{tempo_stats['max']:.1f}h" if not pd.isna(tempo_stats['max']) else "N/A")
+    
+    with col_kpi3:
+        ui.subheader("📈 SLA Compliance")
+        
+        # SLA pelo prazo de cada chamado, em horas úteis
+        resolvidos = cubo[cubo['Status'].isin(STATUS_RESOLVIDOS)]
+        total_resolvidos = resolvidos['Chamados'].sum()
+        dentro_sla_count = resolvidos['Até SLA'].sum()
+        fora_sla_count = total_resolvidos - dentro_sla_count
+        
+        sla_percent = (dentro_sla_count / total_resolvidos * 100) if total_resolvidos > 0 else 0
+        
+        # Gráfico de SLA
+        fig_sla = go.Figure(data=[
+            go.Bar(name='Dentro do SLA', x=['SLA'], y=[dentro_sla_count], marker_color='#28a745'),
+            go.Bar(name='Fora do SLA', x=['SLA'], y=[fora_sla_count], marker_color='#dc3545')
+        ])
+        fig_sla.update_layout(
+            title=f"Cumprimento do SLA (prazo do GLPI ou {SLA_HORAS}h úteis, expediente {EXPEDIENTE_SLA})",
+            barmode='stack',
+            showlegend=True
+        )
+        ui.plotly_chart(fig_sla, use_container_width=True)
+        
+        c1, c2 = ui.columns(2)
+        with c1:
+            ui.metric("✅ Dentro do SLA", f"{sla_percent:.1f}%", delta=f"{dentro_sla_count} chamados")
+        with c2:
+            ui.metric("❌ Fora do SLA", f"{100-sla_percent:.1f}%", delta=f"{fora_sla_count} chamados", delta_color="inverse")
+    
+    ui.markdown("---")
+    
+    # Produtividade por técnico
+    ui.subheader("🚀 Produtividade por Técnico")
+    col_prod1, col_prod2 = ui.columns(2)
+    
+    with col_prod1:
+        # Chamados por técnico
+        df_tecnicos = tecnicos.sort_values('Total Chamados', ascending=False).head(10)
+        
+        fig_tec = px.bar(
+            df_tecnicos, 
+            x='Total Chamados', 
+            y='Técnico',
+            title="Top 10 Técnicos - Volume de Chamados",
+            orientation='h',
+            color='Total Chamados',
+            color_continuous_scale='Blues',
+            text='Total Chamados'
+        )
+        fig_tec.update_traces(textposition='outside')
+        ui.plotly_chart(fig_tec, use_container_width=True)
+    
+    with col_prod2:
+        # Eficiência (Chamados/hora)
+        df_tecnicos_ef = df_tecnicos.sort_values('Eficiência', ascending=False).head(10)
+        
+        fig_ef = px.bar(
+            df_tecnicos_ef,
+            x='Eficiência',
+            y='Técnico',
+            title="Top 10 Técnicos - Eficiência (Chamados/Hora)",
+            orientation='h',
+                     color='Eficiência',
+            color_continuous_scale='Greens',
+            text='Eficiência'
+        )
+        fig_ef.update_traces(textposition='outside', texttemplate='%{text:.2f}')
+        ui.plotly_chart(fig_ef, use_container_width=True)
+
+
+# ====================================================================
+# ABA 2: ANÁLISE TEMPORAL
+# ====================================================================
+def _secao_temporal(visao, ui):
+    cubo = visao.cubo
+
+    ui.header("⏰ Análise Temporal dos Chamados")
+    
+    # Volume por período
+    ui.subheader("📅 Volume por Período")
+    col_temp1, col_temp2 = ui.columns(2)
+    
+    with col_temp1:
+        # Chamados por mês
+        df_mensal = _rollup(cubo, _mes_cubo(cubo))['Chamados'].rename('ID').reset_index()
+        df_mensal['Mês'] = df_mensal['Dia'].astype(str)
+        
+        fig_mes = px.bar(
+            df_mensal, 
+            x='Mês', 
+            y='ID',
+            title="📊 Volume de Chamados por Mês",
+            labels={'ID': 'Número de Chamados', 'Mês': 'Período'},
+                     color='ID',
+
+            color_continuous_scale='Blues',
+            text='ID'
+        )
+        fig_mes.update_traces(textposition='outside')
+        fig_mes.update_layout(xaxis_tickangle=-45)
+        ui.plotly_chart(fig_mes, use_container_width=True)
+    
+    with col_temp2:
+        # Tendência mensal
+        df_mensal['Crescimento'] = df_mensal['ID'].pct_change() * 100
+        
+        fig_trend = px.line(
+            df_mensal,
+            x='Mês',
+            y='ID',
+            title="📈 Tendência de Chamados (Crescimento/Queda)",
+            labels={'ID': 'Total de Chamados'},
+            markers=True
+        )
+        fig_trend.update_traces(line_color='#17a2b8', line_width=3)
+        fig_trend.update_layout(xaxis_tickangle=-45)
+        ui.plotly_chart(fig_trend, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Horário de pico
+    ui.subheader("⏰ Horário de Pico")
+    col_temp3, col_temp4 = ui.columns(2)
+    
+    with col_temp3:
+        # Chamados por hora do dia
+        if 'Hora Abertura' in visao.colunas_dataset:
+            df_hora = visao.colunas(['Hora Abertura', 'ID'])
+            df_hora['Hora'] = df_hora['Hora Abertura'].str[:2]  # Pega apenas a hora (primeiros 2 caracteres)
+            df_hora = df_hora.groupby('Hora')['ID'].count().reset_index().sort_values('Hora')
+            
+            fig_hora = px.bar(
+                df_hora,
+                x='Hora',
+                y='ID',
+                title="📊 Distribuição de Chamados por Hora do Dia",
+                labels={'ID': 'Número de Chamados', 'Hora': 'Hora do Dia'},
+                color='ID',
+                color_continuous_scale='Oranges',
+                text='ID'
+            )
+            fig_hora.update_traces(textposition='outside')
+            ui.plotly_chart(fig_hora, use_container_width=True)
+    
+    with col_temp4:
+        # Chamados por dia da semana
+        dias_pt = {'Monday': 'Segunda', 'Tuesday': 'Terça', 'Wednesday': 'Quarta', 
+                  'Thursday': 'Quinta', 'Friday': 'Sexta', 'Saturday': 'Sábado', 'Sunday': 'Domingo'}
+        dia_semana_pt = cubo['Dia'].dt.day_name().map(dias_pt).rename('Dia Semana PT')
+        
+        df_dia_semana = _rollup(cubo, dia_semana_pt)['Chamados'].rename('ID').reset_index()
+        ordem_dias = ['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo']
+        df_dia_semana['Dia Semana PT'] = pd.Categorical(df_dia_semana['Dia Semana PT'], categories=ordem_dias, ordered=True)
+        df_dia_semana = df_dia_semana.sort_values('Dia Semana PT')
+        
+        fig_dia = px.bar(
+            df_dia_semana,
+            x='Dia Semana PT',
+            y='ID',
+            title="📊 Distribuição por Dia da Semana",
+            labels={'ID': 'Número de Chamados', 'Dia Semana PT': 'Dia'},
+            color='ID',
+            color_continuous_scale='Reds',
+            text='ID'
+        )
+        fig_dia.update_traces(textposition='outside')
+        ui.plotly_chart(fig_dia, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Velocidade de atendimento
+    ui.subheader("⚡ Velocidade de Atendimento")
+    col_temp5, col_temp6 = ui.columns(2)
+    
+    # Distribuições precisam dos tempos individuais
+    df_tempos = visao.colunas(['Status', 'Tempo Resolução (h)'])
+    
+    with col_temp5:
+        # Distribuição do tempo de resolução
+        fig_dist = px.histogram(
+            df_tempos[df_tempos['Tempo Resolução (h)'] < 100],  # Filtrar outliers
+            x='Tempo Resolução (h)',
+            nbins=30,
+            title="📊 Distribuição do Tempo de Resolução",
+            labels={'Tempo Resolução (h)': 'Tempo (horas)'},
+            color_discrete_sequence=['#6610f2']
+        )
+        fig_dist.add_vline(x=SLA_HORAS, line_dash="dash", line_color="red", annotation_text=f"SLA ({SLA_HORAS}h)")
+        ui.plotly_chart(fig_dist, use_container_width=True)
+    
+    with col_temp6:
+        # Box plot por status
+        fig_box = px.box(
+            df_tempos[df_tempos['Tempo Resolução (h)'] < 100],
+            x='Status',
+            y='Tempo Resolução (h)',
+            title="📦 Tempo de Resolução por Status",
+            color='Status',
+            color_discrete_sequence=['#28a745', '#17a2b8', '#ffc107']
+        )
+        ui.plotly_chart(fig_box, use_container_width=True)
+
+
+# ====================================================================
+# ABA 3: ANÁLISE POR CATEGORIA
+# ====================================================================
+def _secao_categoria(visao, ui):
+    cubo = visao.cubo
+
+    ui.header("🏷️ Análise por Categoria")
+    
+    # Top problemas
+    ui.subheader("🏆 Top Problemas Mais Frequentes")
+    col_cat1, col_cat2 = ui.columns(2)
+    
+    with col_cat1:
+        # Top 10 categorias
+            top_categorias = _contar_cubo(cubo, 'Categoria Limpa').head(10).reset_index()
+            top_categorias.columns = ['Categoria', 'Quantidade']
+            
+
+    fig_top_cat = px.bar(
+        top_categorias,
+        x='Quantidade',
+        y='Categoria',
+        title="📊 Top 10 Categorias Mais Frequentes",
+                         orientation='h',
+                         color='Quantidade',
+
+        color_continuous_scale='Greens',
+        text='Quantidade'
+    )
+    fig_top_cat.update_traces(textposition='outside')
+    ui.plotly_chart(fig_top_cat, use_container_width=True)
+    
+    with col_cat2:
+        # Gráfico de pizza
+            cat_counts = _contar_cubo(cubo, 'Categoria Limpa')
+
+    if len(cat_counts) > 7:
+                top_cats = cat_counts.head(7)
+                outros = cat_counts.iloc[7:].sum()
+                cat_counts = pd.concat([top_cats, pd.Series([outros], index=['Outros'])])
+            
+
+    cat_df = cat_counts.reset_index()
+    cat_df.columns = ['Categoria', 'Quantidade']
+    
+    fig_cat_pie = px.pie(
+        cat_df,
+        values='Quantidade',
+        names='Categoria',
+        title="🥧 Distribuição Percentual por Categoria",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_cat_pie.update_traces(textposition='inside', textinfo='percent+label')
+    ui.plotly_chart(fig_cat_pie, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Categorias críticas (maior tempo de resolução)
+    ui.subheader("📉 Categorias Críticas (Maior Tempo de Resolução)")
+    col_cat3, col_cat4 = ui.columns(2)
+    
+    with col_cat3:
+        # Categorias com maior tempo médio
+        por_categoria = _rollup(cubo, 'Categoria Limpa')
+        df_cat_tempo = _tempo_medio(por_categoria['Soma Horas'], por_categoria['Horas Válidas']).rename('Tempo Resolução (h)').reset_index()
+        df_cat_tempo = df_cat_tempo.sort_values('Tempo Resolução (h)', ascending=False).head(10)
+        df_cat_tempo.columns = ['Categoria', 'Tempo Médio (h)']
+        
+        fig_cat_tempo = px.bar(
+            df_cat_tempo,
+            x='Tempo Médio (h)',
+            y='Categoria',
+            title="⏱️ Categorias com Maior Tempo Médio de Resolução",
+            orientation='h',
+            color='Tempo Médio (h)',
+            color_continuous_scale='Reds',
+            text='Tempo Médio (h)'
+        )
+        fig_cat_tempo.update_traces(textposition='outside', texttemplate='%{text:.1f}h')
+        ui.plotly_chart(fig_cat_tempo, use_container_width=True)
+    
+    with col_cat4:
+        # Recorrência - problemas repetitivos (usuários distintos não são aditivos: vêm das linhas)
+        df_cat_req = visao.colunas(['ID', 'Categoria Limpa', 'Requerente - Requerente'])
+        df_cat_count = df_cat_req.groupby('Categoria Limpa', observed=True).agg({
+            'ID': 'count',
+
+            'Requerente - Requerente': 'nunique'
         }).reset_index()
-        df_sla_rank['SLA (%)'] = (df_sla_rank['Dentro SLA'] / df_sla_rank['ID']) * 100
-        df_sla_rank = df_sla_rank[df_sla_rank['ID'] >= 10]  # Mínimo 10 chamados
-        df_sla_rank = df_sla_rank.sort_values('SLA (%)', ascending=False).head(15)
-        df_sla_rank.columns = ['Técnico', 'Total Chamados', 'Dentro SLA', 'SLA (%)']
+
+        df_cat_count.columns = ['Categoria', 'Total Chamados', 'Usuários Únicos']
+        df_cat_count['Recorrência'] = df_cat_count['Total Chamados'] / df_cat_count['Usuários Únicos']
+        df_cat_count = df_cat_count.sort_values('Recorrência', ascending=False).head(10)
+        
+        fig_recor = px.scatter(
+            df_cat_count,
+            x='Usuários Únicos',
+            y='Total Chamados',
+            size='Recorrência',
+            color='Recorrência',
+            hover_data=['Categoria'],
+            title="🔄 Recorrência de Problemas (Tamanho = Recorrência)",
+            labels={'Usuários Únicos': 'Usuários Diferentes', 'Total Chamados': 'Total de Chamados'},
+            color_continuous_scale='Viridis',
+            text='Categoria'
+        )
+        ui.plotly_chart(fig_recor, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Padrões sazonais
+    ui.subheader("💡 Padrões Sazonais - Categoria x Período")
+    
+    # Heatmap: Categoria x Mês
+    df_heatmap = cubo.copy(deep=False)
+    df_heatmap['Mês'] = _mes_cubo(cubo).astype(str)
+    
+    # Selecionar top 10 categorias para o heatmap
+    top_10_cat = _contar_cubo(cubo, 'Categoria Limpa').head(10).index.tolist()
+    df_heatmap_filtered = df_heatmap[df_heatmap['Categoria Limpa'].isin(top_10_cat)]
+    
+    heatmap_data = df_heatmap_filtered.pivot_table(
+        index='Categoria Limpa',
+        columns='Mês',
+        values='Chamados',
+        aggfunc='sum',
+        fill_value=0,
+        observed=True
+    )
+    
+    fig_heatmap = px.imshow(
+        heatmap_data,
+        title="🗓️ Mapa de Calor: Categorias x Meses",
+        labels=dict(x="Mês", y="Categoria", color="Chamados"),
+        color_continuous_scale='YlOrRd',
+        aspect="auto"
+    )
+    ui.plotly_chart(fig_heatmap, use_container_width=True)
+    
+    # Tabela de detalhes por categoria
+    ui.subheader("📋 Detalhes por Categoria")
+    df_categoria_detalhe = pd.DataFrame({
+        'ID': por_categoria['Chamados'],
+        'Tempo Resolução (h)': _tempo_medio(por_categoria['Soma Horas'], por_categoria['Horas Válidas']),
+        'Requerente - Requerente': df_cat_req.groupby('Categoria Limpa', observed=True)['Requerente - Requerente'].nunique(),
+    })
+    moda_local = _moda_por_grupo(cubo, 'Categoria Limpa', 'Localização', pesos='Chamados')['moda']
+    df_categoria_detalhe['Localização'] = moda_local.reindex(df_categoria_detalhe.index).astype(object).fillna('N/A')
+    df_categoria_detalhe = df_categoria_detalhe.reset_index()
+    df_categoria_detalhe.columns = ['Categoria', 'Total', 'Tempo Médio (h)', 'Usuários Únicos', 'Localização Mais Comum']
+    df_categoria_detalhe = df_categoria_detalhe.sort_values('Total', ascending=False)
+    
+    ui.dataframe(df_categoria_detalhe, height=400, use_container_width=True)
+
+
+# ====================================================================
+# ABA 4: ANÁLISE DE TÉCNICOS
+# ====================================================================
+def _secao_tecnicos(visao, ui):
+    tecnicos = visao.agregado('tecnicos', _agregado_tecnicos)
+
+    ui.header("👨‍💻 Análise Completa de Técnicos")
+    
+    # Produtividade individual
+    ui.subheader("📊 Produtividade Individual")
+    
+    df_tec_prod = tecnicos.sort_values('Total Chamados', ascending=False)
+    
+    col_tec1, col_tec2 = ui.columns(2)
+    
+    with col_tec1:
+        # Chamados por técnico
+        fig_tec_prod = px.bar(
+            df_tec_prod.head(15),
+            x='Total Chamados',
+            y='Técnico',
+            title="📊 Chamados por Técnico (Top 15)",
+            orientation='h',
+            color='Total Chamados',
+            color_continuous_scale='Blues',
+            text='Total Chamados'
+        )
+        fig_tec_prod.update_traces(textposition='outside')
+        ui.plotly_chart(fig_tec_prod, use_container_width=True)
+    
+    with col_tec2:
+        # Distribuição de carga (balanceamento)
+        media_chamados = df_tec_prod['Total Chamados'].mean()
+        df_tec_prod['Desvio da Média'] = df_tec_prod['Total Chamados'] - media_chamados
         
-        fig_sla_rank = px.bar(
-            df_sla_rank,
-            x='SLA (%)',
+        fig_balance = px.bar(
+            df_tec_prod.head(15),
+            x='Desvio da Média',
             y='Técnico',
-            title="🏆 Ranking de Cumprimento de SLA por Técnico (mín. 10 chamados)",
+            title="⚖️ Balanceamento de Carga (Desvio da Média)",
+            orientation='h',
+            color='Desvio da Média',
+            color_continuous_scale='RdYlGn_r',
+            text='Desvio da Média'
+        )
+        fig_balance.update_traces(textposition='outside', texttemplate='%{text:.0f}')
+        fig_balance.add_vline(x=0, line_dash="dash", line_color="black", annotation_text="Média")
+        ui.plotly_chart(fig_balance, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Especialização e Eficiência
+    col_tec3, col_tec4 = ui.columns(2)
+    
+    with col_tec3:
+        ui.subheader("🎯 Especialização por Técnico")
+        # Categoria dominante por técnico
+        df_espec = tecnicos.dropna(subset=['Especialização'])[['Técnico', 'Especialização', 'Chamados Especialização']]
+        df_espec.columns = ['Técnico', 'Especialização', 'Chamados']
+        df_espec = df_espec.sort_values('Chamados', ascending=False).head(10)
+        # O sunburst agrupa o caminho internamente: texto evita o produto cartesiano das categorias
+        df_espec[['Técnico', 'Especialização']] = df_espec[['Técnico', 'Especialização']].astype(str)
+        
+        fig_espec = px.sunburst(
+            df_espec,
+            path=['Técnico', 'Especialização'],
+            values='Chamados',
+            title="🎯 Especialização: Técnico x Categoria Dominante",
+            color='Chamados',
+            color_continuous_scale='Viridis'
+        )
+        ui.plotly_chart(fig_espec, use_container_width=True)
+    
+    with col_tec4:
+        ui.subheader("⏱️ Eficiência (Chamados/Hora)")
+        df_ef_top = df_tec_prod.sort_values('Eficiência', ascending=False).head(10)
+        
+        fig_ef_tec = px.bar(
+            df_ef_top,
+            x='Eficiência',
+            y='Técnico',
+            title="🚀 Top 10 Técnicos Mais Eficientes",
+            orientation='h',
+                     color='Eficiência',
+
+            color_continuous_scale='Greens',
+            text='Eficiência'
+        )
+        fig_ef_tec.update_traces(textposition='outside', texttemplate='%{text:.2f}')
+        ui.plotly_chart(fig_ef_tec, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Ranking com melhor SLA
+    ui.subheader("🏆 Ranking de Técnicos - Melhor SLA")
+    
+    df_sla_rank = tecnicos[tecnicos['Resolvidos'] >= 10]  # Mínimo 10 chamados resolvidos
+    df_sla_rank = df_sla_rank.sort_values('SLA (%)', ascending=False).head(15)
+    df_sla_rank = df_sla_rank[['Técnico', 'Resolvidos', 'Dentro SLA', 'SLA (%)']]
+    df_sla_rank.columns = ['Técnico', 'Total Chamados', 'Dentro SLA', 'SLA (%)']
+    
+    fig_sla_rank = px.bar(
+        df_sla_rank,
+        x='SLA (%)',
+        y='Técnico',
+        title="🏆 Ranking de Cumprimento de SLA por Técnico (mín. 10 chamados)",
+        orientation='h',
+        color='SLA (%)',
+        color_continuous_scale='RdYlGn',
+        text='SLA (%)'
+    )
+    fig_sla_rank.update_traces(textposition='outside', texttemplate='%{text:.1f}%')
+    fig_sla_rank.add_vline(x=80, line_dash="dash", line_color="orange", annotation_text="Meta 80%")
+    ui.plotly_chart(fig_sla_rank, use_container_width=True)
+    
+    # Tabela detalhada de técnicos
+    ui.dataframe(df_sla_rank, height=300, use_container_width=True)
+
+
+# ====================================================================
+# ABA 5: ANÁLISE DE REQUERENTES
+# ====================================================================
+def _secao_requerentes(visao, ui):
+    # Requerentes não são dimensão do cubo: esta aba usa as colunas do recorte
+    df_filtered = visao.colunas(['ID', 'Requerente - Requerente', 'Categoria Limpa', 'Localização'])
+
+    ui.header("👥 Análise de Requerentes e Solicitantes")
+    
+    # Top solicitantes
+    ui.subheader("🏆 Top Usuários que Mais Abrem Chamados")
+    col_req1, col_req2 = ui.columns(2)
+    
+    with col_req1:
+        top_requerentes = _contar_valores(df_filtered['Requerente - Requerente']).head(20).reset_index()
+        top_requerentes.columns = ['Requerente', 'Total Chamados']
+        
+        fig_req = px.bar(
+            top_requerentes,
+            x='Total Chamados',
+            y='Requerente',
+            title="👥 Top 20 Solicitantes",
+            orientation='h',
+            color='Total Chamados',
+            color_continuous_scale='Purples',
+            text='Total Chamados'
+        )
+        fig_req.update_traces(textposition='outside')
+        ui.plotly_chart(fig_req, use_container_width=True)
+    
+    with col_req2:
+        # Recorrência por usuário
+        df_recor_user = df_filtered.groupby('Requerente - Requerente', observed=True).agg({
+            'ID': 'count'
+        })
+        moda_categoria = _moda_por_grupo(df_filtered, 'Requerente - Requerente', 'Categoria Limpa')['moda']
+        df_recor_user['Categoria Limpa'] = moda_categoria.reindex(df_recor_user.index).astype(object).fillna('Variado')
+        df_recor_user = df_recor_user.reset_index()
+        df_recor_user.columns = ['Requerente', 'Total', 'Problema Mais Comum']
+        df_recor_user = df_recor_user[df_recor_user['Total'] >= 5].sort_values('Total', ascending=False).head(15)
+        
+        fig_recor_user = px.scatter(
+            df_recor_user,
+            x='Requerente',
+            y='Total',
+            size='Total',
+            color='Problema Mais Comum',
+            title="🔁 Recorrência: Usuários com Mais de 5 Chamados",
+            labels={'Total': 'Número de Chamados'}
+        )
+        fig_recor_user.update_layout(xaxis_tickangle=-45)
+        ui.plotly_chart(fig_recor_user, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Setores problemáticos
+    ui.subheader("📍 Setores/Localizações com Mais Chamados")
+    col_req3, col_req4 = ui.columns(2)
+    
+    with col_req3:
+        top_locais = _contar_cubo(visao.cubo, 'Localização').head(15).reset_index()
+        top_locais.columns = ['Localização', 'Total Chamados']
+        
+        fig_local = px.bar(
+            top_locais,
+            x='Total Chamados',
+            y='Localização',
+            title="🏥 Top 15 Localizações Mais Problemáticas",
+            orientation='h',
+            color='Total Chamados',
+            color_continuous_scale='Reds',
+            text='Total Chamados'
+        )
+        fig_local.update_traces(textposition='outside')
+        ui.plotly_chart(fig_local, use_container_width=True)
+    
+    with col_req4:
+        # Relação Requerente x Localização
+        df_req_local = df_filtered.groupby(['Localização', 'Requerente - Requerente'], observed=True)['ID'].count().reset_index()
+        df_req_local = df_req_local.sort_values('ID', ascending=False).head(30)
+        # O treemap agrupa o caminho internamente: texto evita o produto cartesiano das categorias
+        df_req_local[['Localização', 'Requerente - Requerente']] = df_req_local[['Localização', 'Requerente - Requerente']].astype(str)
+        
+        fig_treemap = px.treemap(
+            df_req_local,
+            path=['Localização', 'Requerente - Requerente'],
+            values='ID',
+            title="🗺️ TreeMap: Localização x Requerentes",
+            color='ID',
+            color_continuous_scale='YlOrRd'
+        )
+        ui.plotly_chart(fig_treemap, use_container_width=True)
+
+
+# ====================================================================
+# ABA 6: ANÁLISE DE LOCALIZAÇÃO
+# ====================================================================
+def _secao_localizacao(visao, ui):
+    cubo = visao.cubo
+
+    ui.header("🏥 Análise Geográfica por Localização")
+    
+    # Setores críticos
+    ui.subheader("🔴 Setores Críticos")
+    
+    por_local = _rollup(cubo, 'Localização')
+    df_local_analise = pd.DataFrame({
+        'ID': por_local['Chamados'],
+        'Tempo Resolução (h)': _tempo_medio(por_local['Soma Horas'], por_local['Horas Válidas'])
+    })
+    moda_categoria = _moda_por_grupo(cubo, 'Localização', 'Categoria Limpa', pesos='Chamados')['moda']
+    df_local_analise['Categoria Limpa'] = moda_categoria.reindex(df_local_analise.index).astype(object).fillna('Variado')
+    df_local_analise = df_local_analise.reset_index()
+    df_local_analise.columns = ['Localização', 'Total Chamados', 'Tempo Médio (h)', 'Problema Principal']
+    df_local_analise = df_local_analise.sort_values('Total Chamados', ascending=False)
+    
+    col_loc1, col_loc2 = ui.columns(2)
+    
+    with col_loc1:
+        # Top setores
+        fig_setor = px.bar(
+            df_local_analise.head(20),
+            x='Total Chamados',
+            y='Localização',
+            title="🏥 Top 20 Setores com Mais Chamados",
             orientation='h',
-            color='SLA (%)',
-            color_continuous_scale='RdYlGn',
-            text='SLA (%)'
+            color='Total Chamados',
+            color_continuous_scale='Reds',
+            text='Total Chamados'
+        )
+        fig_setor.update_traces(textposition='outside')
+        ui.plotly_chart(fig_setor, use_container_width=True)
+    
+    with col_loc2:
+        # Mapa de calor: Localização x Categoria
+        top_15_locais = df_local_analise.head(15)['Localização'].tolist()
+        top_10_cat = _contar_cubo(cubo, 'Categoria Limpa').head(10).index.tolist()
+        
+        df_heat_local = cubo[
+            (cubo['Localização'].isin(top_15_locais)) & 
+            (cubo['Categoria Limpa'].isin(top_10_cat))
+        ]
+        
+        heat_local_cat = df_heat_local.pivot_table(
+            index='Localização',
+            columns='Categoria Limpa',
+            values='Chamados',
+            aggfunc='sum',
+            fill_value=0,
+            observed=True
+        )
+        
+        fig_heat_loc = px.imshow(
+            heat_local_cat,
+            title="🗺️ Mapa de Calor: Localização x Categoria",
+            labels=dict(x="Categoria", y="Localização", color="Chamados"),
+            color_continuous_scale='YlOrRd',
+            aspect="auto"
+        )
+        ui.plotly_chart(fig_heat_loc, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Áreas de risco
+    ui.subheader("🔴 Áreas de Risco (Mais Incidentes)")
+    
+    # Scatter: Total x Tempo Médio
+    fig_risco = px.scatter(
+        df_local_analise.head(30),
+        x='Total Chamados',
+        y='Tempo Médio (h)',
+        size='Total Chamados',
+        color='Tempo Médio (h)',
+        hover_data=['Localização', 'Problema Principal'],
+        title="🎯 Áreas de Risco: Volume x Tempo de Resolução",
+        labels={'Total Chamados': 'Volume de Chamados', 'Tempo Médio (h)': 'Tempo Médio (horas)'},
+        color_continuous_scale='Reds',
+        text='Localização'
+    )
+    ui.plotly_chart(fig_risco, use_container_width=True)
+
+    # Tabela detalhada
+
+    ui.dataframe(df_local_analise.head(30), height=400, use_container_width=True)
+
+
+# ====================================================================
+# ABA 7: ANÁLISE DE PRIORIDADE
+# ====================================================================
+def _secao_prioridade(visao, ui):
+    cubo = visao.cubo
+
+    ui.header("⚡ Análise por Prioridade")
+    
+    # Distribuição de prioridades
+    ui.subheader("📊 Distribuição de Prioridades")
+    col_prior1, col_prior2 = ui.columns(2)
+    
+    with col_prior1:
+        prior_counts = _contar_cubo(cubo, 'Prioridade').reset_index()
+        prior_counts.columns = ['Prioridade', 'Quantidade']
+        
+        fig_prior = px.pie(
+            prior_counts,
+            values='Quantidade',
+            names='Prioridade',
+            title="🥧 Distribuição por Prioridade",
+            color_discrete_sequence=px.colors.qualitative.Set2,
+            hole=0.4
+        )
+        fig_prior.update_traces(textposition='inside', textinfo='percent+label')
+        ui.plotly_chart(fig_prior, use_container_width=True)
+    
+    with col_prior2:
+        # Tempo de resposta por prioridade
+        por_prioridade = _rollup(cubo, 'Prioridade')
+        df_prior_tempo = _tempo_medio(por_prioridade['Soma Horas'], por_prioridade['Horas Válidas']).reset_index()
+        df_prior_tempo.columns = ['Prioridade', 'Tempo Médio (h)']
+        
+        fig_prior_tempo = px.bar(
+            df_prior_tempo,
+            x='Prioridade',
+            y='Tempo Médio (h)',
+            title="⏰ Tempo Médio de Resposta por Prioridade",
+            color='Tempo Médio (h)',
+            color_continuous_scale='Oranges',
+            text='Tempo Médio (h)'
         )
-        fig_sla_rank.update_traces(textposition='outside', texttemplate='%{text:.1f}%')
-        fig_sla_rank.add_vline(x=80, line_dash="dash", line_color="orange", annotation_text="Meta 80%")
-        st.plotly_chart(fig_sla_rank, use_container_width=True)
+        fig_prior_tempo.update_traces(textposition='outside', texttemplate='%{text:.1f}h')
+        ui.plotly_chart(fig_prior_tempo, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Violações de SLA por prioridade
+    ui.subheader("❌ Violações de SLA por Prioridade")
+    
+    df_viol = cubo[cubo['Status'].isin(STATUS_RESOLVIDOS)]
+    
+    df_viol_prior = _rollup(df_viol, 'Prioridade')[['Chamados', 'Fora SLA']].reset_index()
+    df_viol_prior['% Violação'] = (df_viol_prior['Fora SLA'] / df_viol_prior['Chamados']) * 100
+    df_viol_prior.columns = ['Prioridade', 'Total', 'Violações', '% Violação']
+    
+    fig_viol = px.bar(
+        df_viol_prior,
+        x='Prioridade',
+        y=['Total', 'Violações'],
+        title="📊 Violações de SLA por Prioridade",
+        barmode='group',
+        color_discrete_sequence=['#28a745', '#dc3545']
+    )
+    ui.plotly_chart(fig_viol, use_container_width=True)
+    
+    ui.dataframe(df_viol_prior, use_container_width=True)
+
+
+# ====================================================================
+# ABA 8: ANÁLISE DE STATUS
+# ====================================================================
+def _secao_status(visao, ui):
+    cubo = visao.cubo
+
+    ui.header("📈 Análise de Status e Fluxo")
+    
+    # Funil de conversão
+    ui.subheader("📊 Funil de Conversão")
+    
+    status_flow = _contar_cubo(cubo, 'Status').reset_index()
+    status_flow.columns = ['Status', 'Quantidade']
+    
+    col_stat1, col_stat2 = ui.columns(2)
+    
+    with col_stat1:
+        # Funil
+        fig_funil = px.funnel(
+            status_flow,
+            x='Quantidade',
+            y='Status',
+            title="📉 Funil: Status dos Chamados",
+            color='Status',
+            color_discrete_map={'Fechado': '#28a745', 'Solucionado': '#17a2b8', 'Pendente': '#ffc107'}
+        )
+        ui.plotly_chart(fig_funil, use_container_width=True)
+    
+    with col_stat2:
+        # Evolução temporal do status
+        df_status_tempo = _rollup(cubo, [_mes_cubo(cubo), 'Status'])['Chamados'].rename('ID').reset_index()
+        df_status_tempo['Período'] = df_status_tempo['Dia'].astype(str)
         
-        # Tabela detalhada de técnicos
-        st.dataframe(df_sla_rank, height=300, use_container_width=True)
-    
-    # ====================================================================
-    # ABA 5: ANÁLISE DE REQUERENTES
-    # ====================================================================
-    with tab5:
-        st.header("👥 Análise de Requerentes e Solicitantes")
+        fig_status_evolucao = px.line(
+            df_status_tempo,
+            x='Período',
+            y='ID',
+            color='Status',
+            title="📈 Evolução dos Status ao Longo do Tempo",
+            labels={'ID': 'Quantidade'},
+            markers=True
+        )
+        fig_status_evolucao.update_layout(xaxis_tickangle=-45)
+        ui.plotly_chart(fig_status_evolucao, use_container_width=True)
+    
+    ui.markdown("---")
+    
+    # Backlog em cada dia do período (não só o status atual)
+    ui.subheader("📉 Evolução do Backlog")
+    cubo_backlog = _cubo_backlog(visao.dataset.attrs.get('hash'), visao.dataset)
+    serie_backlog = visao.agregado('backlog', lambda v: cubo_backlog.serie(v.filtros, v.periodo))
+
+    if len(serie_backlog) > 0:
+        col_evol1, col_evol2 = ui.columns(2)
+
+        with col_evol1:
+            fig_evol = make_subplots(specs=[[{"secondary_y": True}]])
+            fig_evol.add_trace(go.Bar(x=serie_backlog.index, y=serie_backlog['Aberturas'], name='Aberturas', marker_color='#17a2b8', opacity=0.5), secondary_y=True)
+            fig_evol.add_trace(go.Bar(x=serie_backlog.index, y=serie_backlog['Fechamentos'], name='Fechamentos', marker_color='#28a745', opacity=0.5), secondary_y=True)
+            fig_evol.add_trace(go.Scatter(x=serie_backlog.index, y=serie_backlog['Backlog'], name='Backlog', mode='lines', line=dict(color='#dc3545', width=3)), secondary_y=False)
+            fig_evol.update_layout(title="📉 Backlog no Fim de Cada Dia", barmode='overlay', hovermode='x unified')
+            fig_evol.update_yaxes(title_text="Backlog", secondary_y=False)
+            fig_evol.update_yaxes(title_text="Aberturas / Fechamentos", secondary_y=True)
+            ui.plotly_chart(fig_evol, use_container_width=True)
+
+        with col_evol2:
+            # Quebra por dimensão: as 8 maiores de cada uma, alternadas pelo menu do gráfico
+            fig_quebra = go.Figure()
+            visiveis = []
+            for rotulo, coluna in [('Categoria', 'Categoria Limpa'), ('Técnico', 'Atribuído - Técnico'), ('Localização', 'Localização')]:
+                if coluna not in visao.colunas_dataset:
+                    continue
+                por_valor = visao.agregado(f'backlog:{coluna}', lambda v, c=coluna: cubo_backlog.serie(v.filtros, v.periodo, por=c))
+                maiores = por_valor.iloc[-1].nlargest(8).index if len(por_valor.columns) > 0 else []
+                for valor in maiores:
+                    fig_quebra.add_trace(go.Scatter(x=por_valor.index, y=por_valor[valor], name=str(valor), mode='lines', visible=not visiveis))
+                visiveis.append((rotulo, len(maiores)))
+
+            total_tracos = sum(quantidade for _, quantidade in visiveis)
+            botoes, inicio = [], 0
+            for rotulo, quantidade in visiveis:
+                mascara = [inicio <= i < inicio + quantidade for i in range(total_tracos)]
+                botoes.append(dict(label=rotulo, method='update', args=[{'visible': mascara}, {'title': f"📊 Backlog por {rotulo} (8 maiores no fim do período)"}]))
+                inicio += quantidade
+            titulo_inicial = f"📊 Backlog por {visiveis[0][0]} (8 maiores no fim do período)" if visiveis else "📊 Backlog por Dimensão"
+            fig_quebra.update_layout(
+                title=titulo_inicial,
+                updatemenus=[dict(buttons=botoes, direction='down', x=1.0, xanchor='right', y=1.15, yanchor='top')],
+                hovermode='x unified'
+            )
+            ui.plotly_chart(fig_quebra, use_container_width=True)
+
+    ui.markdown("---")
+
+    # Backlog
+    ui.subheader("⏳ Análise de Backlog (Chamados Pendentes)")
+    
+    # Dias em aberto e chamados mais antigos dependem de cada chamado: linhas do recorte
+    df_filtered = visao.colunas(['ID', 'Título', 'Status', 'Requerente - Requerente', 'Localização', 'Categoria Limpa', 'Data Abertura Datetime'])
+    df_pendentes = df_filtered[df_filtered['Status'] == 'Pendente'].copy()
+    
+    if len(df_pendentes) > 0:
+        col_back1, col_back2 = ui.columns(2)
         
-        # Top solicitantes
-        st.subheader("🏆 Top Usuários que Mais Abrem Chamados")
-        col_req1, col_req2 = st.columns(2)
+        with col_back1:
+            ui.metric("📋 Total de Pendentes", len(df_pendentes))
+            
+            # Tempo em aberto
+            hoje = pd.Timestamp.now()
+            df_pendentes['Dias em Aberto'] = (hoje - df_pendentes['Data Abertura Datetime']).dt.days
+            
+            fig_backlog = px.histogram(
+                df_pendentes,
+                x='Dias em Aberto',
+                nbins=20,
+                title="⏳ Distribuição do Backlog (Dias em Aberto)",
+                color_discrete_sequence=['#ffc107']
+            )
+            ui.plotly_chart(fig_backlog, use_container_width=True)
         
-        with col_req1:
-            top_requerentes = df_filtered['Requerente - Requerente'].value_counts().head(20).reset_index()
-            top_requerentes.columns = ['Requerente', 'Total Chamados']
+        with col_back2:
+            # Backlog por categoria
+            back_cat = _contar_valores(df_pendentes['Categoria Limpa']).head(10).reset_index()
+            back_cat.columns = ['Categoria', 'Pendentes']
             
-            fig_req = px.bar(
-                top_requerentes,
-                x='Total Chamados',
-                y='Requerente',
-                title="👥 Top 20 Solicitantes",
+            fig_back_cat = px.bar(
+                back_cat,
+                x='Pendentes',
+                y='Categoria',
+                title="📊 Backlog por Categoria",
                 orientation='h',
-                color='Total Chamados',
-                color_continuous_scale='Purples',
-                text='Total Chamados'
+                color='Pendentes',
+                color_continuous_scale='Oranges',
+                text='Pendentes'
             )
-            fig_req.update_traces(textposition='outside')
-            st.plotly_chart(fig_req, use_container_width=True)
+            fig_back_cat.update_traces(textposition='outside')
+            ui.plotly_chart(fig_back_cat, use_container_width=True)
         
-        with col_req2:
-            # Recorrência por usuário
-            df_recor_user = df_filtered.groupby('Requerente - Requerente').agg({
-                'ID': 'count',
-                'Categoria Limpa': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'Variado'
-            }).reset_index()
-            df_recor_user.columns = ['Requerente', 'Total', 'Problema Mais Comum']
-            df_recor_user = df_recor_user[df_recor_user['Total'] >= 5].sort_values('Total', ascending=False).head(15)
+        # Chamados antigos pendentes
+        df_antigos = df_pendentes.nlargest(15, 'Dias em Aberto')[['ID', 'Título', 'Requerente - Requerente', 'Localização', 'Dias em Aberto']]
+        ui.subheader("🚨 Chamados Mais Antigos Pendentes")
+        ui.dataframe(df_antigos, use_container_width=True)
+    else:
+        ui.success("✅ Não há chamados pendentes no momento!")
+
+    ui.markdown("---")
+
+    # Prazo dos chamados em aberto, medido agora (a seção entra no cache de figuras com a data)
+    ui.subheader("⏰ Prazo de SLA dos Chamados em Aberto")
+    colunas_sla = ['ID', 'Título', 'Status', 'Prioridade', 'Atribuído - Técnico', 'Data Abertura Datetime', 'Data SLA Datetime']
+    df_abertos = _sla_em_aberto(
+        visao.colunas([coluna for coluna in colunas_sla if coluna in visao.colunas_dataset]), pd.Timestamp.now()
+    )
+
+    if len(df_abertos) > 0:
+        violados = int(df_abertos['SLA Violado'].sum())
+        vencendo = int((~df_abertos['SLA Violado'] & (df_abertos['Folga SLA (h)'] <= SLA_HORAS / 2)).sum())
+        c1, c2, c3 = ui.columns(3)
+        with c1:
+            ui.metric("📂 Em Aberto", len(df_abertos))
+        with c2:
+            ui.metric("🔴 Fora do Prazo", violados, delta=f"{violados / len(df_abertos) * 100:.1f}%", delta_color="inverse")
+        with c3:
+            ui.metric(f"🟠 Vencem em até {SLA_HORAS / 2:g}h úteis", vencendo)
+
+        # Os mais atrasados primeiro (folga mais negativa), depois os que vencem antes
+        df_prazo = df_abertos.nsmallest(15, 'Folga SLA (h)')[
+            [coluna for coluna in ['ID', 'Título', 'Status', 'Prioridade', 'Atribuído - Técnico', 'Folga SLA (h)'] if coluna in df_abertos.columns]
+        ]
+        df_prazo['Folga SLA (h)'] = df_prazo['Folga SLA (h)'].round(1)
+        ui.dataframe(df_prazo, use_container_width=True, hide_index=True)
+    else:
+        ui.success("✅ Não há chamados em aberto no momento!")
+
+
+# ====================================================================
+# ABA 9: ANÁLISE PREDITIVA
+# ====================================================================
+def _secao_preditiva(visao, ui):
+    cubo = visao.cubo
+
+    ui.header("🔮 Análise Preditiva e Tendências")
+    
+    # Previsão de demanda
+    ui.subheader("📈 Previsão de Demanda")
+    
+    # Série temporal mensal
+    df_serie = _rollup(cubo, _mes_cubo(cubo))['Chamados'].rename('ID').reset_index()
+    df_serie['Mês'] = df_serie['Dia'].astype(str)
+    df_serie['Ordem'] = range(len(df_serie))
+    
+    col_pred1, col_pred2 = ui.columns(2)
+    
+    with col_pred1:
+        # Previsão com intervalo (mesmo motor das séries por dimensão), sobre o histórico
+        # inteiro com os filtros de dimensão: o período do recorte não encurta as séries
+        previsoes = visao.agregado('previsoes', _agregado_previsoes)
+        if previsoes is not None:
+            total = ('Total', 'Total')
+            previsto = previsoes['previsto'].loc[total]
+            meses_futuros = previsto.index.astype(str)
+            historico_total = previsoes['historico'].loc[total]
+
+            fig_tend = go.Figure()
+            fig_tend.add_trace(go.Scatter(x=historico_total.index.astype(str), y=historico_total.to_numpy(),
+                                         mode='lines+markers', name='Real',
+                                         line=dict(color='#007bff', width=3)))
+            fig_tend.add_trace(go.Scatter(x=meses_futuros, y=previsoes['maximo'].loc[total],
+                                         mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+            fig_tend.add_trace(go.Scatter(x=meses_futuros, y=previsoes['minimo'].loc[total],
+                                         mode='lines', line=dict(width=0), fill='tonexty',
+                                         fillcolor='rgba(220, 53, 69, 0.2)', name='Intervalo 95%'))
+            fig_tend.add_trace(go.Scatter(x=meses_futuros, y=previsto,
+                                         mode='lines+markers', name=f"Previsão ({previsoes['modelo'].loc[total]})",
+                                         line=dict(color='red', dash='dash')))
+            fig_tend.update_layout(title="📈 Histórico e Previsão de Chamados",
+                                  xaxis_title="Período", yaxis_title="Chamados")
+            ui.plotly_chart(fig_tend, use_container_width=True)
             
-            fig_recor_user = px.scatter(
-                df_recor_user,
-                x='Requerente',
-                y='Total',
-                size='Total',
-                color='Problema Mais Comum',
-                title="🔁 Recorrência: Usuários com Mais de 5 Chamados",
-                labels={'Total': 'Número de Chamados'}
+            # Métricas de previsão
+            media_projecao = previsto.mean()
+            ui.metric(f"📊 Média Prevista (próximos {HORIZONTE_PREVISAO} meses)", f"{media_projecao:.0f} chamados/mês")
+            
+            crescimento = ((df_serie['ID'].iloc[-1] - df_serie['ID'].iloc[0]) / df_serie['ID'].iloc[0]) * 100
+            ui.metric("📈 Crescimento Total", f"{crescimento:.1f}%")
+    
+    with col_pred2:
+        # Necessidade de recursos: fila por faixa dia da semana x hora
+        media_chamados_mes = df_serie['ID'].mean()
+        tecnicos_atuais = cubo['Atribuído - Técnico'].nunique()
+        dimensionamento = visao.agregado('dimensionamento', _agregado_dimensionamento)
+        
+        ui.subheader("🎯 Necessidade de Recursos")
+        if dimensionamento is not None:
+            curva = dimensionamento['curva']
+            atingem = curva.index[curva['Atendidos na Meta (%)'] >= META_ATENDIMENTO * 100]
+            tecnicos_necessarios = atingem[0] if len(atingem) > 0 else np.nan
+            tempo_configurado = dimensionamento['tempo_configurado']
+        else:
+            tecnicos_necessarios = np.nan
+            tempo_configurado = TEMPO_ATENDIMENTO_HORAS is not None
+        # Sem o tempo de atendimento configurado, o tempo de resolução conta a fila duas vezes
+        rotulo_tecnicos = "📊 Técnicos Sugeridos" if tempo_configurado else "📊 Técnicos (limite superior)"
+        rotulo_tempo = "⏱️ Tempo de Atendimento" if tempo_configurado else "⏱️ Tempo de Resolução (mediana)"
+        
+        c1, c2, c3, c4 = ui.columns(4)
+        with c1:
+            ui.metric("👥 Técnicos Atuais", f"{tecnicos_atuais}")
+        with c2:
+            if pd.isna(tecnicos_necessarios):
+                ui.metric(rotulo_tecnicos, "N/A")
+            else:
+                ui.metric(rotulo_tecnicos, f"{int(tecnicos_necessarios)}",
+                          delta=f"{int(tecnicos_necessarios - tecnicos_atuais)}")
+        with c3:
+            ui.metric(
+                rotulo_tempo,
+                f"{dimensionamento['tempo_atendimento']:.1f}h" if dimensionamento is not None else "N/A",
+                help="Configurado em GLPI_TEMPO_ATENDIMENTO_HORAS" if tempo_configurado else
+                     "Mediana do tempo útil de resolução dos chamados resolvidos (inclui fila e pendências)"
+            )
+        with c4:
+            ui.metric("📞 Média Chamados/Mês", f"{media_chamados_mes:.0f}" if not pd.isna(media_chamados_mes) else "N/A")
+        if not tempo_configurado:
+            ui.warning(
+                "⚠️ Tempo de atendimento não configurado: a simulação usa a mediana do tempo de resolução, "
+                "que já inclui espera na fila e pendências, então superestima os técnicos necessários. "
+                "Defina GLPI_TEMPO_ATENDIMENTO_HORAS (horas de trabalho do técnico por chamado) para o dimensionamento."
             )
-            fig_recor_user.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_recor_user, use_container_width=True)
         
-        st.markdown("---")
+        if dimensionamento is not None:
+            # Curva de capacidade: meta de espera, utilização e espera média por número de técnicos
+            curva = curva[curva['Utilização (%)'] >= 5]
+            fig_capacidade = make_subplots(specs=[[{"secondary_y": True}]])
+            fig_capacidade.add_trace(go.Scatter(x=curva.index, y=curva['Atendidos na Meta (%)'], name=f"Espera ≤ {META_ESPERA_HORAS:g}h (%)", line=dict(color='#28a745', width=3)), secondary_y=False)
+            fig_capacidade.add_trace(go.Scatter(x=curva.index, y=curva['Utilização (%)'], name='Utilização (%)', line=dict(color='#ffc107', width=3)), secondary_y=False)
+            fig_capacidade.add_trace(go.Scatter(x=curva.index, y=curva['Espera Média (h)'].replace(np.inf, np.nan) * 60, name='Espera Média (min)', line=dict(color='#dc3545', dash='dot')), secondary_y=True)
+            fig_capacidade.add_vline(x=tecnicos_atuais, line_dash="dash", line_color="gray", annotation_text="Atual")
+            fig_capacidade.update_layout(title="📊 Simulação de Capacidade (fila M/M/N por faixa horária)", xaxis_title="Técnicos", hovermode='x unified')
+            fig_capacidade.update_yaxes(title_text="%", range=[0, 105], secondary_y=False)
+            fig_capacidade.update_yaxes(title_text="Minutos", secondary_y=True)
+            ui.plotly_chart(fig_capacidade, use_container_width=True)
+            
+            fig_faixas = px.imshow(
+                dimensionamento['necessarios'],
+                labels=dict(x="Hora", y="Dia da Semana", color="Técnicos"),
+                title=f"👥 Técnicos Necessários por Faixa (espera ≤ {META_ESPERA_HORAS:g}h em {META_ATENDIMENTO:.0%})"
+                      + ("" if tempo_configurado else " — limite superior"),
+                color_continuous_scale='Blues',
+                aspect='auto'
+            )
+            ui.plotly_chart(fig_faixas, use_container_width=True)
+        else:
+            ui.info("🔎 Sem dados suficientes para o gráfico de capacidade.")
+    
+    ui.markdown("---")
+    
+    # Tendências futuras por categoria
+    ui.subheader("📉 Tendências Futuras por Categoria")
+    
+    top_5_cat = _contar_cubo(cubo, 'Categoria Limpa').head(5).index.tolist()
+    
+    if previsoes is not None and 'Categoria Limpa' in previsoes['historico'].index.get_level_values('Dimensão'):
+        historico_cat = previsoes['historico'].loc['Categoria Limpa']
+        previsto_cat = previsoes['previsto'].loc['Categoria Limpa']
+        cores = px.colors.qualitative.Plotly
         
-        # Setores problemáticos
-        st.subheader("📍 Setores/Localizações com Mais Chamados")
-        col_req3, col_req4 = st.columns(2)
+        fig_cat_tend = go.Figure()
+        for i, categoria in enumerate(str(c) for c in top_5_cat):
+            cor = cores[i % len(cores)]
+            fig_cat_tend.add_trace(go.Scatter(x=historico_cat.columns.astype(str), y=historico_cat.loc[categoria],
+                                             mode='lines+markers', name=categoria, legendgroup=categoria,
+                                             line=dict(color=cor)))
+            # A previsão parte do último mês real para a linha ficar contínua
+            fig_cat_tend.add_trace(go.Scatter(
+                x=[str(historico_cat.columns[-1])] + list(previsto_cat.columns.astype(str)),
+                y=[historico_cat.loc[categoria].iloc[-1]] + list(previsto_cat.loc[categoria]),
+                mode='lines', name=f"{categoria} (previsão)", legendgroup=categoria, showlegend=False,
+                line=dict(color=cor, dash='dash')
+            ))
+        fig_cat_tend.update_layout(
+            title="📈 Evolução e Previsão das Top 5 Categorias",
+            xaxis_title="Período", yaxis_title="Número de Chamados", xaxis_tickangle=-45
+        )
+        ui.plotly_chart(fig_cat_tend, use_container_width=True)
+
+        # Próximo mês de todas as séries, com intervalo
+        ui.subheader("🔮 Previsão para o Próximo Mês")
+        proximo = previsoes['previsto'].columns[0]
+        colunas_prev = ui.columns(len(DIMENSOES_PREVISAO))
+        for coluna_ui, (rotulo, dimensao) in zip(colunas_prev, [('Categoria', 'Categoria Limpa'), ('Técnico', 'Atribuído - Técnico'), ('Localização', 'Localização')]):
+            if dimensao not in previsoes['previsto'].index.get_level_values('Dimensão'):
+                continue
+            df_prev = pd.DataFrame({
+                rotulo: previsoes['previsto'].loc[dimensao].index,
+                'Previsto': previsoes['previsto'].loc[dimensao][proximo].round(0).to_numpy(),
+                'Mínimo': previsoes['minimo'].loc[dimensao][proximo].round(0).to_numpy(),
+                'Máximo': previsoes['maximo'].loc[dimensao][proximo].round(0).to_numpy(),
+            }).sort_values('Previsto', ascending=False).head(10)
+            with coluna_ui:
+                ui.caption(f"{rotulo} — {proximo}")
+                ui.dataframe(df_prev, use_container_width=True, hide_index=True)
+    elif len(top_5_cat) > 0:
+        # Sem histórico para prever: só a evolução mensal das Top 5 no recorte
+        celulas_top = cubo[cubo['Categoria Limpa'].isin(top_5_cat)]
+        df_cat_serie = _rollup(celulas_top, [celulas_top['Categoria Limpa'], _mes_cubo(celulas_top).rename('Mês')])['Chamados'].reset_index()
+        df_cat_serie['Período'] = df_cat_serie['Mês'].astype(str)
+        fig_cat_tend = px.line(
+            df_cat_serie,
+            x='Período',
+            y='Chamados',
+            color='Categoria Limpa',
+            title="📈 Evolução das Top 5 Categorias",
+            labels={'Chamados': 'Número de Chamados'},
+            markers=True
+        )
+        fig_cat_tend.update_layout(xaxis_tickangle=-45)
+        ui.plotly_chart(fig_cat_tend, use_container_width=True)
+        ui.info("🔎 Histórico insuficiente para previsão (mínimo de 3 meses).")
+    else:
+        ui.info("🔎 Histórico insuficiente para previsão (mínimo de 3 meses).")
+
+
+# ====================================================================
+# ABA 10: ANÁLISE DE QUALIDADE
+# ====================================================================
+def _secao_qualidade(visao, ui):
+    df_filtered = visao.colunas(['ID', 'Título', 'Categoria Limpa', 'Localização', 'Data Abertura Datetime'])
+
+    ui.header("✅ Análise de Qualidade dos Chamados")
+
+    # Primeira resolução (esquerda) | Qualidade da descrição (direita)
+    col_qual1, col_qual2 = ui.columns(2)
+
+    with col_qual1:
+        ui.subheader("🎯 Taxa de Primeira Resolução")
+        marcas_retrabalho = _retrabalho_dataset(visao.dataset.attrs.get('hash'), visao.dataset)
+        retrabalho_count = int(marcas_retrabalho[df_filtered.index.to_numpy()].sum())
+        taxa_primeira_resolucao = (
+            ((len(df_filtered) - retrabalho_count) / len(df_filtered)) * 100
+            if len(df_filtered) > 0 else 0
+        )
+
+        m1, m2 = ui.columns(2)
+        with m1:
+            ui.metric("✅ Primeira Resolução", f"{taxa_primeira_resolucao:.1f}%")
+        with m2:
+            ui.metric(
+                "🔄 Possível Retrabalho", f"{retrabalho_count}",
+                help=f"Reaberturas do mesmo requerente e categoria em até {JANELA_RETRABALHO_DIAS:g} dias"
+            )
+
+        fig_retrab = go.Figure(data=[
+            go.Pie(
+                labels=['Primeira Resolução', 'Possível Retrabalho'],
+                values=[len(df_filtered) - retrabalho_count, retrabalho_count],
+                marker=dict(colors=['#28a745', '#dc3545']),
+                hole=0.4
+            )
+        ])
+        fig_retrab.update_layout(title="🎯 Taxa de Primeira Resolução")
+        ui.plotly_chart(fig_retrab, use_container_width=True)
+
+    with col_qual2:
+        ui.subheader("✍️ Qualidade das Descrições")
+        df_filtered['Tamanho Título'] = df_filtered['Título'].str.len()
+        df_filtered['Qualidade Desc'] = df_filtered['Tamanho Título'].apply(
+            lambda x: 'Boa (>20 chars)' if x > 20 else 'Ruim (≤20 chars)' if pd.notna(x) else 'N/A'
+        )
+        qual_desc = df_filtered['Qualidade Desc'].value_counts().reset_index()
+        qual_desc.columns = ['Qualidade', 'Quantidade']
+
+        fig_qual = px.pie(
+            qual_desc,
+            values='Quantidade',
+            names='Qualidade',
+            title="✍️ Qualidade das Descrições",
+            color_discrete_sequence=['#28a745', '#dc3545', '#6c757d'],
+            hole=0.4
+        )
+        fig_qual.update_traces(textposition='inside', textinfo='percent+label')
+        ui.plotly_chart(fig_qual, use_container_width=True)
+
+        pct_boa = (
+            qual_desc[qual_desc['Qualidade'] == 'Boa (>20 chars)']['Quantidade'].sum() / len(df_filtered) * 100
+            if len(df_filtered) > 0 else 0
+        )
+        ui.metric("✅ Descrições Detalhadas", f"{pct_boa:.1f}%")
+
+    ui.markdown("---")
+
+    # Duplicados
+    ui.subheader("🔄 Análise de Chamados Duplicados")
+    detector = _detector_duplicados(visao.dataset.attrs.get('hash'), visao.dataset['Título'])
+    df_dup = df_filtered[['Título', 'Localização', 'Categoria Limpa', 'Data Abertura Datetime']].copy()
+    df_dup['Agrupamento'] = detector.agrupamentos(df_dup)
+    df_dup = df_dup[df_dup['Agrupamento'] >= 0]
+    if len(df_dup) > 0:
+        titulos = _moda_por_grupo(df_dup, 'Agrupamento', 'Título')['moda']
+        df_dup = df_dup.sort_values('Data Abertura Datetime').groupby('Agrupamento').agg(
+            Localização=('Localização', 'first'),
+            Repetições=('Título', 'size'),
+            Categoria=('Categoria Limpa', 'first'),
+            Primeira=('Data Abertura Datetime', 'min'),
+            Última=('Data Abertura Datetime', 'max'),
+        )
+        df_dup.insert(0, 'Título', titulos)
+        df_dup = df_dup.sort_values('Repetições', ascending=False, kind='stable').head(20).reset_index(drop=True)
+
+    if len(df_dup) > 0:
+        fig_dup = px.bar(
+            df_dup,
+            x='Repetições',
+            y='Título',
+            title=f"🔄 Top 20 Problemas Duplicados (Título Semelhante + Local, até {JANELA_DUPLICADOS_DIAS:g} dias)",
+            orientation='h',
+            color='Repetições',
+            color_continuous_scale='Reds',
+            text='Repetições',
+            hover_data=['Localização', 'Categoria', 'Primeira', 'Última']
+        )
+        fig_dup.update_traces(textposition='outside')
+        ui.plotly_chart(fig_dup, use_container_width=True)
+        ui.dataframe(df_dup, use_container_width=True)
+    else:
+        ui.success("✅ Nenhum chamado duplicado identificado!")
+
+
+# ====================================================================
+# ABA 11: MÉTRICAS ESPECÍFICAS DO SISTEMA
+# ====================================================================
+def _secao_especificas(visao, ui):
+    cubo = visao.cubo
+    total = cubo['Chamados'].sum()
+    meses_no_periodo = _mes_cubo(cubo).nunique()
+
+    ui.header("🖨️ Métricas Específicas por Tipo de Problema")
+    
+    # Incidentes de impressora
+    ui.subheader("🖨️ Análise de Incidentes de Impressora")
+    col_esp1, col_esp2 = ui.columns(2)
+    
+    with col_esp1:
+        df_impressora = _filtrar_tipos(cubo, 'Impressora')
         
-        with col_req3:
-            top_locais = df_filtered['Localização'].value_counts().head(15).reset_index()
-            top_locais.columns = ['Localização', 'Total Chamados']
+        if df_impressora['Chamados'].sum() > 0:
+            local_impressora = _contar_cubo(df_impressora, 'Localização').head(15).reset_index()
+            local_impressora.columns = ['Localização', 'Incidentes']
             
-            fig_local = px.bar(
-                top_locais,
-                x='Total Chamados',
+            fig_imp = px.bar(
+                local_impressora,
+                x='Incidentes',
                 y='Localização',
-                title="🏥 Top 15 Localizações Mais Problemáticas",
+                title="🖨️ Top 15 Locais com Problemas de Impressora",
                 orientation='h',
-                color='Total Chamados',
+                color='Incidentes',
                 color_continuous_scale='Reds',
-                text='Total Chamados'
+                text='Incidentes'
             )
-            fig_local.update_traces(textposition='outside')
-            st.plotly_chart(fig_local, use_container_width=True)
+            fig_imp.update_traces(textposition='outside')
+            ui.plotly_chart(fig_imp, use_container_width=True)
+            
+            ui.metric("Total Incidentes", df_impressora['Chamados'].sum())
+            ui.metric("% do Total", f"{(df_impressora['Chamados'].sum()/total*100):.1f}%")
+    
+    with col_esp2:
+        # Problemas de hardware
+        df_hardware = _filtrar_tipos(cubo, 'Computador', 'Hardware')
         
-        with col_req4:
-            # Relação Requerente x Localização
-            df_req_local = df_filtered.groupby(['Localização', 'Requerente - Requerente'])['ID'].count().reset_index()
-            df_req_local = df_req_local.sort_values('ID', ascending=False).head(30)
+        if df_hardware['Chamados'].sum() > 0:
+            hw_cat = _contar_cubo(df_hardware, 'Categoria Limpa').head(10).reset_index()
+            hw_cat.columns = ['Tipo Hardware', 'Quantidade']
             
-            fig_treemap = px.treemap(
-                df_req_local,
-                path=['Localização', 'Requerente - Requerente'],
-                values='ID',
-                title="🗺️ TreeMap: Localização x Requerentes",
-                color='ID',
-                color_continuous_scale='YlOrRd'
+            fig_hw = px.pie(
+                hw_cat,
+                values='Quantidade',
+                names='Tipo Hardware',
+                title="💻 Distribuição de Problemas de Hardware",
+                color_discrete_sequence=px.colors.qualitative.Set3
             )
-            st.plotly_chart(fig_treemap, use_container_width=True)
+            fig_hw.update_traces(textposition='inside', textinfo='percent+label')
+            ui.plotly_chart(fig_hw, use_container_width=True)
+            
+            ui.metric("Total Hardware", df_hardware['Chamados'].sum())
+            ui.metric("% do Total", f"{(df_hardware['Chamados'].sum()/total*100):.1f}%")
     
-    # ====================================================================
-    # ABA 6: ANÁLISE DE LOCALIZAÇÃO
-    # ====================================================================
-    with tab6:
-        st.header("🏥 Análise Geográfica por Localização")
-        
-        # Setores críticos
-        st.subheader("🔴 Setores Críticos")
-        
-        df_local_analise = df_filtered.groupby('Localização').agg({
-            'ID': 'count',
-            'Tempo Resolução (h)': 'mean',
-            'Categoria Limpa': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'Variado'
-        }).reset_index()
-        df_local_analise.columns = ['Localização', 'Total Chamados', 'Tempo Médio (h)', 'Problema Principal']
-        df_local_analise = df_local_analise.sort_values('Total Chamados', ascending=False)
+    ui.markdown("---")
+    
+    # Reset de senhas SPDATA
+    ui.subheader("🔐 Análise de Reset de Senhas")
+    col_esp3, col_esp4 = ui.columns(2)
+    
+    with col_esp3:
+        df_senha = _filtrar_tipos(cubo, 'Senha', 'SPDATA')
         
-        col_loc1, col_loc2 = st.columns(2)
+        if df_senha['Chamados'].sum() > 0:
+            # Volume de resets por mês
+            df_senha_mes = _rollup(df_senha, _mes_cubo(df_senha))['Chamados'].rename('ID').reset_index()
+            df_senha_mes['Mês'] = df_senha_mes['Dia'].astype(str)
+            
+            fig_senha = px.bar(
+                df_senha_mes,
+                x='Mês',
+                y='ID',
+                title="🔐 Volume de Reset de Senhas por Mês",
+                color='ID',
+                color_continuous_scale='Purples',
+                text='ID'
+            )
+            fig_senha.update_traces(textposition='outside')
+            fig_senha.update_layout(xaxis_tickangle=-45)
+            ui.plotly_chart(fig_senha, use_container_width=True)
+            
+            ui.metric("Total Resets", df_senha['Chamados'].sum())
+            ui.metric("% do Total", f"{(df_senha['Chamados'].sum()/total*100):.1f}%")
+            ui.metric("Média/Mês", f"{df_senha['Chamados'].sum()/meses_no_periodo:.0f}")
+    
+    with col_esp4:
+        # Suprimentos (TONNER)
+        df_tonner = _filtrar_tipos(cubo, 'Tonner')
         
-        with col_loc1:
-            # Top setores
-            fig_setor = px.bar(
-                df_local_analise.head(20),
-                x='Total Chamados',
+        if df_tonner['Chamados'].sum() > 0:
+            tonner_local = _contar_cubo(df_tonner, 'Localização').head(10).reset_index()
+            tonner_local.columns = ['Localização', 'Solicitações']
+            
+            fig_tonner = px.bar(
+                tonner_local,
+                x='Solicitações',
                 y='Localização',
-                title="🏥 Top 20 Setores com Mais Chamados",
+                title="📦 Top 10 Setores - Solicitações de Tonner",
                 orientation='h',
-                color='Total Chamados',
-                color_continuous_scale='Reds',
-                text='Total Chamados'
+                color='Solicitações',
+                color_continuous_scale='Oranges',
+                text='Solicitações'
             )
-            fig_setor.update_traces(textposition='outside')
-            st.plotly_chart(fig_setor, use_container_width=True)
-        
-        with col_loc2:
-            # Mapa de calor: Localização x Categoria
-            top_15_locais = df_local_analise.head(15)['Localização'].tolist()
-            top_10_cat = df_filtered['Categoria Limpa'].value_counts().head(10).index.tolist()
-            
-            df_heat_local = df_filtered[
-                (df_filtered['Localização'].isin(top_15_locais)) & 
-                (df_filtered['Categoria Limpa'].isin(top_10_cat))
-            ]
+            fig_tonner.update_traces(textposition='outside')
+            ui.plotly_chart(fig_tonner, use_container_width=True)
             
-            heat_local_cat = df_heat_local.pivot_table(
-                index='Localização',
-                columns='Categoria Limpa',
-                values='ID',
-                aggfunc='count',
-                fill_value=0
+            ui.metric("Total Tonners", df_tonner['Chamados'].sum())
+            ui.metric("% do Total", f"{(df_tonner['Chamados'].sum()/total*100):.1f}%")
+            ui.metric("Média/Mês", f"{df_tonner['Chamados'].sum()/meses_no_periodo:.0f}")
+    
+    ui.markdown("---")
+    
+    # Resumo geral de tipos
+    ui.subheader("📊 Resumo Geral por Tipo de Problema")
+    
+    # Uma única agregação por combinação de bits; cada tipo soma as combinações que o contêm
+    por_tipos = _rollup(cubo, 'Tipos')
+    bits = por_tipos.index.to_numpy()
+    linhas_resumo = []
+    for tipo in ['Impressora', 'SPDATA', 'Tonner', 'Computador', 'Hardware', 'Rede']:
+        medidas = por_tipos[(bits & DTYPE_TIPOS(BIT_TIPO[tipo])) != 0].sum()
+        linhas_resumo.append({
+            'Tipo': tipo,
+            'Quantidade': int(medidas['Chamados']),
+            '% Total': f"{(medidas['Chamados']/total*100):.1f}%",
+            'Tempo Médio (h)': f"{_tempo_medio(medidas['Soma Horas'], medidas['Horas Válidas']):.1f}" if medidas['Chamados'] > 0 else "N/A"
+        })
+    resumo_tipos = pd.DataFrame(linhas_resumo)
+    resumo_tipos = resumo_tipos.sort_values('Quantidade', ascending=False)
+    
+    fig_resumo = px.bar(
+        resumo_tipos,
+        x='Quantidade',
+        y='Tipo',
+        title="📊 Resumo por Tipo de Problema",
+        orientation='h',
+        color='Quantidade',
+        color_continuous_scale='Viridis',
+        text='Quantidade'
+    )
+    fig_resumo.update_traces(textposition='outside')
+    ui.plotly_chart(fig_resumo, use_container_width=True)
+    
+    ui.dataframe(resumo_tipos, use_container_width=True)
+
+
+# Registro das seções: (identificador, rótulo, função)
+SECOES = [
+    ('kpis', "📊 1. KPIs", _secao_kpis),
+    ('temporal', "⏰ 2. Temporal", _secao_temporal),
+    ('categoria', "🏷️ 3. Categoria", _secao_categoria),
+    ('tecnicos', "👨‍💻 4. Técnicos", _secao_tecnicos),
+    ('requerentes', "👥 5. Requerentes", _secao_requerentes),
+    ('localizacao', "🏥 6. Localização", _secao_localizacao),
+    ('prioridade', "⚡ 7. Prioridade", _secao_prioridade),
+    ('status', "📈 8. Status", _secao_status),
+    ('preditiva', "🔮 9. Preditiva", _secao_preditiva),
+    ('qualidade', "✅ 10. Qualidade", _secao_qualidade),
+    ('especificas', "🖨️ 11. Específicas", _secao_especificas),
+]
+SECOES_POR_ID = {id_secao: funcao for id_secao, _, funcao in SECOES}
+# Seções cujo resultado depende da data corrente (ex.: 'Dias em Aberto' do backlog);
+# a data entra na chave para que a gravação não fique congelada de um dia para o outro
+SECOES_DEPENDENTES_DA_DATA = {'status'}
+
+
+def _chave_secao(visao, id_secao):
+    """
+    Chave da seção no cache de figuras: (seção, filtros, dataset) e, quando
+    a seção depende da data corrente, o dia de hoje
+    """
+    if id_secao in SECOES_DEPENDENTES_DA_DATA:
+        return (id_secao, visao.chave, date.today().isoformat())
+    return (id_secao, visao.chave)
+
+
+@st.cache_resource
+def _cache_figuras():
+    return CacheLRU(FIGURAS_MAX_MB * 1024 * 1024, 'figuras')
+
+
+def _calcular_secao(visao, id_secao):
+    """
+    Devolve as chamadas de UI da seção para o recorte, executando-a só se
+    (seção, filtros, dataset) ainda não estiver no cache de figuras
+    """
+    def calcular():
+        ui = _Gravador()
+        # Agregações e montagem das figuras; a serialização das figuras é medida à parte
+        with _etapa(f'calcular[{id_secao}]') as registro:
+            SECOES_POR_ID[id_secao](visao, ui)
+            registro['figuras'] = ui.figuras
+            registro['serializacao_segundos'] = round(ui.segundos_serializacao, 4)
+        return SecaoGravada(ui.operacoes, ui.tamanho)
+
+    # visao.chave já é (hash do dataset, período, filtros)
+    return _cache_figuras().obter(_chave_secao(visao, id_secao), calcular).operacoes
+
+
+@st.cache_resource
+def _executor_secoes():
+    return ThreadPoolExecutor(max_workers=THREADS_PRE_CALCULO, thread_name_prefix='secoes')
+
+
+def _pre_calcular_secoes(visao, id_ativo):
+    """
+    Calcula em segundo plano as demais seções do recorte atual, deixando-as prontas no cache
+    """
+    executor = _executor_secoes()
+    cache = _cache_figuras()
+    for id_secao, _, _ in SECOES:
+        if id_secao != id_ativo and not cache.contem(_chave_secao(visao, id_secao)):
+            executor.submit(_calcular_secao, visao, id_secao)
+
+
+# ====================================================================
+# APLICAÇÃO STREAMLIT
+# ====================================================================
+def main():
+    # Configuração do dashboard
+
+    st.set_page_config(
+        page_title="Dashboard de Chamados Técnicos - HMSI", 
+        layout="wide",
+        initial_sidebar_state="expanded",
+        menu_items={
+            'Get Help': None,
+            'Report a bug': None,
+            'About': None
+        }
+    )
+
+    # CSS para esconder elementos de carregamento e menu
+    st.markdown(CSS_PAGINA, unsafe_allow_html=True)
+
+    # Verificar login antes de continuar
+    if not check_login():
+        st.stop()
+
+
+    # Informações sobre fonte de dados
+    # st.sidebar.markdown("---")
+    # st.sidebar.header("📁 Fonte de Dados")
+    # st.sidebar.info("**Arquivo:** glpi.csv  \n**Localização:** Raiz do projeto")
+
+    # Mostrar botão de logout na sidebar
+    st.sidebar.markdown("---")
+    if st.sidebar.button("🚪 Logout"):
+        st.session_state.logged_in = False
+        st.rerun()
+
+    medidor = Medidor()
+    with medidor:
+        _pagina_principal(medidor)
+
+    if st.session_state.get('usuario') in ADMINS:
+        _painel_desempenho(medidor)
+    _gravar_log_desempenho(medidor)
+
+
+def _painel_desempenho(medidor):
+    """
+    Painel recolhível na sidebar com as etapas medidas nesta execução e o estado dos caches
+    """
+    with st.sidebar.expander("⏱️ Desempenho desta execução", expanded=False):
+        st.metric("Tempo total", f"{medidor.total:.2f}s")
+        tabela = pd.DataFrame([
+            {
+                'Etapa': etapa['etapa'],
+                'Tempo (ms)': round(etapa['segundos'] * 1000, 1),
+                'Linhas entrada': etapa['linhas_entrada'],
+                'Linhas saída': etapa['linhas_saida'],
+                'Memória Δ (MB)': round(etapa['memoria_mb'], 1) if etapa['memoria_mb'] is not None else None,
+                'Cache (acertos/falhas)': ", ".join(
+                    f"{cache} {contagem['acertos']}/{contagem['falhas']}" for cache, contagem in etapa['cache'].items()
+                ),
+            }
+            for etapa in medidor.etapas
+        ]).astype({'Linhas entrada': 'Int64', 'Linhas saída': 'Int64'})
+        st.dataframe(tabela, hide_index=True, use_container_width=True)
+
+        for nome, cache in (("Recortes", _cache_visoes()), ("Figuras", _cache_figuras())):
+            estatisticas = cache.estatisticas()
+            st.caption(
+                f"{nome}: {estatisticas['entradas']} entradas, {estatisticas['mb']:.1f} MB, "
+                f"{estatisticas['acertos']} acertos / {estatisticas['falhas']} falhas"
             )
-            
-            fig_heat_loc = px.imshow(
-                heat_local_cat,
-                title="🗺️ Mapa de Calor: Localização x Categoria",
-                labels=dict(x="Categoria", y="Localização", color="Chamados"),
-                color_continuous_scale='YlOrRd',
-                aspect="auto"
+        memoria = _memoria_mb()
+        if memoria is not None:
+            st.caption(f"Memória do processo: {memoria:,.0f} MB")
+        if LOG_DESEMPENHO:
+            st.caption(f"Log: {LOG_DESEMPENHO}")
+
+
+def _pagina_principal(medidor):
+    # Upload de dados
+    st.sidebar.markdown("### 📤 Upload de Dados")
+    uploaded_file = st.sidebar.file_uploader(
+        "Carregue o arquivo glpi.csv",
+        type=["csv"],
+        help="Selecione o CSV exportado do GLPI (separador ';' e codificação UTF-8)."
+    )
+
+    uploaded_deltas = st.sidebar.file_uploader(
+        "Atualizações incrementais (opcional)",
+        type=["csv"],
+        accept_multiple_files=True,
+        help="Exportações parciais do GLPI, aplicadas na ordem de envio: chamados com o mesmo ID são substituídos e os novos, acrescentados."
+    )
+
+    # Carregar dados a partir do upload (ou do arquivo local se nenhum upload for feito)
+    with medidor.etapa('carregar') as registro:
+        df = load_data(
+            _hash_upload(uploaded_file.file_id, uploaded_file) if uploaded_file is not None else None,
+            uploaded_file
+        )
+        if 'load_data' not in registro['cache']:
+            # O corpo do load_data não executou: o dataset veio do st.cache_data
+            medidor.contar_cache('load_data', True)
+        registro['linhas_saida'] = len(df)
+
+    # Aplicar as exportações parciais sobre o dataset carregado
+    if uploaded_deltas and not df.empty:
+        with medidor.etapa('atualizacoes', linhas_entrada=len(df)) as registro:
+            df = aplicar_atualizacoes(
+                df.attrs['hash'],
+                tuple(_hash_upload(arquivo.file_id, arquivo) for arquivo in uploaded_deltas),
+                df,
+                uploaded_deltas
             )
-            st.plotly_chart(fig_heat_loc, use_container_width=True)
-        
-        st.markdown("---")
-        
-        # Áreas de risco
-        st.subheader("🔴 Áreas de Risco (Mais Incidentes)")
-        
-        # Scatter: Total x Tempo Médio
-        fig_risco = px.scatter(
-            df_local_analise.head(30),
-            x='Total Chamados',
-            y='Tempo Médio (h)',
-            size='Total Chamados',
-            color='Tempo Médio (h)',
-            hover_data=['Localização', 'Problema Principal'],
-            title="🎯 Áreas de Risco: Volume x Tempo de Resolução",
-            labels={'Total Chamados': 'Volume de Chamados', 'Tempo Médio (h)': 'Tempo Médio (horas)'},
-            color_continuous_scale='Reds',
-            text='Localização'
+            registro['linhas_saida'] = len(df)
+
+    # Inicializar variáveis de sessão para filtros interativos
+    if 'filtro_status' not in st.session_state:
+        st.session_state.filtro_status = None
+    if 'filtro_categoria' not in st.session_state:
+        st.session_state.filtro_categoria = None
+    if 'filtro_tecnico' not in st.session_state:
+        st.session_state.filtro_tecnico = None
+    if 'filtro_prioridade' not in st.session_state:
+        st.session_state.filtro_prioridade = None
+
+    # Avisar sobre datas que não puderam ser convertidas na ingestão
+    datas_invalidas = df.attrs.get('datas_invalidas', {})
+    if datas_invalidas:
+        st.sidebar.warning(
+            "⚠️ Datas não reconhecidas (tratadas como vazias): "
+            + ", ".join(f"{coluna}: {quantidade:,}" for coluna, quantidade in datas_invalidas.items())
         )
-        st.plotly_chart(fig_risco, use_container_width=True)
 
-    # Tabela detalhada
+    # Sidebar - Filtros
+    st.sidebar.header("🔍 Filtros de Análise")
+    if not df.empty:
+        # Filtro por período
+
+        with medidor.etapa('indices', linhas_entrada=len(df)) as registro:
+            motor = _motor_filtros(df.attrs.get('hash'), df)
+            cubo_olap = _cubo_olap(df.attrs.get('hash'), df)
+            registro['linhas_saida'] = len(cubo_olap.celulas)
+
+        date_range = []
+        if 'Data Abertura Datetime' in df.columns:
+            limites_datas = motor.limites_datas()
+            if limites_datas is not None:
+                min_date, max_date = limites_datas
+
+                # Definir período padrão baseado nos dados disponíveis
+                hoje = date.today()
+                primeiro_dia_mes = date(hoje.year, hoje.month, 1)
+                ultimo_dia_mes = date(hoje.year, hoje.month, calendar.monthrange(hoje.year, hoje.month)[1])
+
+                # Verificar se o mês atual está dentro do range dos dados
+                if primeiro_dia_mes >= min_date and ultimo_dia_mes <= max_date:
+                    # Usar mês atual como padrão
+                    periodo_padrao = [primeiro_dia_mes, ultimo_dia_mes]
+                else:
+                    # Usar último mês disponível como padrão
+                    if max_date.month == 1:
+                        ultimo_mes = date(max_date.year - 1, 12, 1)
+                    else:
+                        ultimo_mes = date(max_date.year, max_date.month - 1, 1)
+
+                    ultimo_dia_ultimo_mes = date(
+                        ultimo_mes.year,
+                        ultimo_mes.month,
+                        calendar.monthrange(ultimo_mes.year, ultimo_mes.month)[1]
+                    )
+
+                    periodo_padrao = [ultimo_mes, ultimo_dia_ultimo_mes]
+
+                # Usar período padrão, mas permitir alteração
+                date_range = st.sidebar.date_input(
+                    "📅 Período de análise",
+                    periodo_padrao,
+                    min_value=min_date,
+                    max_value=max_date,
+                    help="Período padrão baseado nos dados disponíveis. Clique para alterar se necessário."
+                )
+            else:
+                st.sidebar.info("📅 Datas de abertura inválidas ou ausentes. Filtro de período desativado.")
+                date_range = []
+        else:
+            st.sidebar.info("📅 Coluna de data não encontrada. Filtro de período desativado.")
+
+        # Filtro por técnico
+        tecnicos = ['Todos'] + df['Atribuído - Técnico'].cat.categories.tolist()
+        tecnico_selecionado = st.sidebar.selectbox("👨‍💻 Técnico", tecnicos)
+
+        # Filtro por status
+        status_options = ['Todos'] + df['Status'].cat.categories.tolist()
+        status_selecionado = st.sidebar.selectbox("📊 Status", status_options)
+
+        # Filtro por prioridade
+        prioridade_options = ['Todas'] + df['Prioridade'].cat.categories.tolist()
+        prioridade_selecionada = st.sidebar.selectbox("⚡ Prioridade", prioridade_options)
+
+        # Filtro por categoria
+        if 'Categoria Limpa' in df.columns:
+            categorias = ['Todas'] + df['Categoria Limpa'].cat.categories.tolist()
+            categoria_selecionada = st.sidebar.selectbox("🏷️ Categoria", categorias)
+
+        # Botão para limpar filtros interativos
+        if st.sidebar.button("🔄 Limpar Filtros Interativos"):
+            st.session_state.filtro_status = None
+            st.session_state.filtro_categoria = None
+            st.session_state.filtro_tecnico = None
+            st.session_state.filtro_prioridade = None
+            st.rerun()
+
+        # Aplicar filtros: sidebar e filtros interativos viram valores exigidos por dimensão
+        selecoes = [
+            ('Atribuído - Técnico', tecnico_selecionado if tecnico_selecionado != 'Todos' else None),
+            ('Status', status_selecionado if status_selecionado != 'Todos' else None),
+            ('Prioridade', prioridade_selecionada if prioridade_selecionada != 'Todas' else None),
+            ('Categoria Limpa', categoria_selecionada if 'Categoria Limpa' in df.columns and categoria_selecionada != 'Todas' else None),
+            ('Status', st.session_state.filtro_status),
+            ('Categoria Limpa', st.session_state.filtro_categoria),
+            ('Atribuído - Técnico', st.session_state.filtro_tecnico),
+            ('Prioridade', st.session_state.filtro_prioridade),
+        ]
+        filtros = {}
+        for coluna, valor in selecoes:
+            if valor is not None:
+                filtros.setdefault(coluna, []).append(valor)
+
+        periodo = tuple(date_range) if len(date_range) == 2 else None
 
-        st.dataframe(df_local_analise.head(30), height=400, use_container_width=True)
-    
-    # ====================================================================
-    # ABA 7: ANÁLISE DE PRIORIDADE
-    # ====================================================================
-    with tab7:
-        st.header("⚡ Análise por Prioridade")
-        
-        # Distribuição de prioridades
-        st.subheader("📊 Distribuição de Prioridades")
-        col_prior1, col_prior2 = st.columns(2)
-        
-        with col_prior1:
-            prior_counts = df_filtered['Prioridade'].value_counts().reset_index()
-            prior_counts.columns = ['Prioridade', 'Quantidade']
-            
-            fig_prior = px.pie(
-                prior_counts,
-                values='Quantidade',
-                names='Prioridade',
-                title="🥧 Distribuição por Prioridade",
-                color_discrete_sequence=px.colors.qualitative.Set2,
-                hole=0.4
-            )
-            fig_prior.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_prior, use_container_width=True)
-        
-        with col_prior2:
-            # Tempo de resposta por prioridade
-            df_prior_tempo = df_filtered.groupby('Prioridade')['Tempo Resolução (h)'].mean().reset_index()
-            df_prior_tempo.columns = ['Prioridade', 'Tempo Médio (h)']
-            
-            fig_prior_tempo = px.bar(
-                df_prior_tempo,
-                x='Prioridade',
-                y='Tempo Médio (h)',
-                title="⏰ Tempo Médio de Resposta por Prioridade",
-                color='Tempo Médio (h)',
-                color_continuous_scale='Oranges',
-                text='Tempo Médio (h)'
+        chave_filtros = _chave_filtros(df.attrs.get('hash'), periodo, filtros)
+        with medidor.etapa('filtros', linhas_entrada=len(df)) as registro:
+            visao = _cache_visoes().obter(
+                chave_filtros,
+                lambda: _criar_visao(chave_filtros, motor, cubo_olap, periodo, filtros)
             )
-            fig_prior_tempo.update_traces(textposition='outside', texttemplate='%{text:.1f}h')
-            st.plotly_chart(fig_prior_tempo, use_container_width=True)
-        
+            registro['linhas_saida'] = int(visao.cubo['Chamados'].sum())
+        medidor.contexto.update(dataset=df.attrs.get('hash'), periodo=periodo, filtros=filtros)
+
+    # Página principal
+    st.title("📊 Dashboard de Análise de Chamados Técnicos - HMSI")
+
+
+    # Verificar se os dados foram carregados
+    if df.empty:
+
+        st.error("⚠️ Nenhum dado encontrado! Verifique se o arquivo glpi.csv está na raiz do projeto.")
+        st.stop()
+
+    # Mostrar informações dos dados
+    periodo_txt = ""
+    if 'Data Abertura Datetime' in df.columns:
+        limites_datas = motor.limites_datas()
+        if limites_datas is not None:
+            min_date, max_date = limites_datas
+            periodo_txt = f" | **📅 Período:** {min_date.strftime('%d/%m/%Y')} a {max_date.strftime('%d/%m/%Y')}"
+        else:
+            periodo_txt = " | **📅 Período:** Dados de data ausentes/invalidos"
+
+    st.markdown(f"**📊 Total de registros:** {len(df):,} chamados{periodo_txt}")
+
+    st.link_button("📄 Baixar base de dados e importar no projeto", "https://drive.google.com/file/d/1iVUn2XvAvNz27TBHmDmE9ivZgUpnmALX/view?usp=sharing")
+
+    # Iniciar visualizações
+    if True:
+        # Métricas principais resumidas
         st.markdown("---")
-        
-        # Violações de SLA por prioridade
-        st.subheader("❌ Violações de SLA por Prioridade")
-        
-        df_viol = df_filtered[df_filtered['Status'].isin(['Fechado', 'Solucionado'])].copy()
-        df_viol['Violação SLA'] = df_viol['Tempo Resolução (h)'] > 8
-        
-        df_viol_prior = df_viol.groupby('Prioridade').agg({
-            'ID': 'count',
-            'Violação SLA': 'sum'
-        }).reset_index()
-        df_viol_prior['% Violação'] = (df_viol_prior['Violação SLA'] / df_viol_prior['ID']) * 100
-        df_viol_prior.columns = ['Prioridade', 'Total', 'Violações', '% Violação']
-        
-        fig_viol = px.bar(
-            df_viol_prior,
-            x='Prioridade',
-            y=['Total', 'Violações'],
-            title="📊 Violações de SLA por Prioridade",
-            barmode='group',
-            color_discrete_sequence=['#28a745', '#dc3545']
+        col1, col2, col3, col4 = st.columns(4)
+        with medidor.etapa('cabecalho', linhas_entrada=len(visao.cubo)):
+            resumo = visao.agregado('resumo', _resumo_cabecalho)
+            tecnicos = visao.agregado('tecnicos', _agregado_tecnicos)
+        with col1:
+            total_chamados = resumo['total']
+            st.metric("📞 Total de Chamados", f"{total_chamados:,}")
+        with col2:
+            tempo_medio = resumo['tempo_medio']
+            st.metric("⏱️ Tempo Médio (h)", f"{tempo_medio:.1f}" if not pd.isna(tempo_medio) else "N/A")
+        with col3:
+            dentro_sla = resumo['dentro_sla']
+            st.metric("✅ Dentro do SLA", f"{dentro_sla:.1f}%" if not pd.isna(dentro_sla) else "N/A")
+        with col4:
+            chamados_por_tecnico = resumo['total'] / len(tecnicos) if len(tecnicos) > 0 else 0
+            st.metric("👥 Chamados/Técnico", f"{chamados_por_tecnico:.1f}")
+
+
+        st.markdown("---")
+
+        # ABAS PRINCIPAIS DE ANÁLISE
+        # Só a seção selecionada é calculada e renderizada; as demais ficam para quando
+        # forem abertas (ou são pré-calculadas em segundo plano, se habilitado)
+        rotulo_ativo = st.radio(
+            "Seção de análise",
+            [rotulo for _, rotulo, _ in SECOES],
+            horizontal=True,
+            key='secao_ativa',
+            label_visibility='collapsed'
         )
-        st.plotly_chart(fig_viol, use_container_width=True)
-        
-        st.dataframe(df_viol_prior, use_container_width=True)
-    
-    # ====================================================================
-    # ABA 8: ANÁLISE DE STATUS
-    # ====================================================================
-    with tab8:
-        st.header("📈 Análise de Status e Fluxo")
-        
-        # Funil de conversão
-        st.subheader("📊 Funil de Conversão")
-        
-        status_flow = df_filtered['Status'].value_counts().reset_index()
-        status_flow.columns = ['Status', 'Quantidade']
-        
-        col_stat1, col_stat2 = st.columns(2)
-        
-        with col_stat1:
-            # Funil
-            fig_funil = px.funnel(
-                status_flow,
-                x='Quantidade',
-                y='Status',
-                title="📉 Funil: Status dos Chamados",
-                color='Status',
-                color_discrete_map={'Fechado': '#28a745', 'Solucionado': '#17a2b8', 'Pendente': '#ffc107'}
-            )
-            st.plotly_chart(fig_funil, use_container_width=True)
-        
-        with col_stat2:
-            # Evolução temporal do status
-            df_status_tempo = df_filtered.groupby([df_filtered['Data Abertura Datetime'].dt.to_period('M'), 'Status'])['ID'].count().reset_index()
-            df_status_tempo['Período'] = df_status_tempo['Data Abertura Datetime'].astype(str)
-            
-            fig_status_evolucao = px.line(
-                df_status_tempo,
-                x='Período',
-                y='ID',
-                color='Status',
-                title="📈 Evolução dos Status ao Longo do Tempo",
-                labels={'ID': 'Quantidade'},
-                markers=True
-            )
-            fig_status_evolucao.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig_status_evolucao, use_container_width=True)
-        
+        id_ativo = next(id_secao for id_secao, rotulo, _ in SECOES if rotulo == rotulo_ativo)
+
+        medidor.contexto['secao'] = id_ativo
+        with medidor.etapa(f'secao[{id_ativo}]', linhas_entrada=resumo['total']):
+            operacoes = _calcular_secao(visao, id_ativo)
+        with medidor.etapa(f'renderizar[{id_ativo}]'):
+            _reproduzir(operacoes)
+
+        if PRE_CALCULAR_SECOES:
+            _pre_calcular_secoes(visao, id_ativo)
+
         st.markdown("---")
-        
-        # Backlog
-        st.subheader("⏳ Análise de Backlog (Chamados Pendentes)")
-        
-        df_pendentes = df_filtered[df_filtered['Status'] == 'Pendente'].copy()
-        
-        if len(df_pendentes) > 0:
-            col_back1, col_back2 = st.columns(2)
-            
-            with col_back1:
-                st.metric("📋 Total de Pendentes", len(df_pendentes))
-                
-                # Tempo em aberto
-                hoje = pd.Timestamp.now()
-                df_pendentes['Dias em Aberto'] = (hoje - df_pendentes['Data Abertura Datetime']).dt.days
-                
-                fig_backlog = px.histogram(
-                    df_pendentes,
-                    x='Dias em Aberto',
-                    nbins=20,
-                    title="⏳ Distribuição do Backlog (Dias em Aberto)",
-                    color_discrete_sequence=['#ffc107']
-                )
-                st.plotly_chart(fig_backlog, use_container_width=True)
-            
-            with col_back2:
-                # Backlog por categoria
-                back_cat = df_pendentes['Categoria Limpa'].value_counts().head(10).reset_index()
-                back_cat.columns = ['Categoria', 'Pendentes']
-                
-                fig_back_cat = px.bar(
-                    back_cat,
-                    x='Pendentes',
-                    y='Categoria',
-                    title="📊 Backlog por Categoria",
-                    orientation='h',
-                    color='Pendentes',
-                    color_continuous_scale='Oranges',
-                    text='Pendentes'
-                )
-                fig_back_cat.update_traces(textposition='outside')
-                st.plotly_chart(fig_back_cat, use_container_width=True)
-            
-            # Chamados antigos pendentes
-            df_antigos = df_pendentes.nlargest(15, 'Dias em Aberto')[['ID', 'Título', 'Requerente - Requerente', 'Localização', 'Dias em Aberto']]
-            st.subheader("🚨 Chamados Mais Antigos Pendentes")
-            st.dataframe(df_antigos, use_container_width=True)
-        else:
-            st.success("✅ Não há chamados pendentes no momento!")
-    
-    # ====================================================================
-    # ABA 9: ANÁLISE PREDITIVA
-    # ====================================================================
-    with tab9:
-        st.header("🔮 Análise Preditiva e Tendências")
-        
-        # Previsão de demanda
-        st.subheader("📈 Previsão de Demanda")
-        
-        # Série temporal mensal
-        df_serie = df_filtered.groupby(df_filtered['Data Abertura Datetime'].dt.to_period('M'))['ID'].count().reset_index()
-        df_serie['Mês'] = df_serie['Data Abertura Datetime'].astype(str)
-        df_serie['Ordem'] = range(len(df_serie))
-        
-        col_pred1, col_pred2 = st.columns(2)
-        
-        with col_pred1:
-            # Tendência linear
-            if len(df_serie) >= 3:
-                z = np.polyfit(df_serie['Ordem'], df_serie['ID'], 1)
-                p = np.poly1d(z)
-                df_serie['Tendência'] = p(df_serie['Ordem'])
-                
-                # Projeção para próximos 3 meses
-                projecao_meses = 3
-                ordem_futura = range(len(df_serie), len(df_serie) + projecao_meses)
-                chamados_previstos = p(list(ordem_futura))
-                
-                fig_tend = go.Figure()
-                fig_tend.add_trace(go.Scatter(x=df_serie['Mês'], y=df_serie['ID'], 
-                                             mode='lines+markers', name='Real',
-                                             line=dict(color='#007bff', width=3)))
-                fig_tend.add_trace(go.Scatter(x=df_serie['Mês'], y=df_serie['Tendência'],
-                                             mode='lines', name='Tendência',
-                                             line=dict(color='red', dash='dash')))
-                fig_tend.update_layout(title="📈 Tendência e Histórico de Chamados",
-                                      xaxis_title="Período", yaxis_title="Chamados")
-                st.plotly_chart(fig_tend, use_container_width=True)
-                
-                # Métricas de previsão
-                media_projecao = np.mean(chamados_previstos)
-                st.metric("📊 Média Prevista (próximos 3 meses)", f"{media_projecao:.0f} chamados/mês")
-                
-                crescimento = ((df_serie['ID'].iloc[-1] - df_serie['ID'].iloc[0]) / df_serie['ID'].iloc[0]) * 100
-                st.metric("📈 Crescimento Total", f"{crescimento:.1f}%")
-        
-        with col_pred2:
-            # Necessidade de recursos
-            media_chamados_mes = df_serie['ID'].mean()
-            media_tempo_resolucao = df_filtered['Tempo Resolução (h)'].mean()
-            
-            # Cálculo de técnicos necessários (assumindo 160h/mês por técnico)
-            if pd.isna(media_chamados_mes) or pd.isna(media_tempo_resolucao):
-                horas_totais_mes = np.nan
-                tecnicos_necessarios = np.nan
-            else:
-                horas_totais_mes = media_chamados_mes * media_tempo_resolucao
-                tecnicos_necessarios = np.ceil(horas_totais_mes / 160)
-            tecnicos_atuais = df_filtered['Atribuído - Técnico'].nunique()
-            
-            st.subheader("🎯 Necessidade de Recursos")
-            c1, c2, c3, c4 = st.columns(4)
-            with c1:
-                st.metric("👥 Técnicos Atuais", f"{tecnicos_atuais}")
-            if pd.isna(tecnicos_necessarios):
-                with c2:
-                    st.metric("📊 Técnicos Sugeridos", "N/A")
-                with c3:
-                    st.metric("⏱️ Horas/Mês Estimadas", "N/A")
-                with c4:
-                    st.metric("📞 Média Chamados/Mês", f"{media_chamados_mes:.0f}" if not pd.isna(media_chamados_mes) else "N/A")
-            else:
-                with c2:
-                    st.metric("📊 Técnicos Sugeridos", f"{int(tecnicos_necessarios)}", 
-                         delta=f"{int(tecnicos_necessarios - tecnicos_atuais)}")
-                with c3:
-                    st.metric("⏱️ Horas/Mês Estimadas", f"{horas_totais_mes:.0f}h")
-                with c4:
-                    st.metric("📞 Média Chamados/Mês", f"{media_chamados_mes:.0f}")
-            
-            # Gráfico de capacidade
-            if not pd.isna(tecnicos_necessarios) and not pd.isna(media_chamados_mes):
-                fig_capacidade = go.Figure()
-                fig_capacidade.add_trace(go.Bar(
-                    x=['Capacidade Atual', 'Demanda Real', 'Capacidade Ideal'],
-                    y=[tecnicos_atuais * 20, media_chamados_mes, tecnicos_necessarios * 20],
-                    marker_color=['#28a745', '#ffc107', '#007bff'],
-                    text=[f"{tecnicos_atuais * 20:.0f}", f"{media_chamados_mes:.0f}", f"{tecnicos_necessarios * 20:.0f}"],
-                    textposition='outside'
-                ))
-                fig_capacidade.update_layout(
-                    title="📊 Análise de Capacidade (Chamados/Mês)",
-                    yaxis_title="Chamados"
+
+        # Tabela geral de dados
+        st.subheader("📋 Dados Detalhados dos Chamados")
+        if resumo['total'] > 0:
+
+            # Selecionar colunas relevantes
+            colunas_exibicao = ['ID', 'Título', 'Status', 'Prioridade', 'Categoria Limpa', 
+
+                               'Atribuído - Técnico', 'Data Abertura', 'Hora Abertura', 
+                               'Data Atualização', 'Tempo Resolução (h)', 'Localização']
+            colunas_disponiveis = [col for col in colunas_exibicao if col in df.columns]
+
+
+            col_tab1, col_tab2, col_tab3, col_tab4 = st.columns([3, 2, 1, 1])
+            with col_tab1:
+                busca = st.text_input("🔎 Buscar por ID ou título", key='tabela_busca')
+            with col_tab2:
+                coluna_ordem = st.selectbox(
+                    "Ordenar por", colunas_disponiveis, key='tabela_ordem',
+                    index=colunas_disponiveis.index('Data Abertura') if 'Data Abertura' in colunas_disponiveis else 0
                 )
-                st.plotly_chart(fig_capacidade, use_container_width=True)
+            with col_tab3:
+                decrescente = st.toggle("Decrescente", value=True, key='tabela_decrescente')
+            with col_tab4:
+                tamanho_pagina = st.selectbox("Por página", TAMANHOS_PAGINA, index=TAMANHOS_PAGINA.index(100), key='tabela_tamanho')
+
+            with medidor.etapa('tabela', linhas_entrada=resumo['total']) as registro:
+                chave_ordem = CHAVES_ORDENACAO.get(coluna_ordem, coluna_ordem)
+                if chave_ordem not in df.columns:
+                    chave_ordem = coluna_ordem
+                posicoes = _buscar_chamados(motor, _posicoes_ordenadas(visao, motor, chave_ordem, not decrescente), busca)
+
+                total_paginas = max(1, -(-len(posicoes) // tamanho_pagina))
+                if st.session_state.get('tabela_pagina', 1) > total_paginas:
+                    st.session_state.tabela_pagina = 1
+                pagina = st.number_input(f"Página (de {total_paginas})", min_value=1, max_value=total_paginas, step=1, key='tabela_pagina')
+                inicio = (pagina - 1) * tamanho_pagina
+                # Só as linhas da página são copiadas do dataset
+                df_exibicao = motor.materializar(posicoes[inicio:inicio + tamanho_pagina], colunas_disponiveis)
+
+                st.dataframe(df_exibicao, height=400, use_container_width=True)
+                registro['linhas_saida'] = len(df_exibicao)
+            if len(posicoes) > 0:
+                st.caption(f"Exibindo {inicio + 1:,} a {inicio + len(df_exibicao):,} de {len(posicoes):,} chamados")
             else:
-                st.info("🔎 Sem dados suficientes para o gráfico de capacidade.")
-        
-        st.markdown("---")
-        
-        # Tendências futuras por categoria
-        st.subheader("📉 Tendências Futuras por Categoria")
-        
-        top_5_cat = df_filtered['Categoria Limpa'].value_counts().head(5).index.tolist()
-        df_cat_tempo = df_filtered[df_filtered['Categoria Limpa'].isin(top_5_cat)]
-        
-        df_cat_serie = df_cat_tempo.groupby([
-            df_cat_tempo['Data Abertura Datetime'].dt.to_period('M'),
-            'Categoria Limpa'
-        ])['ID'].count().reset_index()
-        df_cat_serie['Período'] = df_cat_serie['Data Abertura Datetime'].astype(str)
-        
-        fig_cat_tend = px.line(
-            df_cat_serie,
-            x='Período',
-            y='ID',
-            color='Categoria Limpa',
-            title="📈 Evolução das Top 5 Categorias",
-            labels={'ID': 'Número de Chamados'},
-            markers=True
+                st.caption("Nenhum chamado corresponde à busca")
+        else:
+            st.info("Nenhum chamado encontrado com os filtros aplicados.")
+
+    # Rodapé
+    st.markdown("---")
+    st.markdown("**Dashboard desenvolvido Pedro Henrique (Analista de Sistema Pleno)** | Última atualização: " + datetime.now().strftime("%d/%m/%Y %H:%M"))
+
+    st.markdown("**Fonte:** Sistema de Chamados Técnicos HMSI")
+
+
+# ====================================================================
+# RELATÓRIO SEM INTERFACE
+# As mesmas seções do dashboard, executadas fora do Streamlit (ex.: agendadas no cron):
+#   python -m dashboard_chamados report --input glpi.csv --out relatorios/
+# Cada seção roda num processo do pool e grava em <out>/<seção>/ as tabelas (Parquet),
+# as métricas (JSON) e as figuras (HTML estático + spec JSON do Plotly).
+# ====================================================================
+PROCESSOS_RELATORIO = int(os.getenv("GLPI_PROCESSOS_RELATORIO", str(min(len(SECOES), os.cpu_count() or 1))))
+
+# Recorte usado pelas seções no processo atual (montado uma vez por processo do pool)
+_visao_relatorio = None
+# O recorte só referencia o motor fracamente; no relatório é o processo que o mantém vivo
+_motor_relatorio = None
+
+
+def _montar_visao_relatorio(df, periodo, filtros):
+    global _motor_relatorio
+    _motor_relatorio = MotorFiltros(df)
+    return _criar_visao(
+        _chave_filtros(df.attrs['hash'], periodo, filtros),
+        _motor_relatorio,
+        CuboOLAP(df),
+        periodo,
+        filtros
+    )
+
+
+def _iniciar_processo_relatorio(entrada, conteudo_hash, periodo, filtros):
+    """
+    Inicializador dos processos do pool: lê o dataset (do cache em disco, já gravado
+    pelo processo principal) e monta o recorte do relatório
+    """
+    global _visao_relatorio
+    df = _carregar_dataset(entrada, conteudo_hash)
+    _visao_relatorio = _montar_visao_relatorio(df, periodo, filtros)
+
+
+def _valor_json(valor):
+    return valor.item() if isinstance(valor, np.generic) else str(valor)
+
+
+def _gravar_tabela(dados, caminho):
+    """
+    Grava uma tabela em Parquet; tabelas que o Arrow não aceita (ex.: colunas de tipos
+    mistos) vão para JSON. Devolve o nome do arquivo gravado
+    """
+    if isinstance(dados, pd.Series):
+        dados = dados.to_frame()
+    try:
+        dados.to_parquet(f"{caminho}.parquet")
+        return os.path.basename(f"{caminho}.parquet")
+    except Exception:
+        dados.to_json(f"{caminho}.json", orient='split', date_format='iso', force_ascii=False)
+        return os.path.basename(f"{caminho}.json")
+
+
+def _exportar_operacoes(operacoes, pasta):
+    """
+    Grava os artefatos das chamadas de UI registradas por uma seção e devolve o índice,
+    com cada item associado ao último cabeçalho exibido antes dele
+    """
+    indice = {'metricas': [], 'tabelas': [], 'figuras': []}
+    titulo = None
+
+    def percorrer(operacoes):
+        nonlocal titulo
+        for nome, args, kwargs, filhos in operacoes:
+            if nome == 'columns':
+                for operacoes_coluna in filhos:
+                    percorrer(operacoes_coluna)
+            elif nome in ('header', 'subheader'):
+                titulo = args[0]
+            elif nome == 'metric':
+                indice['metricas'].append({
+                    'titulo': titulo,
+                    'rotulo': args[0],
+                    'valor': args[1] if len(args) > 1 else kwargs.get('value'),
+                    'delta': args[2] if len(args) > 2 else kwargs.get('delta'),
+                })
+            elif nome == 'dataframe':
+                arquivo = _gravar_tabela(args[0], os.path.join(pasta, f"tabela_{len(indice['tabelas']) + 1:02d}"))
+                indice['tabelas'].append({'titulo': titulo, 'arquivo': arquivo})
+            elif nome == 'plotly_chart':
+                figura = args[0]
+                base = f"figura_{len(indice['figuras']) + 1:02d}"
+                with open(os.path.join(pasta, f"{base}.json"), 'w', encoding='utf-8') as f:
+                    f.write(figura.spec)
+                # write_html aceita o dicionário do spec; com validate=False não reconstrói a figura
+                spec = figura.dicionario()
+                pio.write_html(spec, os.path.join(pasta, f"{base}.html"), include_plotlyjs='cdn', validate=False)
+                titulo_figura = spec.get('layout', {}).get('title', {}).get('text')
+                indice['figuras'].append({'titulo': titulo_figura or titulo, 'arquivo': f"{base}.html", 'spec': f"{base}.json"})
+
+    percorrer(operacoes)
+    with open(os.path.join(pasta, 'metricas.json'), 'w', encoding='utf-8') as f:
+        json.dump(indice['metricas'], f, ensure_ascii=False, indent=2, default=_valor_json)
+    return indice
+
+
+def _gerar_secao_relatorio(id_secao, destino):
+    """
+    Executa uma seção sobre o recorte do processo e grava seus artefatos em <destino>/<seção>/
+    """
+    inicio = time.perf_counter()
+    ui = _Gravador()
+    SECOES_POR_ID[id_secao](_visao_relatorio, ui)
+
+    pasta = os.path.join(destino, id_secao)
+    os.makedirs(pasta, exist_ok=True)
+    indice = _exportar_operacoes(ui.operacoes, pasta)
+    indice['segundos'] = round(time.perf_counter() - inicio, 3)
+    return id_secao, indice
+
+
+def gerar_relatorio(entrada, destino, periodo=None, filtros=None, processos=PROCESSOS_RELATORIO):
+    """
+    Gera o relatório de todas as seções para o CSV `entrada` em `destino`, com os mesmos
+    critérios de período e filtros do dashboard. Além das pastas das seções, grava o
+    resumo do cabeçalho, as células do cubo e a tabela por técnico, e o índice
+    relatorio.json. Devolve o índice
+    """
+    global _visao_relatorio
+    conteudo_hash = _hash_arquivo(entrada)
+    # Processa (ou lê do cache) uma vez aqui: os processos do pool leem o cache em disco
+    df = _carregar_dataset(entrada, conteudo_hash)
+    visao = _montar_visao_relatorio(df, periodo, filtros)
+
+    os.makedirs(destino, exist_ok=True)
+    resumo = _resumo_cabecalho(visao)
+    tecnicos = _agregado_tecnicos(visao)
+    resumo['chamados_por_tecnico'] = resumo['total'] / len(tecnicos) if len(tecnicos) > 0 else 0
+    visao.cubo.to_parquet(os.path.join(destino, 'cubo.parquet'), index=False)
+    tecnicos.to_parquet(os.path.join(destino, 'tecnicos.parquet'))
+
+    ids = [id_secao for id_secao, _, _ in SECOES]
+    if processos <= 1:
+        _visao_relatorio = visao
+        secoes = dict(_gerar_secao_relatorio(id_secao, destino) for id_secao in ids)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(processos, len(ids)),
+            initializer=_iniciar_processo_relatorio,
+            initargs=(entrada, conteudo_hash, periodo, filtros)
+        ) as pool:
+            secoes = dict(pool.map(_gerar_secao_relatorio, ids, [destino] * len(ids)))
+
+    indice = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'entrada': os.path.abspath(entrada),
+        'dataset': df.attrs['hash'],
+        'registros': len(df),
+        'periodo': [d.isoformat() for d in periodo] if periodo else None,
+        'filtros': filtros or {},
+        'resumo': resumo,
+        'secoes': secoes,
+    }
+    with open(os.path.join(destino, 'relatorio.json'), 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2, default=_valor_json)
+    return indice
+
+
+# ====================================================================
+# DADOS SINTÉTICOS E BENCHMARK
+# `gerar` produz exportações do GLPI com as mesmas colunas e distribuições parecidas
+# com as reais; `benchmark` mede separadamente ingestão, filtros e cada seção e grava
+# o resultado em JSON, para comparar execuções ao longo do tempo:
+#   python -m dashboard_chamados gerar --linhas 1M --out glpi_1m.csv
+#   python -m dashboard_chamados benchmark --linhas 10k 100k 1M --out bench.json
+# ====================================================================
+TECNICOS_SINTETICOS = {
+    'Ana Paula': 18, 'Bruno Costa': 16, 'Carlos Eduardo': 14, 'Diego Santos': 12,
+    'Fernanda Lima': 10, 'Gabriel Souza': 8, 'João Pedro': 8, 'Marcos Vinícius': 6,
+    'Rafael Alves': 5, 'Tiago Ferreira': 3,
+}
+# Categorias com o prefixo do GLPI; a categoria raiz vira 'OUTROS' na Categoria Limpa
+CATEGORIAS_SINTETICAS = {
+    'SETOR DE INFORMATICA > IMPRESSORA': ('Impressora', 22),
+    'SETOR DE INFORMATICA > RESET DE SENHA SPDATA': ('Reset de senha SPDATA', 18),
+    'SETOR DE INFORMATICA > COMPUTADOR': ('Computador', 14),
+    'SETOR DE INFORMATICA > TONNER': ('Troca de tonner', 10),
+    'SETOR DE INFORMATICA > REDE': ('Sem acesso à rede', 8),
+    'SETOR DE INFORMATICA > INTERNET': ('Internet lenta', 6),
+    'SETOR DE INFORMATICA > SPDATA': ('Erro no SPDATA', 6),
+    'SETOR DE INFORMATICA > MONITOR': ('Monitor', 4),
+    'SETOR DE INFORMATICA > TECLADO': ('Teclado', 3),
+    'SETOR DE INFORMATICA > MOUSE': ('Mouse', 3),
+    'SETOR DE INFORMATICA': ('Solicitação', 6),
+}
+LOCAIS_SINTETICOS = {
+    'PRONTO SOCORRO': 14, 'UTI ADULTO': 9, 'UTI NEONATAL': 5, 'CENTRO CIRURGICO': 8,
+    'FARMACIA': 7, 'RECEPCAO CENTRAL': 7, 'LABORATORIO': 6, 'RADIOLOGIA': 5,
+    'FATURAMENTO': 6, 'ALMOXARIFADO': 3, 'POSTO DE ENFERMAGEM 1': 5, 'POSTO DE ENFERMAGEM 2': 5,
+    'MATERNIDADE': 4, 'PEDIATRIA': 4, 'AMBULATORIO': 5, 'DIRETORIA': 2,
+    'RH': 2, 'NUTRICAO': 2, 'CME': 2, 'SAME': 3,
+}
+STATUS_SINTETICOS = {'Fechado': 55, 'Solucionado': 25, 'Pendente': 8, 'Processando (atribuído)': 9, 'Novo': 3}
+PRIORIDADES_SINTETICAS = {'Muito baixa': 5, 'Baixa': 20, 'Média': 50, 'Alta': 20, 'Muito alta': 5}
+DETALHES_SINTETICOS = ['', ' não funciona', ' com defeito', ' urgente', ' - setor parado', ' travando', ' - verificar']
+# Complementos com número sorteado até o limite (patrimônio, sala, ramal...): os títulos reais
+# quase não se repetem. O primeiro (vazio) deixa o título curto
+COMPLEMENTOS_SINTETICOS = {
+    '': 1, ' - patrimônio ': 60_000, ' na sala ': 400, ' ramal ': 9_999,
+    ' estação HMSI-': 2_000, ' leito ': 300, ' - chamado anterior #': 500_000,
+}
+# Fração de chamados reabertos logo depois com o título de um chamado recente (quase duplicados)
+FRACAO_REABERTOS_SINTETICOS = 0.03
+TAMANHOS_BENCHMARK = ['10k', '100k', '1M', '5M']
+
+
+def _linhas(texto):
+    """
+    Quantidade de linhas aceitando sufixos: '10k' -> 10000, '1M' -> 1000000
+    """
+    multiplicadores = {'k': 1_000, 'm': 1_000_000}
+    texto = str(texto).strip()
+    if texto[-1:].lower() in multiplicadores:
+        return int(float(texto[:-1]) * multiplicadores[texto[-1].lower()])
+    return int(texto)
+
+
+def _sortear(gerador, pesos, tamanho):
+    valores = np.array(list(pesos.keys()), dtype=object)
+    probabilidades = np.array(list(pesos.values()), dtype=float)
+    return valores[gerador.choice(len(valores), size=tamanho, p=probabilidades / probabilidades.sum())]
+
+
+def gerar_glpi_sintetico(caminho, linhas, semente=42, fim=None, dias=730, requerentes=2000):
+    """
+    Grava em `caminho` uma exportação sintética do GLPI (';', UTF-8 com BOM, datas dia/mês/ano)
+    com `linhas` chamados abertos nos `dias` anteriores a `fim`. Aberturas concentradas em dias
+    úteis e horário comercial, técnicos/categorias/locais com pesos desiguais, requerentes com
+    cauda longa e tempos de resolução log-normais. A mesma semente gera o mesmo arquivo.
+    Gerado em lotes de TAMANHO_LOTE linhas, então a memória não cresce com o tamanho
+    """
+    gerador = np.random.default_rng(semente)
+    fim = pd.Timestamp(fim or date.today()).normalize()
+    inicio = fim - pd.Timedelta(days=dias)
+
+    # Perfil de abertura: peso por dia (dias úteis ~4x fim de semana) e por hora (pico 8h-17h)
+    calendario = pd.date_range(inicio, fim - pd.Timedelta(days=1), freq='D')
+    peso_dia = np.where(calendario.dayofweek < 5, 4.0, 1.0)
+    peso_hora = np.array([1, 1, 1, 1, 1, 2, 3, 6, 10, 12, 12, 11, 8, 10, 12, 11, 10, 8, 5, 4, 3, 2, 2, 1], dtype=float)
+    # Requerentes em cauda longa (Zipf): poucos abrem muitos chamados
+    peso_requerente = 1 / np.arange(1, requerentes + 1) ** 1.1
+
+    titulos = {categoria: titulo for categoria, (titulo, _) in CATEGORIAS_SINTETICAS.items()}
+    pesos_categoria = {categoria: peso for categoria, (_, peso) in CATEGORIAS_SINTETICAS.items()}
+    nomes_requerentes = np.array([f"usuario.{i}" for i in range(1, requerentes + 1)], dtype=object)
+
+    # Aberturas geradas de uma vez (minutos desde o início, 4 bytes por linha) e ordenadas:
+    # os IDs crescem com a data, como no GLPI
+    minutos = gerador.choice(len(calendario), size=linhas, p=peso_dia / peso_dia.sum()).astype(np.int32) * 1440
+    minutos += (gerador.choice(24, size=linhas, p=peso_hora / peso_hora.sum()) * 60).astype(np.int32)
+    minutos += gerador.integers(0, 60, size=linhas, dtype=np.int32)
+    minutos.sort()
+
+    # Datas formatadas por tabela: cada dia e cada horário do dia viram texto uma única vez
+    # (strftime linha a linha dominaria o tempo de geração)
+    textos_hora = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(1440)], dtype=object)
+    textos_dia = {}
+
+    def formatar(minutos_lote):
+        dia, minuto_do_dia = np.divmod(minutos_lote, 1440)
+        if dia.max() >= len(textos_dia.get('dias', ())):
+            datas = inicio + pd.to_timedelta(np.arange(dia.max() + 1), unit='D')
+            textos_dia['dias'] = datas.strftime('%d/%m/%Y ').to_numpy(dtype=object)
+        return textos_dia['dias'][dia] + textos_hora[minuto_do_dia]
+
+    colunas = [
+        'ID', 'Título', 'Status', 'Prioridade', 'Categoria', 'Atribuído - Técnico',
+        'Requerente - Requerente', 'Localização', 'Data Abertura', 'Hora Abertura',
+        'Data Atualização', 'Data SLA',
+    ]
+    with open(caminho, 'w', encoding='utf-8-sig', newline='') as arquivo:
+        arquivo.write(';'.join(colunas) + '\n')
+        for inicio_lote in range(0, linhas, TAMANHO_LOTE):
+            n = min(TAMANHO_LOTE, linhas - inicio_lote)
+            abertura = minutos[inicio_lote:inicio_lote + n].astype(np.int64)
+            categoria = _sortear(gerador, pesos_categoria, n)
+            status = _sortear(gerador, STATUS_SINTETICOS, n)
+
+            # Resolução log-normal (mediana ~6h, cauda de dias); chamados em aberto têm só atualizações parciais
+            horas = gerador.lognormal(mean=np.log(6), sigma=1.2, size=n)
+            em_aberto = np.isin(status, ['Pendente', 'Processando (atribuído)', 'Novo'])
+            horas[em_aberto] *= gerador.uniform(0.05, 0.5, size=int(em_aberto.sum()))
+            atualizacao = abertura + np.round(horas * 60).astype(np.int64)
+
+            # Títulos: texto base da categoria + detalhe + complemento numerado; alguns bem curtos,
+            # como os reais, e uma parte repete com pequena variação o título de um chamado recente
+            detalhe = np.array(DETALHES_SINTETICOS, dtype=object)[gerador.integers(0, len(DETALHES_SINTETICOS), size=n)]
+            prefixo = gerador.integers(0, len(COMPLEMENTOS_SINTETICOS), size=n)
+            limite = np.array(list(COMPLEMENTOS_SINTETICOS.values()))[prefixo]
+            numero = (gerador.random(n) * limite).astype(np.int64) + 1
+            complemento = np.where(
+                prefixo == 0, '',
+                np.array(list(COMPLEMENTOS_SINTETICOS), dtype=object)[prefixo] + numero.astype(str).astype(object)
+            )
+            titulo = pd.Series(categoria).map(titulos).to_numpy(dtype=object) + detalhe + complemento
+            reaberto = gerador.random(n) < FRACAO_REABERTOS_SINTETICOS
+            origem = np.maximum(np.arange(n) - gerador.integers(1, 50, size=n), 0)[reaberto]
+            variacao = np.array(['', ' (reaberto)', ' novamente', '!'], dtype=object)[gerador.integers(0, 4, size=len(origem))]
+            titulo[reaberto] = titulo[origem] + variacao
+
+            campos = [
+                np.arange(inicio_lote + 1, inicio_lote + n + 1).astype(str).astype(object),
+                titulo,
+                status,
+                _sortear(gerador, PRIORIDADES_SINTETICAS, n),
+                categoria,
+                _sortear(gerador, TECNICOS_SINTETICOS, n),
+                nomes_requerentes[gerador.choice(requerentes, size=n, p=peso_requerente / peso_requerente.sum())],
+                _sortear(gerador, LOCAIS_SINTETICOS, n),
+                formatar(abertura),
+                textos_hora[abertura % 1440],
+                formatar(atualizacao),
+                formatar(abertura + SLA_HORAS * 60),
+            ]
+            # Os valores gerados não têm ';', aspas nem quebras de linha: dispensam o escape do to_csv
+            linhas_lote = campos[0]
+            for campo in campos[1:]:
+                linhas_lote = linhas_lote + ';' + campo
+            arquivo.write('\n'.join(linhas_lote) + '\n')
+    return caminho
+
+
+def _cronometrar(funcao, repeticoes, preparar=None):
+    """
+    Executa `funcao` `repeticoes` vezes (chamando `preparar` antes de cada uma, fora da
+    medição) e devolve os tempos em segundos e o último resultado
+    """
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        'min': round(min(tempos), 6),
+        'mediana': round(statistics.median(tempos), 6),
+        'execucoes': [round(t, 6) for t in tempos],
+    }, resultado
+
+
+def _cenarios_benchmark(df, motor):
+    """
+    Combinações de filtros medidas: sem filtros, o período padrão do dashboard
+    (último mês com dados), o técnico com mais chamados e técnico + status
+    """
+    tecnico = df['Atribuído - Técnico'].value_counts().index[0]
+    cenarios = {
+        'sem_filtros': (None, {}),
+        'tecnico': (None, {'Atribuído - Técnico': [tecnico]}),
+        'tecnico_status': (None, {'Atribuído - Técnico': [tecnico], 'Status': ['Fechado']}),
+    }
+    limites_datas = motor.limites_datas()
+    if limites_datas is not None:
+        ultimo_dia = limites_datas[1]
+        cenarios['ultimo_mes'] = ((date(ultimo_dia.year, ultimo_dia.month, 1), ultimo_dia), {})
+    return cenarios
+
+
+def executar_benchmark(entrada, repeticoes=3):
+    """
+    Mede, sobre o CSV `entrada`: ingestão sem cache e leitura do cache em disco (load_data),
+    construção do motor de filtros, do cubo e das estruturas por dataset das seções
+    (cubo de backlog, retrabalho, detector de duplicados, previsões), cada cenário de filtros (recorte e
+    materialização das linhas), os agregados do cabeçalho e cada seção.
+    O cache em disco usado é temporário, então o do dashboard não é lido nem alterado
+    """
+    global CACHE_DIR
+    cache_original = CACHE_DIR
+    CACHE_DIR = tempfile.mkdtemp(prefix='glpi-bench-')
+    try:
+        medicoes = {}
+        medicoes['hash_arquivo'], conteudo_hash = _cronometrar(lambda: _hash_arquivo(entrada), repeticoes)
+        chave = f"v{VERSAO_DATASET}-{conteudo_hash}"
+
+        def remover_cache():
+            if os.path.exists(_caminho_cache(chave)):
+                os.remove(_caminho_cache(chave))
+
+        medicoes['carregar_csv'], df = _cronometrar(
+            lambda: _carregar_dataset(entrada, conteudo_hash), repeticoes, preparar=remover_cache
         )
-        fig_cat_tend.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig_cat_tend, use_container_width=True)
-    
-    # ====================================================================
-    # ABA 10: ANÁLISE DE QUALIDADE
-    # ====================================================================
-    with tab10:
-        st.header("✅ Análise de Qualidade dos Chamados")
-
-        # Primeira resolução (esquerda) | Qualidade da descrição (direita)
-        col_qual1, col_qual2 = st.columns(2)
-
-        with col_qual1:
-            st.subheader("🎯 Taxa de Primeira Resolução")
-            df_retrabalho = df_filtered.sort_values('Data Abertura Datetime')
-            df_retrabalho['Possível Retrabalho'] = df_retrabalho.duplicated(
-                subset=['Requerente - Requerente', 'Categoria Limpa'], keep=False
+        medicoes['carregar_cache'], df = _cronometrar(lambda: _carregar_dataset(entrada, conteudo_hash), repeticoes)
+
+        medicoes['motor_filtros'], motor = _cronometrar(lambda: MotorFiltros(df), repeticoes)
+        medicoes['cubo_olap'], cubo = _cronometrar(lambda: CuboOLAP(df), repeticoes)
+
+        # Estruturas por dataset que as seções consultam (cache_resource): medidas à parte,
+        # limpando o cache antes de cada execução
+        estruturas_dataset = {
+            'cubo_backlog': (_cubo_backlog, lambda: _cubo_backlog(df.attrs.get('hash'), df)),
+            'retrabalho': (_retrabalho_dataset, lambda: _retrabalho_dataset(df.attrs.get('hash'), df)),
+            'detector_duplicados': (_detector_duplicados, lambda: _detector_duplicados(df.attrs.get('hash'), df['Título'])),
+            'previsoes': (_previsoes_dataset, lambda: _previsoes_dataset(df.attrs.get('hash'), (), df)),
+        }
+        for nome, (funcao_cache, construir) in estruturas_dataset.items():
+            medicoes[nome], _ = _cronometrar(construir, repeticoes, preparar=funcao_cache.clear)
+
+        def limpar_estruturas_dataset():
+            for funcao_cache, _ in estruturas_dataset.values():
+                funcao_cache.clear()
+
+        visoes = {}
+        for nome, (periodo, filtros) in _cenarios_benchmark(df, motor).items():
+            chave_filtros = _chave_filtros(chave, periodo, filtros)
+            medicoes[f'filtrar[{nome}]'], visoes[nome] = _cronometrar(
+                lambda: _criar_visao(chave_filtros, motor, cubo, periodo, filtros), repeticoes
             )
-            retrabalho_count = int(df_retrabalho['Possível Retrabalho'].sum())
-            taxa_primeira_resolucao = (
-                ((len(df_filtered) - retrabalho_count) / len(df_filtered)) * 100
-                if len(df_filtered) > 0 else 0
+            # Uma visão nova por execução: a materialização é guardada na visão
+            medicoes[f'materializar[{nome}]'], _ = _cronometrar(
+                lambda: _criar_visao(chave_filtros, motor, cubo, periodo, filtros).df, repeticoes
             )
 
-            m1, m2 = st.columns(2)
-            with m1:
-                st.metric("✅ Primeira Resolução", f"{taxa_primeira_resolucao:.1f}%")
-            with m2:
-                st.metric("🔄 Possível Retrabalho", f"{retrabalho_count}")
-
-            fig_retrab = go.Figure(data=[
-                go.Pie(
-                    labels=['Primeira Resolução', 'Possível Retrabalho'],
-                    values=[len(df_filtered) - retrabalho_count, retrabalho_count],
-                    marker=dict(colors=['#28a745', '#dc3545']),
-                    hole=0.4
-                )
-            ])
-            fig_retrab.update_layout(title="🎯 Taxa de Primeira Resolução")
-            st.plotly_chart(fig_retrab, use_container_width=True)
-
-        with col_qual2:
-            st.subheader("✍️ Qualidade das Descrições")
-            df_filtered['Tamanho Título'] = df_filtered['Título'].str.len()
-            df_filtered['Qualidade Desc'] = df_filtered['Tamanho Título'].apply(
-                lambda x: 'Boa (>20 chars)' if x > 20 else 'Ruim (≤20 chars)' if pd.notna(x) else 'N/A'
-            )
-            qual_desc = df_filtered['Qualidade Desc'].value_counts().reset_index()
-            qual_desc.columns = ['Qualidade', 'Quantidade']
+        # Agregados e seções sobre o recorte completo, com visão nova a cada execução
+        # (sem reaproveitar agregados entre medições nem entre seções). As estruturas por
+        # dataset são limpas antes de cada execução das seções, então o tempo da seção
+        # inclui construí-las, como na primeira abertura do dataset no dashboard
+        chave_completa = _chave_filtros(chave, None, {})
 
-            fig_qual = px.pie(
-                qual_desc,
-                values='Quantidade',
-                names='Qualidade',
-                title="✍️ Qualidade das Descrições",
-                color_discrete_sequence=['#28a745', '#dc3545', '#6c757d'],
-                hole=0.4
-            )
-            fig_qual.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_qual, use_container_width=True)
+        def nova_visao():
+            return _criar_visao(chave_completa, motor, cubo, None, {})
 
-            pct_boa = (
-                qual_desc[qual_desc['Qualidade'] == 'Boa (>20 chars)']['Quantidade'].sum() / len(df_filtered) * 100
-                if len(df_filtered) > 0 else 0
+        def cabecalho():
+            visao = nova_visao()
+            return _resumo_cabecalho(visao), visao.agregado('tecnicos', _agregado_tecnicos)
+
+        medicoes['cabecalho'], _ = _cronometrar(cabecalho, repeticoes)
+        for id_secao, _, funcao in SECOES:
+            medicoes[f'secao[{id_secao}]'], _ = _cronometrar(
+                lambda: funcao(nova_visao(), _Gravador()), repeticoes, preparar=limpar_estruturas_dataset
             )
-            st.metric("✅ Descrições Detalhadas", f"{pct_boa:.1f}%")
 
-        st.markdown("---")
+        return {
+            'entrada': os.path.abspath(entrada),
+            'linhas': len(df),
+            'bytes_csv': os.path.getsize(entrada),
+            'memoria_mb': round(df.memory_usage(deep=True).sum() / 1024 / 1024, 1),
+            'medicoes': medicoes,
+        }
+    finally:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        CACHE_DIR = cache_original
 
-        # Duplicados
-        st.subheader("🔄 Análise de Chamados Duplicados")
-        df_dup = df_filtered.groupby(['Título', 'Localização']).agg({
-            'ID': 'count',
-            'Categoria Limpa': 'first'
-        }).reset_index()
-        df_dup = df_dup[df_dup['ID'] > 1].sort_values('ID', ascending=False).head(20)
-        df_dup.columns = ['Título', 'Localização', 'Repetições', 'Categoria']
-
-        if len(df_dup) > 0:
-            fig_dup = px.bar(
-                df_dup,
-                x='Repetições',
-                y='Título',
-                title="🔄 Top 20 Problemas Duplicados (Mesmo Título + Local)",
-                orientation='h',
-                color='Repetições',
-                color_continuous_scale='Reds',
-                text='Repetições',
-                hover_data=['Localização', 'Categoria']
-            )
-            fig_dup.update_traces(textposition='outside')
-            st.plotly_chart(fig_dup, use_container_width=True)
-            st.dataframe(df_dup, use_container_width=True)
-        else:
-            st.success("✅ Nenhum chamado duplicado identificado!")
-    
-    # ====================================================================
-    # ABA 11: MÉTRICAS ESPECÍFICAS DO SISTEMA
-    # ====================================================================
-    with tab11:
-        st.header("🖨️ Métricas Específicas por Tipo de Problema")
-        
-        # Incidentes de impressora
-        st.subheader("🖨️ Análise de Incidentes de Impressora")
-        col_esp1, col_esp2 = st.columns(2)
-        
-        with col_esp1:
-            df_impressora = df_filtered[df_filtered['Categoria Limpa'].str.contains('IMPRESSORA', case=False, na=False)]
-            
-            if len(df_impressora) > 0:
-                local_impressora = df_impressora['Localização'].value_counts().head(15).reset_index()
-                local_impressora.columns = ['Localização', 'Incidentes']
-                
-                fig_imp = px.bar(
-                    local_impressora,
-                    x='Incidentes',
-                    y='Localização',
-                    title="🖨️ Top 15 Locais com Problemas de Impressora",
-                    orientation='h',
-                    color='Incidentes',
-                    color_continuous_scale='Reds',
-                    text='Incidentes'
-                )
-                fig_imp.update_traces(textposition='outside')
-                st.plotly_chart(fig_imp, use_container_width=True)
-                
-                st.metric("Total Incidentes", len(df_impressora))
-                st.metric("% do Total", f"{(len(df_impressora)/len(df_filtered)*100):.1f}%")
-        
-        with col_esp2:
-            # Problemas de hardware
-            df_hardware = df_filtered[df_filtered['Categoria Limpa'].str.contains('COMPUTADOR|TECLADO|MOUSE|MONITOR', case=False, na=False)]
-            
-            if len(df_hardware) > 0:
-                hw_cat = df_hardware['Categoria Limpa'].value_counts().head(10).reset_index()
-                hw_cat.columns = ['Tipo Hardware', 'Quantidade']
-                
-                fig_hw = px.pie(
-                    hw_cat,
-                    values='Quantidade',
-                    names='Tipo Hardware',
-                    title="💻 Distribuição de Problemas de Hardware",
-                    color_discrete_sequence=px.colors.qualitative.Set3
-                )
-                fig_hw.update_traces(textposition='inside', textinfo='percent+label')
-                st.plotly_chart(fig_hw, use_container_width=True)
-                
-                st.metric("Total Hardware", len(df_hardware))
-                st.metric("% do Total", f"{(len(df_hardware)/len(df_filtered)*100):.1f}%")
-        
-        st.markdown("---")
-        
-        # Reset de senhas SPDATA
-        st.subheader("🔐 Análise de Reset de Senhas")
-        col_esp3, col_esp4 = st.columns(2)
-        
-        with col_esp3:
-            df_senha = df_filtered[df_filtered['Categoria Limpa'].str.contains('RESET|SENHA|SPDATA', case=False, na=False)]
-            
-            if len(df_senha) > 0:
-                # Volume de resets por mês
-                df_senha_mes = df_senha.groupby(df_senha['Data Abertura Datetime'].dt.to_period('M'))['ID'].count().reset_index()
-                df_senha_mes['Mês'] = df_senha_mes['Data Abertura Datetime'].astype(str)
-                
-                fig_senha = px.bar(
-                    df_senha_mes,
-                    x='Mês',
-                    y='ID',
-                    title="🔐 Volume de Reset de Senhas por Mês",
-                    color='ID',
-                    color_continuous_scale='Purples',
-                    text='ID'
-                )
-                fig_senha.update_traces(textposition='outside')
-                fig_senha.update_layout(xaxis_tickangle=-45)
-                st.plotly_chart(fig_senha, use_container_width=True)
-                
-                st.metric("Total Resets", len(df_senha))
-                st.metric("% do Total", f"{(len(df_senha)/len(df_filtered)*100):.1f}%")
-                st.metric("Média/Mês", f"{len(df_senha)/len(df_serie):.0f}")
-        
-        with col_esp4:
-            # Suprimentos (TONNER)
-            df_tonner = df_filtered[df_filtered['Categoria Limpa'].str.contains('TONNER|TONER', case=False, na=False)]
-            
-            if len(df_tonner) > 0:
-                tonner_local = df_tonner['Localização'].value_counts().head(10).reset_index()
-                tonner_local.columns = ['Localização', 'Solicitações']
-                
-                fig_tonner = px.bar(
-                    tonner_local,
-                    x='Solicitações',
-                    y='Localização',
-                    title="📦 Top 10 Setores - Solicitações de Tonner",
-                    orientation='h',
-                    color='Solicitações',
-                    color_continuous_scale='Oranges',
-                    text='Solicitações'
-                )
-                fig_tonner.update_traces(textposition='outside')
-                st.plotly_chart(fig_tonner, use_container_width=True)
-                
-                st.metric("Total Tonners", len(df_tonner))
-                st.metric("% do Total", f"{(len(df_tonner)/len(df_filtered)*100):.1f}%")
-                st.metric("Média/Mês", f"{len(df_tonner)/len(df_serie):.0f}")
-        
-        st.markdown("---")
-        
-        # Resumo geral de tipos
-        st.subheader("📊 Resumo Geral por Tipo de Problema")
-        
-        tipos = {
-            'Impressora': df_filtered[df_filtered['Categoria Limpa'].str.contains('IMPRESSORA', case=False, na=False)],
-            'SPDATA': df_filtered[df_filtered['Categoria Limpa'].str.contains('SPDATA', case=False, na=False)],
-            'Tonner': df_filtered[df_filtered['Categoria Limpa'].str.contains('TONNER|TONER', case=False, na=False)],
-            'Computador': df_filtered[df_filtered['Categoria Limpa'].str.contains('COMPUTADOR', case=False, na=False)],
-            'Hardware': df_filtered[df_filtered['Categoria Limpa'].str.contains('TECLADO|MOUSE|MONITOR', case=False, na=False)],
-            'Rede': df_filtered[df_filtered['Categoria Limpa'].str.contains('REDE|INTERNET', case=False, na=False)]
+
+def _comparar_benchmarks(atual, anterior):
+    """
+    Linhas de comparação (mediana atual / anterior) para as medições presentes nos dois
+    resultados, casando as entradas pela quantidade de linhas
+    """
+    anteriores = {execucao['linhas']: execucao for execucao in anterior.get('execucoes', [])}
+    linhas = []
+    for execucao in atual['execucoes']:
+        base = anteriores.get(execucao['linhas'])
+        if base is None:
+            continue
+        for nome, medicao in execucao['medicoes'].items():
+            if nome in base['medicoes'] and base['medicoes'][nome]['mediana'] > 0:
+                razao = medicao['mediana'] / base['medicoes'][nome]['mediana']
+                linhas.append(f"{execucao['linhas']:>10,} {nome:<28} {base['medicoes'][nome]['mediana']:>9.3f}s -> {medicao['mediana']:>9.3f}s  ({razao:.2f}x)")
+    return linhas
+
+
+def _cli(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m dashboard_chamados',
+        description="Ferramentas de linha de comando do Dashboard de Chamados Técnicos"
+    )
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    relatorio = subcomandos.add_parser('report', help="Gera o relatório completo sem abrir o Streamlit")
+    relatorio.add_argument('--input', default='glpi.csv', help="CSV exportado do GLPI (padrão: glpi.csv)")
+    relatorio.add_argument('--out', required=True, help="Pasta de saída do relatório")
+    relatorio.add_argument('--de', type=date.fromisoformat, help="Início do período (AAAA-MM-DD)")
+    relatorio.add_argument('--ate', type=date.fromisoformat, help="Fim do período, inclusivo (AAAA-MM-DD)")
+    relatorio.add_argument('--tecnico', help="Filtrar por técnico")
+    relatorio.add_argument('--status', help="Filtrar por status")
+    relatorio.add_argument('--prioridade', help="Filtrar por prioridade")
+    relatorio.add_argument('--categoria', help="Filtrar por categoria")
+    relatorio.add_argument('--processos', type=int, default=PROCESSOS_RELATORIO,
+                           help="Processos em paralelo (1 = sem pool; padrão: GLPI_PROCESSOS_RELATORIO)")
+
+    gerar = subcomandos.add_parser('gerar', help="Gera um glpi.csv sintético")
+    gerar.add_argument('--linhas', type=_linhas, required=True, help="Quantidade de chamados (aceita 10k, 1M...)")
+    gerar.add_argument('--out', required=True, help="Arquivo CSV de saída")
+    gerar.add_argument('--semente', type=int, default=42, help="Semente aleatória (padrão: 42)")
+    gerar.add_argument('--dias', type=int, default=730, help="Dias cobertos pelas aberturas (padrão: 730)")
+    gerar.add_argument('--fim', type=date.fromisoformat, help="Último dia coberto, exclusivo (padrão: hoje)")
+
+    benchmark = subcomandos.add_parser('benchmark', help="Mede ingestão, filtros e seções e grava o resultado em JSON")
+    benchmark.add_argument('--input', nargs='+', help="CSVs a medir (padrão: sintéticos gerados com --linhas)")
+    benchmark.add_argument('--linhas', nargs='+', type=_linhas,
+                           default=[_linhas(tamanho) for tamanho in TAMANHOS_BENCHMARK],
+                           help=f"Tamanhos dos CSVs sintéticos (padrão: {' '.join(TAMANHOS_BENCHMARK)})")
+    benchmark.add_argument('--repeticoes', type=int, default=3, help="Execuções por medição (padrão: 3)")
+    benchmark.add_argument('--out', help="Arquivo JSON com o resultado")
+    benchmark.add_argument('--comparar', help="JSON de um benchmark anterior para comparar")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == 'gerar':
+        inicio = time.perf_counter()
+        gerar_glpi_sintetico(args.out, args.linhas, args.semente, args.fim, args.dias)
+        print(f"{args.linhas:,} chamados gravados em {args.out} ({time.perf_counter() - inicio:.1f}s)")
+
+    elif args.comando == 'benchmark':
+        pasta_sinteticos = None
+        entradas = args.input
+        if not entradas:
+            # Mesma semente e mesmo período em todas as execuções: resultados comparáveis entre si
+            pasta_sinteticos = tempfile.mkdtemp(prefix='glpi-sintetico-')
+            entradas = [
+                gerar_glpi_sintetico(os.path.join(pasta_sinteticos, f"glpi_{linhas}.csv"), linhas, fim=date(2025, 1, 1))
+                for linhas in args.linhas
+            ]
+        try:
+            execucoes = []
+            for entrada in entradas:
+                execucao = executar_benchmark(entrada, args.repeticoes)
+                execucoes.append(execucao)
+                print(f"{execucao['linhas']:,} linhas ({execucao['memoria_mb']} MB em memória)")
+                for nome, medicao in execucao['medicoes'].items():
+                    print(f"  {nome:<28} {medicao['mediana']:>9.3f}s")
+        finally:
+            if pasta_sinteticos is not None:
+                shutil.rmtree(pasta_sinteticos, ignore_errors=True)
+
+        resultado = {
+            'gerado_em': datetime.now().isoformat(timespec='seconds'),
+            'ambiente': {
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'pyarrow': pa.__version__,
+                'cpus': os.cpu_count(),
+                'tamanho_lote': TAMANHO_LOTE,
+                'cache_versao': VERSAO_DATASET,
+            },
+            'repeticoes': args.repeticoes,
+            'execucoes': execucoes,
         }
-        
-        resumo_tipos = pd.DataFrame([
-            {
-                'Tipo': tipo,
-                'Quantidade': len(df_tipo),
-                '% Total': f"{(len(df_tipo)/len(df_filtered)*100):.1f}%",
-                'Tempo Médio (h)': f"{df_tipo['Tempo Resolução (h)'].mean():.1f}" if len(df_tipo) > 0 else "N/A"
-            }
-            for tipo, df_tipo in tipos.items()
-        ])
-        resumo_tipos = resumo_tipos.sort_values('Quantidade', ascending=False)
-        
-        fig_resumo = px.bar(
-            resumo_tipos,
-            x='Quantidade',
-            y='Tipo',
-            title="📊 Resumo por Tipo de Problema",
-            orientation='h',
-            color='Quantidade',
-            color_continuous_scale='Viridis',
-            text='Quantidade'
-        )
-        fig_resumo.update_traces(textposition='outside')
-        st.plotly_chart(fig_resumo, use_container_width=True)
-        
-        st.dataframe(resumo_tipos, use_container_width=True)
-    
-    st.markdown("---")
-    
-    # Tabela geral de dados
-    st.subheader("📋 Dados Detalhados dos Chamados")
-    if not df_filtered.empty:
+        if args.out:
+            with open(args.out, 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, ensure_ascii=False, indent=2)
+        if args.comparar:
+            with open(args.comparar, encoding='utf-8') as f:
+                for linha in _comparar_benchmarks(resultado, json.load(f)):
+                    print(linha)
 
-        # Selecionar colunas relevantes
-        colunas_exibicao = ['ID', 'Título', 'Status', 'Prioridade', 'Categoria Limpa', 
+    elif args.comando == 'report':
+        if (args.de is None) != (args.ate is None):
+            parser.error("--de e --ate devem ser informados juntos")
+        if not os.path.exists(args.input):
+            parser.error(f"arquivo não encontrado: {args.input}")
 
-                           'Atribuído - Técnico', 'Data Abertura', 'Hora Abertura', 
-                           'Data Atualização', 'Tempo Resolução (h)', 'Localização']
-        colunas_disponiveis = [col for col in colunas_exibicao if col in df_filtered.columns]
-        
+        selecoes = [
+            ('Atribuído - Técnico', args.tecnico),
+            ('Status', args.status),
+            ('Prioridade', args.prioridade),
+            ('Categoria Limpa', args.categoria),
+        ]
+        filtros = {coluna: [valor] for coluna, valor in selecoes if valor is not None}
+        periodo = (args.de, args.ate) if args.de is not None else None
 
-        df_exibicao = df_filtered[colunas_disponiveis].copy()
-        if 'Data Abertura Datetime' in df_filtered.columns:
-            df_exibicao = df_exibicao.sort_values(by=[col for col in df_exibicao.columns if 'Data' in col][0] if any('Data' in col for col in df_exibicao.columns) else df_exibicao.columns[0], ascending=False)
-        
-        st.dataframe(df_exibicao.head(100), height=400, use_container_width=True)
-        st.caption(f"Exibindo os 100 chamados mais recentes de {len(df_exibicao)} total")
-    else:
-        st.info("Nenhum chamado encontrado com os filtros aplicados.")
+        inicio = time.perf_counter()
+        indice = gerar_relatorio(args.input, args.out, periodo, filtros, args.processos)
+        for id_secao, itens in indice['secoes'].items():
+            print(f"{id_secao:<12} {len(itens['figuras']):>3} figuras {len(itens['tabelas']):>3} tabelas  {itens['segundos']:.2f}s")
+        print(f"Relatório de {indice['resumo']['total']:,} chamados gravado em {args.out} ({time.perf_counter() - inicio:.1f}s)")
+    return 0
 
-# Rodapé
-st.markdown("---")
-st.markdown("**Dashboard desenvolvido Pedro Henrique (Analista de Sistema Pleno)** | Última atualização: " + datetime.now().strftime("%d/%m/%Y %H:%M"))
 
-st.markdown("**Fonte:** Sistema de Chamados Técnicos HMSI")
\ No newline at end of file
+if __name__ == '__main__':
+    # Dentro do `streamlit run` é o dashboard; chamado pelo Python, é a linha de comando
+    if not st.runtime.exists():
+        sys.exit(_cli(sys.argv[1:]))
+    main()